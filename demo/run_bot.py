@@ -15,7 +15,6 @@ from src.dyscord.objects.interactions import Command
 from src.dyscord.objects.message import Message
 from src.dyscord.objects import Snowflake
 from src.dyscord.utilities import Log
-from src.dyscord.objects.guild import Guild
 
 from src import dyscord
 from demo import command_functions
@@ -56,8 +55,8 @@ async def purge_commands(client, message: Message):
         await API.delete_global_application_command(command.id)
 
     client._log.info('Get guild commands')
-    assert message.guild is not None
-    guild: Guild = message.guild
+    guild = await message.fetch_guild()
+    assert guild is not None
     commands = await API.get_guild_application_commands(guild.id)
     for command in commands:
         command = Command().from_dict(command)
@@ -173,8 +172,9 @@ async def parse_message(message: objects.Message, raw_message, client):
         if 'PURGE' in message.content:
             log.critical('Purging all commands.')
             await purge_commands(client, message)
-            assert type(message.channel) is objects.TextChannel
-            await message.channel.send_message('Purged commands!')
+            channel = await message.fetch_channel()
+            assert type(channel) is objects.TextChannel
+            await channel.send_message('Purged commands!')
         elif 'REGISTER' in message.content:
             log.critical('Registering test commands.')
             await register_commands(client, message)
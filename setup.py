@@ -43,11 +43,13 @@ setuptools.setup(
         'colour>=0.1.5',
         'emoji>=1.5.0',
         'httpx>=0.19.0',
-        'nest_asyncio>=1.5.1',
         'orjson>=3.6.3',
         'requests>=2.26.0',
         'websockets>=10.0',
         'validators>=0.18.2',
         'logging_levels>=0.3.0'
     ],
+    extras_require={
+        'uvloop': ['uvloop>=0.16.0; platform_system != "Windows"'],
+    },
 )
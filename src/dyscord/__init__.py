@@ -1,8 +1,24 @@
-'''Dyscord is a library to enable a reasonably 1:1 binding between python and the official API.'''
+'''Dyscord is a library to enable a reasonably 1:1 binding between python and the official API.
+
+Subpackages are imported on first access, so `import dyscord` stays cheap for tools that only need part of it.
+'''
+from typing import TYPE_CHECKING
 
-from . import client, helper, objects, utilities, command
 from .version import __version__
-from .client.discord_client import DiscordClient
+from .utilities.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from . import client, helper, objects, utilities, command
+    from .client.discord_client import DiscordClient
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'client': ('.client', None),
+    'command': ('.command', None),
+    'DiscordClient': ('.client.discord_client', 'DiscordClient'),
+    'helper': ('.helper', None),
+    'objects': ('.objects', None),
+    'utilities': ('.utilities', None),
+})
 
 __all__ = [
     '__version__',
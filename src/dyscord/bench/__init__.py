@@ -0,0 +1,4 @@
+'''Benchmarks for dyscord, run with `python -m dyscord.bench <suite>`.
+
+Every suite runs fully offline, against the stand-ins in `dyscord.testing`.
+'''
@@ -0,0 +1,158 @@
+'''Command line entry point, see `python -m dyscord.bench --help`.'''
+import argparse
+import asyncio
+import logging
+import sys
+
+from typing import Callable
+
+import orjson as json
+
+from ..utilities import Log
+from . import e2e, imports, memory, parsers, report
+
+
+def _e2e(args: argparse.Namespace) -> int:
+    loop_factory: Callable[[], asyncio.AbstractEventLoop] = asyncio.new_event_loop
+    if args.uvloop:
+        import uvloop  # type: ignore
+        loop_factory = uvloop.new_event_loop
+    loop = loop_factory()
+
+    results = list()
+    try:
+        for workload in args.workload:
+            results.append(loop.run_until_complete(e2e.run_workload(
+                workload=workload,
+                count=args.count,
+                rate=args.rate,
+                rest_latency=args.rest_latency,
+                rest_jitter=args.rest_jitter,
+                bucket_limit=args.bucket_limit,
+                bucket_window=args.bucket_window,
+                global_limit=args.global_limit,
+                timeout=args.timeout,
+            )))
+    finally:
+        loop.close()
+
+    if args.json:
+        print(json.dumps(results, option=json.OPT_INDENT_2).decode())
+    else:
+        report.print_table(results, e2e.COLUMNS)
+    return 1 if any(result['timed_out'] for result in results) else 0
+
+
+def _parsers(args: argparse.Namespace) -> int:
+    baseline = parsers.load_baseline(args.compare) if args.compare else {'results': {}}
+    if args.compare and baseline.get('scale') != args.scale:
+        print(f'Baseline was recorded at scale [{baseline.get("scale")}], not [{args.scale}].', file=sys.stderr)
+        return 2
+
+    results = parsers.run(scale=args.scale, cases=args.case, min_time=args.min_time, rounds=args.rounds, generic=args.generic, lazy=args.lazy,
+                          lazy_timestamps=args.lazy_timestamps)
+    rows = parsers.compare(results, baseline, args.tolerance)
+
+    if args.save:
+        parsers.save_baseline(args.save, results, args.scale)
+
+    if args.json:
+        print(json.dumps(rows, option=json.OPT_INDENT_2).decode())
+    else:
+        report.print_table(rows, parsers.COLUMNS)
+    return 1 if any(row['regressed'] for row in rows) else 0
+
+
+def _imports(args: argparse.Namespace) -> int:
+    budgets = dict(imports.BUDGETS)
+    for budget in args.budget:
+        name, _, milliseconds = budget.partition('=')
+        budgets[name] = float(milliseconds)
+
+    rows = imports.run(cases=args.case, runs=args.runs, budgets=budgets)
+
+    if args.json:
+        print(json.dumps(rows, option=json.OPT_INDENT_2).decode())
+    else:
+        report.print_table(rows, imports.COLUMNS)
+    return 1 if any(row['over_budget'] for row in rows) else 0
+
+
+def _memory(args: argparse.Namespace) -> int:
+    baseline = parsers.load_baseline(args.compare) if args.compare else {'results': {}}
+    if args.compare and baseline.get('scale') != args.scale:
+        print(f'Baseline was recorded at scale [{baseline.get("scale")}], not [{args.scale}].', file=sys.stderr)
+        return 2
+
+    results = memory.run(scale=args.scale, populations=args.population, intern=args.intern, identity_map=args.identity_map)
+    rows = memory.compare(results, baseline, args.tolerance)
+
+    if args.save:
+        parsers.save_baseline(args.save, results, args.scale)
+
+    if args.json:
+        print(json.dumps(rows, option=json.OPT_INDENT_2).decode())
+    else:
+        report.print_table(rows, memory.COLUMNS)
+    return 1 if any(row['regressed'] for row in rows) else 0
+
+
+def main(argv=None) -> int:
+    '''Parse arguments and run the requested suite.'''
+    parser = argparse.ArgumentParser(prog='python -m dyscord.bench', description='Offline dyscord benchmarks.')
+    parser.add_argument('--log-level', default='ERROR', help='Level for the dyscord logger while benchmarking.')
+    suites = parser.add_subparsers(dest='suite', required=True)
+
+    e2e_parser = suites.add_parser('e2e', help='Client against a fake gateway and REST server.')
+    e2e_parser.add_argument('--workload', nargs='+', choices=e2e.WORKLOADS, default=list(e2e.WORKLOADS))
+    e2e_parser.add_argument('--count', type=int, default=10_000, help='Events per workload.')
+    e2e_parser.add_argument('--rate', type=float, default=None, help='Events per second, as fast as possible when omitted.')
+    e2e_parser.add_argument('--rest-latency', type=float, default=0.0, help='Seconds added to each REST response.')
+    e2e_parser.add_argument('--rest-jitter', type=float, default=0.0, help='Up to this many extra seconds per REST response.')
+    e2e_parser.add_argument('--bucket-limit', type=int, default=10_000, help='Fake REST requests per route bucket per window.')
+    e2e_parser.add_argument('--bucket-window', type=float, default=1.0, help='Fake REST bucket window in seconds.')
+    e2e_parser.add_argument('--global-limit', type=int, default=None, help='Fake REST global requests per second.')
+    e2e_parser.add_argument('--timeout', type=float, default=120.0, help='Seconds to wait for handlers to finish.')
+    e2e_parser.add_argument('--uvloop', action='store_true', help='Run on uvloop.')
+    e2e_parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+    e2e_parser.set_defaults(func=_e2e)
+
+    parsers_parser = suites.add_parser('parsers', help='from_dict microbenchmarks on generated payloads.')
+    parsers_parser.add_argument('--scale', choices=sorted(parsers.SCALES), default='large', help='Size of the generated guild.')
+    parsers_parser.add_argument('--case', nargs='+', default=None, help='Cases to run, all of them when omitted.')
+    parsers_parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per timed round.')
+    parsers_parser.add_argument('--rounds', type=int, default=3, help='Timed rounds per case, the best is kept.')
+    parsers_parser.add_argument('--generic', action='store_true', help='Parse with the generic _auto_map walker instead of the generated parsers.')
+    parsers_parser.add_argument('--lazy', action='store_true', help='Parse messages and interactions lazily.')
+    parsers_parser.add_argument('--lazy-timestamps', action='store_true', help='Keep timestamps as strings until they are read.')
+    parsers_parser.add_argument('--save', metavar='PATH', help='Write the results as a baseline.')
+    parsers_parser.add_argument('--compare', metavar='PATH', help='Compare against a saved baseline, exit 1 on regression.')
+    parsers_parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed fractional slowdown or growth before failing.')
+    parsers_parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+    parsers_parser.set_defaults(func=_parsers)
+
+    imports_parser = suites.add_parser('imports', help='Import time of the package in fresh interpreters, against a budget.')
+    imports_parser.add_argument('--case', nargs='+', choices=imports.CASES, default=None, help='Cases to run, all of them when omitted.')
+    imports_parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per case, the best time is kept.')
+    imports_parser.add_argument('--budget', action='append', default=[], metavar='CASE=MS', help='Override the budget of a case, may be repeated.')
+    imports_parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+    imports_parser.set_defaults(func=_imports)
+
+    memory_parser = suites.add_parser('memory', help='Bytes per parsed object over large generated populations.')
+    memory_parser.add_argument('--scale', choices=sorted(memory.SCALES), default='large', help='Number of objects per population.')
+    memory_parser.add_argument('--population', nargs='+', default=None, help='Populations to build, all of them when omitted.')
+    memory_parser.add_argument('--intern', type=int, default=None, metavar='MAXSIZE', help='Intern snowflakes with a table of this size.')
+    memory_parser.add_argument('--identity-map', action='store_true', help='Share users and members between parsed objects.')
+    memory_parser.add_argument('--save', metavar='PATH', help='Write the results as a baseline.')
+    memory_parser.add_argument('--compare', metavar='PATH', help='Compare against a saved baseline, exit 1 on regression.')
+    memory_parser.add_argument('--tolerance', type=float, default=0.05, help='Allowed fractional growth in bytes per object before failing.')
+    memory_parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+    memory_parser.set_defaults(func=_memory)
+
+    args = parser.parse_args(argv)
+    Log.log.setLevel(getattr(logging, args.log_level.upper()))
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
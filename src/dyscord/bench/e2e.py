@@ -0,0 +1,238 @@
+'''End to end throughput and latency benchmark.
+
+Connects a real `DiscordClient` to a `FakeGateway` and a `FakeRestServer` on localhost, then drives one of the scripted workloads:
+
+- `echo`: MESSAGE_CREATE events, each answered with a `create_message` call.
+- `slash`: INTERACTION_CREATE slash commands, each acknowledged through the `CommandHandler`.
+- `presence`: a flood of PRESENCE_UPDATE events with a no-op handler.
+
+Latency is measured from the moment the fake gateway hands an event to the socket until the handler starts running. Interaction ack latency runs from the same point
+until the fake REST server receives the interaction callback.
+'''
+import asyncio
+import time
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .. import helper
+from ..client import DiscordClient
+from ..objects.snowflake import Snowflake
+from ..testing import FakeGateway, FakeRestServer
+from . import report
+
+
+WORKLOADS = ('echo', 'slash', 'presence')
+
+# Identifiers are offsets from these bases, so a handler can recover the index of the event it received.
+_BASE_ID = 900000000000000000
+_GUILD_ID = '804392362054910047'
+_CHANNEL_ID = '804392362629267458'
+_APPLICATION_ID = '889065662641737791'
+_COMMAND_ID = '891566885043331112'
+_CHANNELS = 64
+
+_USER = {'id': '185846097284038656', 'username': 'bench-user', 'discriminator': '0001', 'avatar': None, 'public_flags': 0}
+
+
+def _message(index: int) -> Tuple[str, dict]:
+    return 'MESSAGE_CREATE', {
+        'id': str(_BASE_ID + index),
+        'channel_id': str(int(_CHANNEL_ID) + index % _CHANNELS),
+        'guild_id': _GUILD_ID,
+        'author': _USER,
+        'member': {'deaf': False, 'mute': False, 'roles': [], 'joined_at': '2021-01-28T16:48:04.105000+00:00'},
+        'content': f'echo {index}',
+        'timestamp': '2021-09-24T16:42:09.655000+00:00',
+        'edited_timestamp': None,
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0,
+        'flags': 0,
+    }
+
+
+def _interaction(index: int) -> Tuple[str, dict]:
+    return 'INTERACTION_CREATE', {
+        'id': str(_BASE_ID + index),
+        'application_id': _APPLICATION_ID,
+        'type': 2,
+        'data': {'id': _COMMAND_ID, 'name': 'bench', 'type': 1},
+        'guild_id': _GUILD_ID,
+        'channel_id': _CHANNEL_ID,
+        'member': {'deaf': False, 'mute': False, 'roles': [], 'joined_at': '2021-01-28T16:48:04.105000+00:00', 'user': _USER},
+        'token': f'bench-token-{index}',
+        'version': 1,
+    }
+
+
+def _presence(index: int) -> Tuple[str, dict]:
+    return 'PRESENCE_UPDATE', {
+        'user': {'id': str(_BASE_ID + index)},
+        'guild_id': _GUILD_ID,
+        'status': 'online',
+        'activities': [],
+        'client_status': {'desktop': 'online'},
+    }
+
+
+_FACTORIES: Dict[str, Callable[[int], Tuple[str, dict]]] = {
+    'echo': _message,
+    'slash': _interaction,
+    'presence': _presence,
+}
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return value * 1000 if value is not None else None
+
+
+def _register_handlers(client: DiscordClient, workload: str, sent_at: List[float], latencies: List[float], complete: Callable[[], None]):
+    '''Attach the handlers of `workload` to `client`.'''
+    if workload == 'echo':
+        @client.decorate_handler('MESSAGE_CREATE')
+        async def on_message(message):
+            latencies.append(time.perf_counter() - sent_at[int(message.id) - _BASE_ID])
+            complete()
+            await client.api.create_message(str(message.channel_id), {'content': message.content})
+            complete()
+
+    elif workload == 'slash':
+        @client.decorate_handler('INTERACTION_CREATE')
+        async def on_interaction(interaction):
+            latencies.append(time.perf_counter() - sent_at[int(interaction.id) - _BASE_ID])
+            complete()
+
+        async def on_command(interaction):
+            response = interaction.generate_response()
+            response.generate('pong')
+            await response.send()
+
+        helper.CommandHandler.register_global_callback('bench', on_command, command_id=Snowflake(_COMMAND_ID))
+
+    else:
+        @client.decorate_handler('PRESENCE_UPDATE')
+        async def on_presence(presence):
+            latencies.append(time.perf_counter() - sent_at[int(presence.user.id) - _BASE_ID])
+            complete()
+
+
+async def run_workload(workload: str = 'echo',
+                       count: int = 10_000,
+                       rate: Optional[float] = None,
+                       rest_latency: float = 0.0,
+                       rest_jitter: float = 0.0,
+                       bucket_limit: int = 10_000,
+                       bucket_window: float = 1.0,
+                       global_limit: Optional[int] = None,
+                       timeout: float = 120.0,
+                       ) -> dict:
+    '''Run one workload and return its measurements.
+
+    Arguments:
+        workload (str): One of `WORKLOADS`.
+        count (int): Number of events to send.
+        rate (float|None): Events per second, `None` sends as fast as possible.
+        rest_latency (float): Seconds of latency added by the fake REST server.
+        rest_jitter (float): Up to this many extra seconds of random REST latency.
+        bucket_limit (int): Fake REST requests per route bucket per window. Defaults are generous so the client, not the limits, is measured.
+        bucket_window (float): Fake REST bucket window in seconds.
+        global_limit (int|None): Fake REST global requests per second.
+        timeout (float): Give up waiting for handlers after this many seconds.
+
+    Returns:
+        dict: Throughput, latency percentiles in milliseconds, CPU and memory figures.
+    '''
+    if workload not in _FACTORIES:
+        raise ValueError(f'Unknown workload [{workload}], expected one of {WORKLOADS}.')
+
+    factory = _FACTORIES[workload]
+    sent_at: List[float] = [0.0] * count
+    latencies: List[float] = list()
+    acks: List[float] = list()
+    done = asyncio.Event()
+    expected = count * 2 if workload in ('echo', 'slash') else count
+    completed = 0
+
+    def complete():
+        nonlocal completed
+        completed += 1
+        if completed >= expected:
+            done.set()
+
+    def stamped_factory(index: int) -> Tuple[str, dict]:
+        event = factory(index)
+        sent_at[index] = time.perf_counter()
+        return event
+
+    def record_ack(parameters, body):
+        acks.append(time.perf_counter() - sent_at[int(parameters['interaction_id']) - _BASE_ID])
+        complete()
+        return 204, None
+
+    gateway = FakeGateway(heartbeat_interval=41250)
+    async with gateway:
+        assert gateway.url is not None
+        rest = FakeRestServer(bucket_limit=bucket_limit, bucket_window=bucket_window, global_limit=global_limit, latency=rest_latency, jitter=rest_jitter,
+                              gateway_url=gateway.url)
+        async with rest:
+            assert rest.base_url is not None
+            rest.set_response('POST', '/interactions/{interaction_id}/{interaction_token}/callback', record_ack)
+
+            client = DiscordClient('bench-token', _APPLICATION_ID)
+            client.set_all_intents()
+            client.api.base_url = rest.base_url
+            _register_handlers(client, workload, sent_at, latencies, complete)
+
+            client_task = asyncio.create_task(client.start())
+            await gateway.wait_for_ready()
+            while not client.ready:
+                await asyncio.sleep(0.01)
+
+            cpu_start = report.cpu_seconds()
+            rss_start = report.rss_bytes()
+            start = time.perf_counter()
+
+            await gateway.emit(stamped_factory, rate=rate, count=count)
+            timed_out = False
+            try:
+                await asyncio.wait_for(done.wait(), timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+
+            elapsed = time.perf_counter() - start
+            cpu = report.cpu_seconds() - cpu_start
+            rss_end = report.rss_bytes()
+
+            await client.close()
+            await client_task
+            await client.api.close_pool()
+            if workload == 'slash':
+                helper.CommandHandler.registered_commands.pop(Snowflake(_COMMAND_ID), None)
+                helper.CommandHandler.global_lookup.pop('bench', None)
+
+    return {
+        'workload': workload,
+        'loop': type(asyncio.get_running_loop()).__module__,
+        'events': count,
+        'handled': len(latencies),
+        'timed_out': timed_out,
+        'seconds': elapsed,
+        'events_per_second': len(latencies) / elapsed if elapsed else None,
+        'latency_p50_ms': _ms(report.percentile(latencies, 0.50)),
+        'latency_p99_ms': _ms(report.percentile(latencies, 0.99)),
+        'ack_p50_ms': _ms(report.percentile(acks, 0.50)),
+        'ack_p99_ms': _ms(report.percentile(acks, 0.99)),
+        'cpu_percent': 100 * cpu / elapsed if elapsed else None,
+        'rss_mb': rss_end / 2 ** 20 if rss_end is not None else None,
+        'rss_growth_mb': (rss_end - rss_start) / 2 ** 20 if rss_end is not None and rss_start is not None else None,
+        'max_rss_mb': (report.max_rss_bytes() or 0) / 2 ** 20 or None,
+    }
+
+
+COLUMNS = ('workload', 'loop', 'events', 'handled', 'events_per_second', 'latency_p50_ms', 'latency_p99_ms', 'ack_p50_ms', 'ack_p99_ms', 'cpu_percent', 'rss_mb',
+           'max_rss_mb')
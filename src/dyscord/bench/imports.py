@@ -0,0 +1,109 @@
+'''Import time benchmark.
+
+Every case runs in a fresh interpreter, so nothing is cached between runs. For each case it reports the best and median time of the import statement alone,
+excluding interpreter start up, and which of the heavy dependencies it pulled in.
+
+Cases fail when their best time is over budget, or when they import a dependency that should have been deferred.
+'''
+import os
+import statistics
+import subprocess
+import sys
+
+from typing import Dict, List, Optional, Tuple
+
+import orjson as json
+
+
+_ROOT = __name__.rsplit('.', 2)[0]
+
+# Dependencies that are slow to import, or only needed for some features.
+HEAVY = ('asyncio', 'emoji', 'httpx', 'orjson', 'validators', 'websockets')
+
+# Statement, and the heavy dependencies it must not import.
+CASES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'package': ('import {root}', HEAVY),
+    'objects': ('from {root}.objects import Guild, Member, Message, Snowflake', ('emoji', 'httpx', 'validators')),
+    'client': ('from {root} import DiscordClient', ('emoji', 'httpx', 'validators')),
+}
+
+# Milliseconds, generous enough for slow CI machines.
+BUDGETS: Dict[str, float] = {
+    'package': 50.0,
+    'objects': 500.0,
+    'client': 500.0,
+}
+
+_CHILD = '''
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+import json
+print(json.dumps([elapsed, sorted(name for name in {heavy!r} if name in sys.modules)]))
+'''
+
+
+def _child_environment() -> Dict[str, str]:
+    '''Environment that lets a child interpreter import the package the same way this process did.'''
+    top = sys.modules[_ROOT.split('.')[0]]
+    search_path = os.path.dirname(os.path.dirname(os.path.abspath(top.__file__)))  # type: ignore
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(filter(None, [search_path, environment.get('PYTHONPATH')]))
+    return environment
+
+
+def measure(statement: str, runs: int = 5) -> Tuple[List[float], List[str]]:
+    '''Time `statement` in `runs` fresh interpreters.
+
+    Returns:
+        Tuple[[float], [str]]: Seconds per run, and the heavy dependencies loaded by the last run.
+    '''
+    environment = _child_environment()
+    code = _CHILD.format(statement=statement, heavy=HEAVY)
+    timings = list()
+    loaded: List[str] = list()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], env=environment, check=True, capture_output=True, text=True).stdout
+        elapsed, loaded = json.loads(output.strip().splitlines()[-1])
+        timings.append(elapsed)
+    return timings, loaded
+
+
+def run(cases: Optional[List[str]] = None, runs: int = 5, budgets: Optional[Dict[str, float]] = None) -> List[dict]:
+    '''Run the selected cases.
+
+    Arguments:
+        cases ([str]): Case names to run, all of them when omitted.
+        runs (int): Fresh interpreters per case, the best time is kept.
+        budgets (Dict[str, float]): Milliseconds allowed per case, `BUDGETS` when omitted. Cases without a budget never fail on time.
+
+    Returns:
+        [dict]: One row per case with timings, the heavy dependencies it loaded and an `over_budget` flag.
+    '''
+    selected = cases if cases else list(CASES)
+    unknown = set(selected) - set(CASES)
+    if unknown:
+        raise ValueError(f'Unknown cases {sorted(unknown)}, expected some of {sorted(CASES)}.')
+    budgets = BUDGETS if budgets is None else budgets
+
+    rows = list()
+    for name in selected:
+        statement, deferred = CASES[name]
+        timings, loaded = measure(statement.format(root=_ROOT), runs)
+        best = min(timings) * 1000
+        budget = budgets.get(name)
+        unexpected = [module for module in loaded if module in deferred]
+        rows.append({
+            'case': name,
+            'best_ms': best,
+            'median_ms': statistics.median(timings) * 1000,
+            'budget_ms': budget,
+            'loaded': ' '.join(loaded) or '-',
+            'unexpected': ' '.join(unexpected) or '-',
+            'over_budget': bool(unexpected) or (budget is not None and best > budget),
+        })
+    return rows
+
+
+COLUMNS = ('case', 'best_ms', 'median_ms', 'budget_ms', 'loaded', 'unexpected', 'over_budget')
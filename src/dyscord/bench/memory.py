@@ -0,0 +1,152 @@
+'''Memory footprint of parsed objects.
+
+Each population decodes and parses a large number of generated payloads, the way the client would off the gateway, and keeps every object alive. `tracemalloc`
+then reports:
+
+- `bytes_per_object`: bytes still allocated per parsed object, including the strings and nested objects it holds on to.
+- `total_mb`: bytes held by the whole population.
+- `peak_mb`: peak traced memory while the population was built, including the decoded payloads that were thrown away.
+- `heap_mb`: traced memory once the population was built, with every earlier population still alive.
+
+Results can be saved as a baseline and later runs compared against it.
+'''
+import gc
+import tracemalloc
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson as json
+
+from ..objects import Guild, Member, Message, Role, Snowflake, User
+from ..testing.generator import DataGenerator
+
+
+SCALES = {
+    'small': {'snowflake': 20_000, 'user': 5_000, 'member': 5_000, 'role': 2_000, 'message': 5_000, 'guild': 20},
+    'large': {'snowflake': 1_000_000, 'user': 250_000, 'member': 250_000, 'role': 25_000, 'message': 100_000, 'guild': 200},
+}
+
+Population = Tuple[Callable[[Any], Any], List[bytes]]
+
+
+def build_populations(scale: str = 'large', seed: int = 0) -> Dict[str, Population]:
+    '''Generate the encoded payloads for every population.
+
+    Arguments:
+        scale (str): Key of `SCALES`, sets how many objects each population holds.
+        seed (int): Generator seed, keep it fixed when comparing runs.
+    '''
+    counts = SCALES[scale]
+    generator = DataGenerator(seed)
+    guild = generator.guild(members=counts['member'], roles=min(counts['role'], 250), channels=50)
+    guild_id = guild['id']
+    role_ids = [role['id'] for role in guild['roles']]
+    channel_ids = [channel['id'] for channel in guild['channels'] if channel['type'] == 0]
+    authors = [member['user'] for member in guild['members'][:1_000]]
+
+    messages = list()
+    for message in generator.messages(counts['message'], guild_id, channel_ids, authors):
+        message['member'] = generator.member(role_ids[1:3], include_user=False)
+        messages.append(message)
+
+    def encode(payloads) -> List[bytes]:
+        return [json.dumps(payload) for payload in payloads]
+
+    return {
+        'snowflake': (Snowflake, encode(generator.snowflake() for _ in range(counts['snowflake']))),
+        'user': (lambda data: User().from_dict(data), encode(generator.user() for _ in range(counts['user']))),
+        'member': (lambda data: Member().from_dict(data), encode(guild['members'])),
+        'role': (lambda data: Role().from_dict(data), encode(generator.role(position, guild_id) for position in range(counts['role']))),
+        'message': (lambda data: Message().from_dict(data), encode(messages)),
+        'guild': (lambda data: Guild().from_dict(data), encode(generator.guild(members=0, roles=20, channels=30) for _ in range(counts['guild']))),
+    }
+
+
+def _measure(parse: Callable[[Any], Any], payloads: List[bytes], keep: List[object]) -> dict:
+    '''Parse every payload, keep the objects alive and trace what they cost.'''
+    parse(json.loads(payloads[0]))  # Warm up caches and lazy imports.
+    objects: List[object] = [None] * len(payloads)
+    gc.collect()
+    if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+, older versions report the peak since tracing started.
+        tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    for index, raw in enumerate(payloads):
+        objects[index] = parse(json.loads(raw))
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    keep.append(objects)
+
+    held = after - before
+    return {
+        'objects': len(objects),
+        'bytes_per_object': held / len(objects),
+        'total_mb': held / 2 ** 20,
+        'peak_mb': (peak - before) / 2 ** 20,
+        'heap_mb': after / 2 ** 20,
+    }
+
+
+def run(scale: str = 'large', populations: Optional[List[str]] = None, seed: int = 0, intern: Optional[int] = None, identity_map: bool = False) -> Dict[str, dict]:
+    '''Build the selected populations and measure them.
+
+    Populations are built one after another and all kept alive until the end, so `heap_mb` grows as a client's cache would.
+
+    Arguments:
+        scale (str): Key of `SCALES`.
+        populations ([str]): Population names to build, all of them when omitted.
+        seed (int): Generator seed.
+        intern (int|None): Intern snowflakes with a table of this size while parsing, see `Snowflake.enable_interning()`.
+        identity_map (bool): Share users and members between parsed objects, see `User.enable_identity_map()`.
+
+    Returns:
+        Dict[str, dict]: Measurements keyed by population name.
+    '''
+    available = build_populations(scale, seed)
+    selected = populations if populations else list(available)
+    unknown = set(selected) - set(available)
+    if unknown:
+        raise ValueError(f'Unknown populations {sorted(unknown)}, expected some of {sorted(available)}.')
+
+    results = dict()
+    keep: List[object] = list()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    if intern is not None:
+        Snowflake.enable_interning(intern)
+    if identity_map:
+        User.enable_identity_map()
+    try:
+        for name in selected:
+            parse, payloads = available[name]
+            results[name] = _measure(parse, payloads, keep)
+    finally:
+        if intern is not None:
+            Snowflake.disable_interning()
+        if identity_map:
+            User.disable_identity_map()
+        if not was_tracing:
+            tracemalloc.stop()
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float = 0.05) -> List[dict]:
+    '''Compare results with a baseline.
+
+    A population regresses when its bytes per object grow by more than `tolerance`. Baselines are written with `parsers.save_baseline()`.
+
+    Returns:
+        [dict]: One row per population with the ratio against the baseline and a `regressed` flag.
+    '''
+    rows = list()
+    for name, result in results.items():
+        previous = baseline['results'].get(name)
+        row = {'population': name, **result, 'bytes_ratio': None, 'regressed': False}
+        if previous is not None and previous['bytes_per_object'] > 0:
+            row['bytes_ratio'] = result['bytes_per_object'] / previous['bytes_per_object']
+            row['regressed'] = row['bytes_ratio'] > 1 + tolerance
+        rows.append(row)
+    return rows
+
+
+COLUMNS = ('population', 'objects', 'bytes_per_object', 'total_mb', 'peak_mb', 'heap_mb', 'bytes_ratio', 'regressed')
@@ -0,0 +1,243 @@
+'''Parser microbenchmarks over production sized payloads.
+
+Each case parses one generated payload repeatedly and reports:
+
+- `ops_per_second`: best of several timed rounds.
+- `blocks_per_call`: memory blocks still allocated per parsed object, from `sys.getallocatedblocks`.
+- `bytes_per_call`: bytes still allocated per parsed object, from `tracemalloc`.
+
+Results can be saved as a baseline and later runs compared against it. Objects parsed through an `_auto_map` use parsers generated per class, pass
+`generic=True` to time the generic `_auto_map` walker instead. `lazy=True` turns on lazy parsing of messages and interactions, `message_handler` then shows
+the cost of a handler reading a few fields. `lazy_timestamps=True` keeps timestamps as strings until they are read.
+
+The `timestamp*` cases compare `datetime.fromisoformat` with `parse_timestamp` and `parse_timestamp_cached`, on one repeated value.
+'''
+import contextlib
+import datetime
+import gc
+import platform
+import sys
+import time
+import tracemalloc
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import orjson as json
+
+from ..objects import Guild, Member, Message, Presence, Snowflake
+from ..objects.activity import Activity
+from ..objects.base_object import BaseDiscordObject
+from ..objects.channel import ChannelImporter
+from ..objects.events import GuildMemberUpdate
+from ..objects.interactions import Interaction
+from ..testing.generator import DataGenerator
+from ..utilities.timestamps import parse_timestamp, parse_timestamp_cached
+
+
+SCALES = {
+    'small': {'members': 1_000, 'roles': 50, 'channels': 50},
+    'large': {'members': 100_000, 'roles': 250, 'channels': 500},
+}
+
+Case = Tuple[Callable[[dict], object], dict]
+
+
+def build_cases(scale: str = 'large', seed: int = 0) -> Dict[str, Case]:
+    '''Generate the payload for every case.
+
+    Arguments:
+        scale (str): Key of `SCALES`, sets the size of the guild payload.
+        seed (int): Generator seed, keep it fixed when comparing runs.
+    '''
+    generator = DataGenerator(seed)
+    guild = generator.guild(**SCALES[scale])
+    guild_id = guild['id']
+    channel_id = next(channel['id'] for channel in guild['channels'] if channel['type'] == 0)
+    role_ids = [role['id'] for role in guild['roles']]
+
+    presence = generator.presence(guild_id=guild_id, activities=2)
+    rich_message = generator.message(channel_id, guild_id, embeds=3, mentions=10, mention_roles=role_ids[1:4], reference=True)
+
+    return {
+        'message_simple': (lambda data: Message().from_dict(data), generator.message(channel_id, guild_id)),
+        'message_rich': (lambda data: Message().from_dict(data), rich_message),
+        'message_handler': (_read_message, rich_message),
+        'guild_create': (lambda data: Guild().from_dict(data), guild),
+        'interaction': (lambda data: Interaction().from_dict(data), generator.interaction(guild_id, channel_id, options=5)),
+        'presence': (lambda data: Presence(data), presence),
+        'activity': (lambda data: Activity(data), presence['activities'][0]),
+        'guild_member_update': (lambda data: GuildMemberUpdate(data), generator.guild_member_update(guild_id, role_ids)),
+        'channel': (lambda data: ChannelImporter.from_dict(data), guild['channels'][1]),
+        'snowflake': (lambda data: Snowflake(data['id']), {'id': generator.snowflake()}),
+        'member': (lambda data: Member().from_dict(data), generator.member(role_ids[1:4])),
+        'timestamp_fromisoformat': (lambda data: datetime.datetime.fromisoformat(data['joined_at']), {'joined_at': generator.timestamp()}),
+        'timestamp': (lambda data: parse_timestamp(data['joined_at']), {'joined_at': generator.timestamp()}),
+        'timestamp_cached': (lambda data: parse_timestamp_cached(data['joined_at']), {'joined_at': generator.timestamp()}),
+    }
+
+
+def _read_message(data: dict) -> Message:
+    '''Parse a message and read what a typical command handler reads.'''
+    message = Message().from_dict(data)
+    message.content, message.author.id, message.channel_id
+    return message
+
+
+def _time(parse: Callable[[dict], object], payload: dict, min_time: float, rounds: int) -> float:
+    '''Best calls per second over `rounds` rounds of at least `min_time` seconds.'''
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            parse(payload)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        number *= 10
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            parse(payload)
+        best = min(best, (time.perf_counter() - start) / number)
+    return 1 / best
+
+
+def _allocations(parse: Callable[[dict], object], payload: dict, calls: int) -> Tuple[float, float]:
+    '''Blocks and bytes retained per parsed object.'''
+    parse(payload)  # Warm up caches and lazy imports.
+    results: List[object] = list()
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        bytes_before = tracemalloc.get_traced_memory()[0]
+        for _ in range(calls):
+            results.append(parse(payload))
+        bytes_after = tracemalloc.get_traced_memory()[0]
+        blocks_after = sys.getallocatedblocks()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    # The results list itself is not part of the cost.
+    overhead = sys.getsizeof(results)
+    return (blocks_after - blocks_before - 1) / calls, (bytes_after - bytes_before - overhead) / calls
+
+
+@contextlib.contextmanager
+def lazy_parsing():
+    '''Parse messages and interactions lazily while active.'''
+    previous = Message.lazy_parsing, Interaction.lazy_parsing
+    Message.lazy_parsing = Interaction.lazy_parsing = True
+    try:
+        yield
+    finally:
+        Message.lazy_parsing, Interaction.lazy_parsing = previous
+
+
+@contextlib.contextmanager
+def lazy_timestamp_parsing():
+    '''Keep timestamps as strings until they are read while active.'''
+    previous = BaseDiscordObject.lazy_timestamps
+    BaseDiscordObject.lazy_timestamps = True  # type: ignore
+    try:
+        yield
+    finally:
+        BaseDiscordObject.lazy_timestamps = previous  # type: ignore
+
+
+@contextlib.contextmanager
+def generic_auto_dict():
+    '''Parse through `BaseDiscordObject._auto_dict_generic()` instead of the generated parsers while active.'''
+    generated = BaseDiscordObject.__dict__['_auto_dict']
+    BaseDiscordObject._auto_dict = BaseDiscordObject._auto_dict_generic  # type: ignore
+    try:
+        yield
+    finally:
+        BaseDiscordObject._auto_dict = generated  # type: ignore
+
+
+def run(scale: str = 'large',
+        cases: Optional[List[str]] = None,
+        min_time: float = 0.2,
+        rounds: int = 3,
+        seed: int = 0,
+        generic: bool = False,
+        lazy: bool = False,
+        lazy_timestamps: bool = False,
+        ) -> Dict[str, dict]:
+    '''Run the selected cases.
+
+    Arguments:
+        scale (str): Key of `SCALES`.
+        cases ([str]): Case names to run, all of them when omitted.
+        min_time (float): Minimum seconds per timed round.
+        rounds (int): Timed rounds per case, the best is kept.
+        seed (int): Generator seed.
+        generic (bool): Use the generic `_auto_map` walker instead of the generated parsers.
+        lazy (bool): Parse messages and interactions lazily.
+        lazy_timestamps (bool): Keep timestamps as strings until they are read.
+
+    Returns:
+        Dict[str, dict]: Measurements keyed by case name.
+    '''
+    available = build_cases(scale, seed)
+    selected = cases if cases else list(available)
+    unknown = set(selected) - set(available)
+    if unknown:
+        raise ValueError(f'Unknown cases {sorted(unknown)}, expected some of {sorted(available)}.')
+
+    results = dict()
+    with generic_auto_dict() if generic else contextlib.nullcontext(), \
+            lazy_parsing() if lazy else contextlib.nullcontext(), \
+            lazy_timestamp_parsing() if lazy_timestamps else contextlib.nullcontext():
+        for name in selected:
+            parse, payload = available[name]
+            ops = _time(parse, payload, min_time, rounds)
+            blocks, size = _allocations(parse, payload, max(1, min(1_000, int(ops * min_time))))
+            results[name] = {'ops_per_second': ops, 'blocks_per_call': blocks, 'bytes_per_call': size}
+    return results
+
+
+def save_baseline(path: str, results: Dict[str, dict], scale: str):
+    '''Write results to `path` as a baseline for `compare()`.'''
+    document = {
+        'scale': scale,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': results,
+    }
+    with open(path, 'wb') as fp:
+        fp.write(json.dumps(document, option=json.OPT_INDENT_2 | json.OPT_SORT_KEYS))
+
+
+def load_baseline(path: str) -> dict:
+    '''Read a baseline written by `save_baseline()`.'''
+    with open(path, 'rb') as fp:
+        return json.loads(fp.read())
+
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float = 0.15) -> List[dict]:
+    '''Compare results with a baseline.
+
+    A case regresses when its throughput drops, or its retained bytes grow, by more than `tolerance`.
+
+    Returns:
+        [dict]: One row per case with the ratios against the baseline and a `regressed` flag.
+    '''
+    rows = list()
+    for name, result in results.items():
+        previous = baseline['results'].get(name)
+        row = {'case': name, **result, 'speed_ratio': None, 'bytes_ratio': None, 'regressed': False}
+        if previous is not None:
+            row['speed_ratio'] = result['ops_per_second'] / previous['ops_per_second']
+            row['bytes_ratio'] = result['bytes_per_call'] / previous['bytes_per_call'] if previous['bytes_per_call'] > 0 else None
+            row['regressed'] = row['speed_ratio'] < 1 - tolerance or (row['bytes_ratio'] is not None and row['bytes_ratio'] > 1 + tolerance)
+        rows.append(row)
+    return rows
+
+
+COLUMNS = ('case', 'ops_per_second', 'blocks_per_call', 'bytes_per_call', 'speed_ratio', 'bytes_ratio', 'regressed')
@@ -0,0 +1,67 @@
+'''Shared helpers for summarising and printing benchmark results.'''
+import os
+import sys
+
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, not available on Windows
+    resource = None  # type: ignore
+
+
+def percentile(samples: Sequence[float], fraction: float) -> Optional[float]:
+    '''Nearest rank percentile of `samples`, `None` when there are none.'''
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def cpu_seconds() -> float:
+    '''User plus system CPU time used by this process.'''
+    if resource is None:
+        times = os.times()
+        return times.user + times.system
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def rss_bytes() -> Optional[int]:
+    '''Current resident set size, where the platform exposes it.'''
+    try:
+        with open('/proc/self/statm') as fp:
+            return int(fp.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def max_rss_bytes() -> Optional[int]:
+    '''Peak resident set size of this process.'''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def print_table(rows: List[Dict[str, object]], columns: Sequence[str]):
+    '''Print `rows` as an aligned plain text table.'''
+    def cell(value):
+        if value is None:
+            return '-'
+        if isinstance(value, bool):
+            return 'yes' if value else 'no'
+        if isinstance(value, float):
+            return f'{value:,.3f}'
+        if isinstance(value, int):
+            return f'{value:,}'
+        return str(value)
+
+    table = [list(columns)] + [[cell(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    for number, line in enumerate(table):
+        print('  '.join(text.rjust(width) if number else text.ljust(width) for text, width in zip(line, widths)))
+        if number == 0:
+            print('  '.join('-' * width for width in widths))
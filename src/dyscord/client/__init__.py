@@ -1,10 +1,27 @@
-from .enumerations import INTENTS, DISCORD_EVENTS
-from .discord_client import DiscordClient
-from .api import API
+from typing import TYPE_CHECKING
+
+from ..utilities.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .enumerations import INTENTS, DISCORD_EVENTS
+    from .discord_client import DiscordClient
+    from .api import API
+    from .recorder import GatewayRecorder, GatewayReplayer
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'INTENTS': ('.enumerations', 'INTENTS'),
+    'DISCORD_EVENTS': ('.enumerations', 'DISCORD_EVENTS'),
+    'DiscordClient': ('.discord_client', 'DiscordClient'),
+    'API': ('.api', 'API'),
+    'GatewayRecorder': ('.recorder', 'GatewayRecorder'),
+    'GatewayReplayer': ('.recorder', 'GatewayReplayer'),
+})
 
 __all__ = [
     'INTENTS',
     'DISCORD_EVENTS',
     'DiscordClient',
     'API',
+    'GatewayRecorder',
+    'GatewayReplayer',
 ]
@@ -1,10 +1,14 @@
 import asyncio
+import contextvars
 import datetime
-from pprint import pprint
+import functools
+import inspect
+import time
+import weakref
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 import cachetools
 import cachetools.keys
-import httpx
 
 from ...objects.snowflake import Snowflake
 
@@ -12,65 +16,280 @@ from ...utilities import Log
 
 from ... import objects
 
+if TYPE_CHECKING:
+    import httpx
+
+
+class _Endpoint:
+    '''Bind an endpoint coroutine to an `API_V9` instance.
+
+    When accessed through the class (`API.get_channel(...)`) the endpoint binds to `API_V9.active()`, which keeps the
+    classmethod style calls used throughout the objects working while every client talks with its own credentials.
+    '''
+
+    def __init__(self, func):
+        self.func = func
+        functools.update_wrapper(self, func)
+        if hasattr(inspect, 'markcoroutinefunction'):
+            inspect.markcoroutinefunction(self)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = owner.active()
+        return self.func.__get__(instance, owner)
+
+
+class _RateLimitBucket:
+    '''Book keeping for a single rate limit bucket.'''
+
+    # Seconds the requests held behind a probe wait for its response before going ahead anyway.
+    PROBE_TIMEOUT: float = 5.0
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self._probe: Optional[asyncio.Event] = None
+
+    async def acquire(self, log: Log):
+        '''Wait until the bucket has room for another request, then claim it.'''
+        async with self.lock:
+            await self._wait_for_probe()
+            if self.remaining == 0:
+                delay = self.reset_at - time.monotonic()
+                if delay > 0:
+                    log.warning(f'Rate limit encountered, waiting for {delay:.3f}s.')
+                    await asyncio.sleep(delay)
+                if self.limit is None:
+                    # The size of the bucket is unknown, let this request through alone. Others wait for its response to refill the bucket.
+                    self.remaining = None
+                    self._probe = asyncio.Event()
+                    return
+                self.remaining = self.limit
+            if self.remaining is not None:
+                self.remaining -= 1
+
+    async def _wait_for_probe(self):
+        '''Wait for the response of a request let through alone after a reset, if there is one.'''
+        probe = self._probe
+        if probe is None:
+            return
+        try:
+            await asyncio.wait_for(probe.wait(), self.PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        self._probe = None
+
+    def update(self, headers):
+        '''Update bucket state from the headers of a response.'''
+        if 'x-ratelimit-limit' in headers:
+            self.limit = int(headers['x-ratelimit-limit'])
+        if 'x-ratelimit-remaining' in headers:
+            self.remaining = int(headers['x-ratelimit-remaining'])
+        if 'x-ratelimit-reset-after' in headers:
+            self.reset_at = time.monotonic() + float(headers['x-ratelimit-reset-after'])
+        elif 'x-ratelimit-reset' in headers:
+            self.reset_at = time.monotonic() + (float(headers['x-ratelimit-reset']) - time.time())
+        if self._probe is not None:
+            self._probe.set()
+
+
+_active_api: 'contextvars.ContextVar[API_V9]' = contextvars.ContextVar('dyscord_active_api')
+
 
 class API_V9:
-    '''Version 9 of the discord API.'''
+    '''Version 9 of the discord API.
+
+    Each instance carries its own token, application id, rate limit buckets and cache namespace. All instances share a
+    single `httpx.AsyncClient` connection pool, so many bots in one process reuse the same TLS connections.
+
+    Arguments:
+        token (str): Bot token used to authorize requests.
+        application_id (str): Application ID, required for interaction and command endpoints.
+        base_url (str): Override the API root, useful to point at a local stand-in server.
+        namespace (str): Key used to namespace cached responses. Defaults to the token, so instances of the same bot share entries.
+    '''
 
     BASE_URL = 'https://discord.com/api/v9'
-    TOKEN: str  # Overridden when the API is loaded in DiscordClient._connect
-    APPLICATION_ID: str
     USER_AGENT: str = 'Discord Bot ()'
+    MAX_RETRIES: int = 3
+    _MAJOR_PARAMETERS = ('channel_id', 'guild_id', 'interaction_token')
 
-    _lock = asyncio.Lock()
     _log = Log()
     _ttl_cache: dict = cachetools.TTLCache(10_000, ttl=datetime.timedelta(minutes=15), timer=datetime.datetime.now)  # type: ignore
+    _pool: Optional['httpx.AsyncClient'] = None
+    _pool_loop: Optional[asyncio.AbstractEventLoop] = None
+    _default: Optional['API_V9'] = None
+    _fallback: Optional['API_V9'] = None
+    _activated: 'weakref.WeakSet[API_V9]' = weakref.WeakSet()
+
+    def __init__(self,
+                 token: Optional[str] = None,
+                 application_id: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 namespace: Optional[str] = None,
+                 ):
+        '''Create a REST client for a single bot.'''
+        self.token = token
+        self.application_id = application_id
+        self.base_url = base_url if base_url is not None else self.BASE_URL
+        self.namespace = namespace if namespace is not None else token
+
+        self._buckets: Dict[Tuple[str, tuple], _RateLimitBucket] = dict()
+        self._bucket_hashes: Dict[str, str] = dict()
+        self._global_reset_at: float = 0.0
+
+    @classmethod
+    def active(cls) -> 'API_V9':
+        '''Return the instance bound to the current context.
+
+        Outside of any client context this falls back to the instance given to `set_default()`, or to the only bot that has
+        been activated. When several bots with different tokens are alive there is no safe choice, so this raises instead
+        of sending the request with another bot's token.
+
+        Raises:
+            RuntimeError: No instance is bound to the current context and more than one bot is active.
+        '''
+        try:
+            return _active_api.get()
+        except LookupError:
+            pass
+        if API_V9._default is not None:
+            return API_V9._default
+        activated = {instance.token: instance for instance in API_V9._activated if instance.token is not None}
+        if len(activated) > 1:
+            raise RuntimeError('Several clients are active and none is bound to this context. Call the API through a '
+                               'client (`client.api`), from one of its tasks, or pick one with `API.set_default()`.')
+        if activated:
+            return next(iter(activated.values()))
+        if API_V9._fallback is None:
+            API_V9._fallback = cls()
+        return API_V9._fallback
+
+    @classmethod
+    def set_default(cls, instance: Optional['API_V9']) -> None:
+        '''Use `instance` for class level calls made outside of any client context, `None` to clear it.'''
+        API_V9._default = instance
+
+    def activate(self) -> 'contextvars.Token':
+        '''Bind this instance to the current context.
+
+        Class level calls such as `API.get_channel(...)` made from this context, or from any task created from it, will use
+        this instance.
+        '''
+        API_V9._activated.add(self)
+        return _active_api.set(self)
 
     @classmethod
-    def _auth_header(cls):
-        return {'Authorization': f'Bot {cls.TOKEN}', 'Content-Type': 'application/json'}
+    def pool(cls) -> 'httpx.AsyncClient':
+        '''Return the connection pool shared by every instance, creating one for the running loop if needed.'''
+        loop = asyncio.get_running_loop()
+        if API_V9._pool is None or API_V9._pool.is_closed or API_V9._pool_loop is not loop:
+            import httpx  # Deferred, it is slow to import and not needed until the first request.
+            API_V9._pool = httpx.AsyncClient()
+            API_V9._pool_loop = loop
+        return API_V9._pool
 
     @classmethod
-    async def _handle_rate_limit(cls, response):
+    async def close_pool(cls) -> None:
+        '''Close the shared connection pool. It will be recreated on the next request.'''
+        if API_V9._pool is not None:
+            await API_V9._pool.aclose()
+        API_V9._pool = None
+        API_V9._pool_loop = None
+
+    def _auth_header(self):
+        return {'Authorization': f'Bot {self.token}', 'Content-Type': 'application/json'}
+
+    def _cache_key(self, *args):
+        return cachetools.keys.hashkey(self.namespace, *args)
+
+    def _get_bucket(self, method: str, route: str, major: tuple) -> _RateLimitBucket:
+        route_key = f'{method} {route}'
+        key = (self._bucket_hashes.get(route_key, route_key), major)
+        if key not in self._buckets:
+            self._buckets[key] = _RateLimitBucket()
+        return self._buckets[key]
+
+    async def _handle_rate_limit(self, response, bucket: _RateLimitBucket, route_key: str, major: tuple):
         headers = response.headers
 
-        if 'x-ratelimit-reset' not in headers:
-            return
+        if 'x-ratelimit-bucket' in headers and self._bucket_hashes.get(route_key) != headers['x-ratelimit-bucket']:
+            # Routes sharing a bucket hash share their limits, adopt the existing bucket if there is one.
+            self._bucket_hashes[route_key] = headers['x-ratelimit-bucket']
+            previous, bucket = bucket, self._buckets.setdefault((headers['x-ratelimit-bucket'], major), bucket)
+            if previous is not bucket:
+                previous.update(headers)
 
-        reset_datetime = datetime.datetime.fromtimestamp(float(headers['x-ratelimit-reset']))
-        time_until_reset = reset_datetime - datetime.datetime.now()
+        bucket.update(headers)
 
-        if int(headers["x-ratelimit-remaining"]) == 0:
-            cls._log.warning(f'Rate limit encountered, waiting for {time_until_reset}.')
-            await asyncio.sleep(time_until_reset.total_seconds())
+        if response.status_code != 429:
+            return False
 
-    @classmethod
-    async def _invoke_method(cls, method):
-        async with cls._lock:
-            r = await method
-            try:
-                r.raise_for_status()
-            except Exception:
-                cls._log.exception(r.content)
-                raise
-            await cls._handle_rate_limit(r)
+        retry_after = float(headers.get('retry-after', 1))
+        try:
+            body = response.json()
+            retry_after = float(body.get('retry_after', retry_after))
+            is_global = bool(body.get('global', False))
+        except Exception:
+            is_global = False
+        if headers.get('x-ratelimit-global') or headers.get('x-ratelimit-scope') == 'global':
+            is_global = True
+
+        if is_global:
+            self._global_reset_at = time.monotonic() + retry_after
+        self._log.warning(f'Got 429 on [{route_key}] (global={is_global}), retrying in {retry_after:.3f}s.')
+        await asyncio.sleep(retry_after)
+        return True
+
+    async def _request(self,
+                       method: str,
+                       route: str,
+                       auth: bool = True,
+                       json=None,
+                       headers: Optional[dict] = None,
+                       **route_parameters,
+                       ) -> 'httpx.Response':
+        '''Issue a request against the API, honoring per route and global rate limits.'''
+        url = f'{self.base_url}{route.format(**route_parameters)}'
+        major = tuple(str(route_parameters[key]) for key in self._MAJOR_PARAMETERS if key in route_parameters)
+        route_key = f'{method} {route}'
+        request_headers = self._auth_header() if auth else dict()
+        request_headers['User-Agent'] = self.USER_AGENT
+        if headers is not None:
+            request_headers.update(headers)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            global_delay = self._global_reset_at - time.monotonic()
+            if global_delay > 0:
+                await asyncio.sleep(global_delay)
+
+            bucket = self._get_bucket(method, route, major)
+            await bucket.acquire(self._log)
+
+            r = await self.pool().request(method, url, headers=request_headers, json=json)
+
+            if not await self._handle_rate_limit(r, bucket, route_key, major) or attempt == self.MAX_RETRIES:
+                break
+
+        try:
+            r.raise_for_status()
+        except Exception:
+            self._log.exception(r.content)
+            raise
         return r
 
     # GATEWAY ENDPOINTS
 
-    @classmethod
-    async def get_gateway_bot(cls, token: str) -> dict:
+    @_Endpoint
+    async def get_gateway_bot(self, token: Optional[str] = None) -> dict:
         '''Get URL of the gateway for bots.'''
+        token = token if token is not None else self.token
         if not isinstance(token, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(token)}] for token.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    f'{cls.BASE_URL}/gateway/bot',
-                    headers={'Authorization': f'Bot {token}'},
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('GET', '/gateway/bot', auth=False, headers={'Authorization': f'Bot {token}'})
 
         # Add our own settings to URI
         data = r.json()
@@ -78,188 +297,106 @@ class API_V9:
 
         return data
 
-    @classmethod
-    async def get_gateway(cls) -> dict:
+    @_Endpoint
+    async def get_gateway(self) -> dict:
         '''Get URL of the gateway.'''
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(f'{cls.BASE_URL}/gateway')
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
-
+        r = await self._request('GET', '/gateway', auth=False)
         return r.json()
 
-    @classmethod
-    async def get_global_application_commands(cls):
+    @_Endpoint
+    async def get_global_application_commands(self):
         '''Get all global application commands.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/commands'
-
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('GET', '/applications/{application_id}/commands', application_id=self.application_id)
         return r.json()
 
-    @classmethod
-    async def create_global_application_command(cls, command_structure: dict):
+    @_Endpoint
+    async def create_global_application_command(self, command_structure: dict):
         '''Create or update a global application command.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/commands'
-
         if not isinstance(command_structure, (dict,)):
             raise TypeError(f'Got illegal type [{type(command_structure)}] for command_structure.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.post(
-                    url,
-                    headers=cls._auth_header(),
-                    json=command_structure,
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('POST', '/applications/{application_id}/commands', json=command_structure, application_id=self.application_id)
         return r.json()
 
-    @classmethod
-    async def get_global_application_command(cls, command_id: 'objects.Snowflake'):
+    @_Endpoint
+    async def get_global_application_command(self, command_id: 'objects.Snowflake'):
         '''Get a global application command.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/commands/{command_id}'
-
         if not isinstance(command_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(command_id)}] for command_id.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('GET', '/applications/{application_id}/commands/{command_id}', application_id=self.application_id, command_id=command_id)
         return r.json()
 
-    @classmethod
-    async def edit_global_application_command(cls,
+    @_Endpoint
+    async def edit_global_application_command(self,
                                               command_id: 'objects.Snowflake',
                                               command_structure: dict
                                               ):
         '''Edit a global application command.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/commands/{command_id}'
-
         if not isinstance(command_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(command_id)}] for command_id.')
         if not isinstance(command_structure, (dict,)):
             raise TypeError(f'Got illegal type [{type(command_structure)}] for command_structure.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.patch(
-                    url,
-                    headers=cls._auth_header(),
-                    json=command_structure,
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('PATCH', '/applications/{application_id}/commands/{command_id}', json=command_structure,
+                                application_id=self.application_id, command_id=command_id)
         return r.json()
 
-    @classmethod
-    async def delete_global_application_command(cls, command_id: 'objects.Snowflake'):
+    @_Endpoint
+    async def delete_global_application_command(self, command_id: 'objects.Snowflake'):
         '''Delete a global application command.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/commands/{command_id}'
-
         if not isinstance(command_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(command_id)}] for command_id.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.delete(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        await self._request('DELETE', '/applications/{application_id}/commands/{command_id}', application_id=self.application_id, command_id=command_id)
 
-    @classmethod
-    async def bulk_overwrite_global_application_commands(cls, command_id: 'objects.Snowflake'):
+    @_Endpoint
+    async def bulk_overwrite_global_application_commands(self, command_id: 'objects.Snowflake'):
         '''Unimplemented.'''
         # PUT/applications/{application.id}/commands
         raise NotImplementedError('TBD')
 
-    @classmethod
-    async def get_guild_application_commands(cls, guild_id: 'objects.Snowflake'):
+    @_Endpoint
+    async def get_guild_application_commands(self, guild_id: 'objects.Snowflake'):
         '''Get all application commands from a specific guild.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/guilds/{guild_id}/commands'
-
         if not isinstance(guild_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(guild_id)}] for guild_id.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('GET', '/applications/{application_id}/guilds/{guild_id}/commands', application_id=self.application_id, guild_id=guild_id)
         return r.json()
 
-    @classmethod
-    async def create_guild_application_command(cls,
+    @_Endpoint
+    async def create_guild_application_command(self,
                                                guild_id: 'objects.Snowflake',
                                                command_structure: dict
                                                ) -> dict:
         '''Create a guild appplication command.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/guilds/{guild_id}/commands'
-
         if not isinstance(guild_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(guild_id)}] for guild_id.')
         if not isinstance(command_structure, (dict,)):
             raise TypeError(f'Got illegal type [{type(command_structure)}] for command_structure.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.post(
-                    url,
-                    headers=cls._auth_header(),
-                    json=command_structure,
-                )
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    pprint(command_structure)
-                    pprint(r.json())
-                    raise
-            await cls._handle_rate_limit(r)
+        r = await self._request('POST', '/applications/{application_id}/guilds/{guild_id}/commands', json=command_structure,
+                                application_id=self.application_id, guild_id=guild_id)
         return r.json()
 
-    @classmethod
-    async def get_guild_application_command(cls,
+    @_Endpoint
+    async def get_guild_application_command(self,
                                             guild_id: 'objects.Snowflake',
                                             command_id: 'objects.Snowflake',
                                             ) -> dict:
         '''Get a specific guild application command.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/guilds/{guild_id}/commands/{command_id}'
-
         if not isinstance(guild_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(guild_id)}] for guild_id.')
         if not isinstance(command_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(command_id)}] for command_id.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('GET', '/applications/{application_id}/guilds/{guild_id}/commands/{command_id}',
+                                application_id=self.application_id, guild_id=guild_id, command_id=command_id)
         return r.json()
 
-    @classmethod
-    async def edit_guild_application_command(cls,
+    @_Endpoint
+    async def edit_guild_application_command(self,
                                              guild_id: 'objects.Snowflake',
                                              command_id: 'objects.Snowflake',
                                              command_structure: dict,
@@ -268,34 +405,22 @@ class API_V9:
         # PATCH /applications/{application.id}/guilds/{guild.id}/commands/{command.id}
         raise NotImplementedError('TBD')
 
-    @classmethod
-    async def delete_guild_application_command(cls,
+    @_Endpoint
+    async def delete_guild_application_command(self,
                                                guild_id: 'objects.Snowflake',
                                                command_id: 'objects.Snowflake',
                                                ) -> None:
         '''Delete an application command.'''
-        url = f'{cls.BASE_URL}/applications/{cls.APPLICATION_ID}/guilds/{guild_id}/commands/{command_id}'
-
         if not isinstance(guild_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(guild_id)}] for guild_id.')
         if not isinstance(command_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(command_id)}] for command_id.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.delete(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    pprint(r.json())
-                    raise
-            await cls._handle_rate_limit(r)
+        await self._request('DELETE', '/applications/{application_id}/guilds/{guild_id}/commands/{command_id}',
+                            application_id=self.application_id, guild_id=guild_id, command_id=command_id)
 
-    @classmethod
-    async def bulk_overwrite_guild_application_command(cls,
+    @_Endpoint
+    async def bulk_overwrite_guild_application_command(self,
                                                        guild_id: 'objects.Snowflake',
                                                        command_id: 'objects.Snowflake',
                                                        command_structure: dict,
@@ -308,15 +433,13 @@ class API_V9:
     '''
     '''
 
-    @classmethod
-    async def create_interaction_response(cls,
+    @_Endpoint
+    async def create_interaction_response(self,
                                           interaction_id: 'objects.Snowflake',
                                           interaction_token: str,
                                           data_structure: dict,
                                           ) -> None:
         '''TODO: Copy from api docs.'''
-        url = f'{cls.BASE_URL}/interactions/{interaction_id}/{interaction_token}/callback'
-
         if not isinstance(interaction_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(interaction_id)}] for interaction_id.')
         if not isinstance(interaction_token, (str, )):
@@ -324,40 +447,23 @@ class API_V9:
         if not isinstance(data_structure, (dict, )):
             raise TypeError(f'Got illegal type [{type(data_structure)}] for data_structure.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.post(
-                    url,
-                    json=data_structure
-                )
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    print(r.content)
-                    raise
-            await cls._handle_rate_limit(r)
+        await self._request('POST', '/interactions/{interaction_id}/{interaction_token}/callback', auth=False, json=data_structure,
+                            interaction_id=interaction_id, interaction_token=interaction_token)
 
-    @classmethod
-    async def get_original_interaction_response(cls,
+    @_Endpoint
+    async def get_original_interaction_response(self,
                                                 interaction_token: str,
                                                 ) -> dict:
         '''TODO: Copy from api docs.'''
-        url = f'{cls.BASE_URL}/webhooks/{cls.APPLICATION_ID}/{interaction_token}/messages/@origional'
-
         if not isinstance(interaction_token, (str, )):
             raise TypeError(f'Got illegal type [{type(interaction_token)}] for interaction_token.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url,
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('GET', '/webhooks/{application_id}/{interaction_token}/messages/@origional', auth=False,
+                                application_id=self.application_id, interaction_token=interaction_token)
         return r.json()
 
-    @classmethod
-    async def edit_original_interaction_response(cls,
+    @_Endpoint
+    async def edit_original_interaction_response(self,
                                                  interaction_token: str,
                                                  data_structure: dict,
                                                  ) -> None:
@@ -367,24 +473,16 @@ class API_V9:
 
         Edits the initial Interaction response. Functions the same as Edit Webhook Message.
         '''
-        url = f'{cls.BASE_URL}/webhooks/{cls.APPLICATION_ID}/{interaction_token}/messages/@original'
-
         if not isinstance(interaction_token, (str, )):
             raise TypeError(f'Got illegal type [{type(interaction_token)}] for interaction_token.')
         if not isinstance(data_structure, (dict, )):
             raise TypeError(f'Got illegal type [{type(data_structure)}] for data_structure.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.patch(
-                    url,
-                    json=data_structure
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        await self._request('PATCH', '/webhooks/{application_id}/{interaction_token}/messages/@original', auth=False, json=data_structure,
+                            application_id=self.application_id, interaction_token=interaction_token)
 
-    @classmethod
-    async def delete_original_interaction_response(cls,
+    @_Endpoint
+    async def delete_original_interaction_response(self,
                                                    interaction_token: str,
                                                    ) -> None:
         '''Delete Original Interaction Response.
@@ -393,21 +491,14 @@ class API_V9:
 
         Deletes the initial Interaction response. Returns 204 on success.
         '''
-        url = f'{cls.BASE_URL}/webhooks/{cls.APPLICATION_ID}/{interaction_token}/messages/@original'
-
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.delete(
-                    url,
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
-
         if not isinstance(interaction_token, (str, )):
             raise TypeError(f'Got illegal type [{type(interaction_token)}] for interaction_token.')
 
-    @classmethod
-    async def create_followup_message(cls,
+        await self._request('DELETE', '/webhooks/{application_id}/{interaction_token}/messages/@original', auth=False,
+                            application_id=self.application_id, interaction_token=interaction_token)
+
+    @_Endpoint
+    async def create_followup_message(self,
                                       interaction_token: str,
                                       data_structure: dict,
                                       ) -> dict:
@@ -419,29 +510,17 @@ class API_V9:
         and flags can be set to 64 in the body to send an ephemeral message. The thread_id query parameter is not required
         (and is furthermore ignored) when using this endpoint for interaction followups.
         '''
-        url = f'{cls.BASE_URL}/webhooks/{cls.APPLICATION_ID}/{interaction_token}'
-
         if not isinstance(interaction_token, (str, )):
             raise TypeError(f'Got illegal type [{type(interaction_token)}] for interaction_token.')
         if not isinstance(data_structure, (dict,)):
             raise TypeError(f'Got illegal type [{type(data_structure)}] for data_structure.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.post(
-                    url,
-                    json=data_structure
-                )
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    print(r)
-                    raise
-            await cls._handle_rate_limit(r)
+        r = await self._request('POST', '/webhooks/{application_id}/{interaction_token}', auth=False, json=data_structure,
+                                application_id=self.application_id, interaction_token=interaction_token)
         return r.json()
 
-    @classmethod
-    async def get_followup_message(cls,
+    @_Endpoint
+    async def get_followup_message(self,
                                    interaction_token: str,
                                    message_id: 'Snowflake',
                                    ) -> dict:
@@ -451,28 +530,17 @@ class API_V9:
 
         Returns a followup message for an Interaction. Functions the same as Get Webhook Message. Does not support ephemeral followups.
         '''
-        url = f'{cls.BASE_URL}/webhooks/{cls.APPLICATION_ID}/{interaction_token}/messages/{message_id}'
-
         if not isinstance(interaction_token, (str, )):
             raise TypeError(f'Got illegal type [{type(interaction_token)}] for interaction_token.')
         if not isinstance(message_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(message_id)}] for message_id.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url
-                )
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    print(r)
-                    raise
-            await cls._handle_rate_limit(r)
+        r = await self._request('GET', '/webhooks/{application_id}/{interaction_token}/messages/{message_id}', auth=False,
+                                application_id=self.application_id, interaction_token=interaction_token, message_id=message_id)
         return r.json()
 
-    @classmethod
-    async def edit_followup_message(cls,
+    @_Endpoint
+    async def edit_followup_message(self,
                                     interaction_token: str,
                                     message_id: 'Snowflake',
                                     data_structure: dict,
@@ -483,8 +551,6 @@ class API_V9:
 
         Edits a followup message for an Interaction. Functions the same as Edit Webhook Message. Does not support ephemeral followups.
         '''
-        url = f'{cls.BASE_URL}/webhooks/{cls.APPLICATION_ID}/{interaction_token}/messages/{message_id}'
-
         if not isinstance(interaction_token, (str, )):
             raise TypeError(f'Got illegal type [{type(interaction_token)}] for interaction_token.')
         if not isinstance(message_id, (str, Snowflake)):
@@ -492,18 +558,12 @@ class API_V9:
         if not isinstance(data_structure, (dict, )):
             raise TypeError(f'Got illegal type [{type(data_structure)}] for data_structure.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.patch(
-                    url,
-                    json=data_structure
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        r = await self._request('PATCH', '/webhooks/{application_id}/{interaction_token}/messages/{message_id}', auth=False, json=data_structure,
+                                application_id=self.application_id, interaction_token=interaction_token, message_id=message_id)
         return r.json()
 
-    @classmethod
-    async def delete_followup_message(cls,
+    @_Endpoint
+    async def delete_followup_message(self,
                                       interaction_token: str,
                                       message_id: 'Snowflake',
                                       ) -> None:
@@ -513,20 +573,13 @@ class API_V9:
 
         Deletes a followup message for an Interaction. Returns 204 on success. Does not support ephemeral followups.
         '''
-        url = f'{cls.BASE_URL}/webhooks/{cls.APPLICATION_ID}/{interaction_token}/messages/{message_id}'
-
         if not isinstance(interaction_token, (str,)):
             raise TypeError(f'Got illegal type [{type(interaction_token)}] for interaction_token.')
         if not isinstance(message_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(message_id)}] for message_id.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.delete(
-                    url
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
+        await self._request('DELETE', '/webhooks/{application_id}/{interaction_token}/messages/{message_id}', auth=False,
+                            application_id=self.application_id, interaction_token=interaction_token, message_id=message_id)
 
     '''
     TODO: Implement the following API endpoints.
@@ -546,119 +599,79 @@ class API_V9:
 
     # Channel methods
 
-    @classmethod
-    async def get_channel(cls, channel_id: 'objects.Snowflake') -> dict:
+    @_Endpoint
+    async def get_channel(self, channel_id: 'objects.Snowflake') -> dict:
         '''Get channel by ID.'''
-        url = f'{cls.BASE_URL}/channels/{channel_id}'
-
         if not isinstance(channel_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(channel_id)}] for channel_id.')
 
         try:
-            return cls._ttl_cache[cachetools.keys.hashkey('get_channel', channel_id)]
+            return self._ttl_cache[self._cache_key('get_channel', channel_id)]
         except KeyError:
             pass
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                r.raise_for_status()
-            await cls._handle_rate_limit(r)
-        cls._ttl_cache[cachetools.keys.hashkey('get_channel', channel_id)] = r.json()
+        r = await self._request('GET', '/channels/{channel_id}', channel_id=channel_id)
+        self._ttl_cache[self._cache_key('get_channel', channel_id)] = r.json()
         return r.json()
 
-    @classmethod
-    async def create_message(cls,
+    @_Endpoint
+    async def create_message(self,
                              channel_id: 'objects.Snowflake',
                              message_payload: dict,
                              ):
         '''TODO: Copy from api docs.'''
-        url = f'{cls.BASE_URL}/channels/{channel_id}/messages'
-
         if not isinstance(channel_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(channel_id)}] for channel_id.')
         if not isinstance(message_payload, (dict,)):
             raise TypeError(f'Got illegal type [{type(message_payload)}] for message_payload.')
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.post(
-                    url,
-                    headers=cls._auth_header(),
-                    json=message_payload,
-                )
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    cls._log.exception(r.content)
-                    raise
-            await cls._handle_rate_limit(r)
+        r = await self._request('POST', '/channels/{channel_id}/messages', json=message_payload, channel_id=channel_id)
         return r.json()
 
     # Guild methods
 
-    @classmethod
-    async def get_guild(cls, guild_id: 'objects.Snowflake') -> dict:
+    @_Endpoint
+    async def get_guild(self, guild_id: 'objects.Snowflake') -> dict:
         '''Get guilds.
 
         TODO: Document this.
         '''
-        url = f'{cls.BASE_URL}/guilds/{guild_id}'
-
         if not isinstance(guild_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(guild_id)}] for guild_id.')
 
         try:
-            return cls._ttl_cache[cachetools.keys.hashkey('get_guild', guild_id)]
+            return self._ttl_cache[self._cache_key('get_guild', guild_id)]
         except KeyError:
             pass
 
-        async with cls._lock:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url,
-                    headers=cls._auth_header(),
-                )
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    cls._log.exception(r.content)
-                    raise
-            await cls._handle_rate_limit(r)
-        cls._ttl_cache[cachetools.keys.hashkey('get_guild', guild_id)] = r.json()
+        r = await self._request('GET', '/guilds/{guild_id}', guild_id=guild_id)
+        self._ttl_cache[self._cache_key('get_guild', guild_id)] = r.json()
         return r.json()
 
-    @classmethod
-    async def get_guild_roles(cls, guild_id: 'Snowflake') -> dict:
+    @_Endpoint
+    async def get_guild_roles(self, guild_id: 'Snowflake') -> dict:
         '''Get Guild Roles.
 
         GET/guilds/{guild.id}/roles
 
         Returns a list of role objects for the guild.
         '''
-        url = f'{cls.BASE_URL}/guilds/{guild_id}/roles'
-
         if not isinstance(guild_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(guild_id)}] for guild_id.')
 
         try:
-            return cls._ttl_cache[cachetools.keys.hashkey('get_guild_roles', guild_id)]
+            return self._ttl_cache[self._cache_key('get_guild_roles', guild_id)]
         except KeyError:
             pass
 
-        async with httpx.AsyncClient() as client:
-            method = client.get(url, headers=cls._auth_header())
-            r = await cls._invoke_method(method)
-        cls._ttl_cache[cachetools.keys.hashkey('get_guild_roles', guild_id)] = r.json()
+        r = await self._request('GET', '/guilds/{guild_id}/roles', guild_id=guild_id)
+        self._ttl_cache[self._cache_key('get_guild_roles', guild_id)] = r.json()
         return r.json()
 
     # User methods
 
-    @classmethod
-    async def get_current_user(cls) -> dict:
+    @_Endpoint
+    async def get_current_user(self) -> dict:
         '''Get Current User.
 
         GET/users/@me
@@ -666,56 +679,41 @@ class API_V9:
         Returns the user object of the requester's account. For OAuth2, this requires the identify scope, which will return the object without an email,
         and optionally the email scope, which returns the object with an email.
         '''
-        url = f'{cls.BASE_URL}/users/@me'
-
-        async with httpx.AsyncClient() as client:
-            method = client.get(url, headers=cls._auth_header())
-            r = await cls._invoke_method(method)
+        r = await self._request('GET', '/users/@me')
         return r.json()
 
-    @classmethod
-    async def get_user(cls, user_id: 'Snowflake') -> dict:
+    @_Endpoint
+    async def get_user(self, user_id: 'Snowflake') -> dict:
         '''Get User.
 
         GET/users/{user.id}
 
         Returns a user object for a given user ID.
         '''
-        url = f'{cls.BASE_URL}/users/{user_id}'
-
         if not isinstance(user_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(user_id)}] for user_id.')
 
         try:
-            return cls._ttl_cache[cachetools.keys.hashkey('get_user', user_id)]
+            return self._ttl_cache[self._cache_key('get_user', user_id)]
         except KeyError:
             pass
 
-        async with httpx.AsyncClient() as client:
-            method = client.get(url, headers=cls._auth_header())
-            r = await cls._invoke_method(method)
-        cls._ttl_cache[cachetools.keys.hashkey('get_user', user_id)] = r.json()
+        r = await self._request('GET', '/users/{user_id}', user_id=user_id)
+        self._ttl_cache[self._cache_key('get_user', user_id)] = r.json()
         return r.json()
 
-    @classmethod
-    async def create_dm(cls, recipient_id: 'Snowflake') -> dict:
+    @_Endpoint
+    async def create_dm(self, recipient_id: 'Snowflake') -> dict:
         '''Create DM.
 
         POST/users/@me/channels
 
         Create a new DM channel with a user. Returns a DM channel object.
         '''
-        url = f'{cls.BASE_URL}/users/@me/channels'
-
         if not isinstance(recipient_id, (str, Snowflake)):
             raise TypeError(f'Got illegal type [{type(recipient_id)}] for recipient_id.')
 
-        async with httpx.AsyncClient() as client:
-            method = client.post(url,
-                                 json={'recipient_id': recipient_id},
-                                 headers=cls._auth_header(),
-                                 )
-            r = await cls._invoke_method(method)
+        r = await self._request('POST', '/users/@me/channels', json={'recipient_id': recipient_id})
         return r.json()
 
     '''
@@ -9,9 +9,8 @@ import warnings
 
 from collections import defaultdict
 from pprint import pprint
-from typing import Any, Callable, Optional, List
+from typing import Any, Callable, Dict, Optional, List
 
-import nest_asyncio  # type: ignore
 import orjson as json
 import websockets
 
@@ -33,22 +32,30 @@ from .events import on_any, on_channel_create, on_channel_delete, on_channel_pin
 
 
 class DiscordClient:
-    '''Client for interaction with Discord.'''
+    '''Client for interaction with Discord.
+
+    All connection, session and handler state lives on the instance, so several clients may share a single event loop.
+
+    Entities received from the gateway are kept in `cache`, a `utilities.Cache`, before handlers are called.
+    '''
 
     _log = utilities.Log()
-    _raw_callbacks: List[Callable] = list()
-    _wrapper_registrations: dict = defaultdict(lambda: list())
-    _wrapper_class_registrations: list = list()
     _version = __version__
-    _sequence_number = None
-    _reconnect_lock = asyncio.Lock()
-    me: objects.User
-    session_id: str
+    _raw_callbacks: List[Callable]
+    _wrapper_registrations: Dict[str, List[Callable]]
+    _wrapper_class_registrations: List[Callable]
+    _sequence_number: Optional[int]
+    _reconnect_lock: asyncio.Lock
+    _closing: Optional[asyncio.Event]
+    api: 'api.API'
+    cache: 'utilities.Cache'
+    me: Optional[objects.User]
+    session_id: Optional[str]
     token: str
     application_id: Optional[str]
     intent: int
     ready: bool
-    resuming: bool = False
+    resuming: bool
 
     def __init__(self, token: str, application_id: Optional[str] = None):
         '''Instantiate a DiscordClient.
@@ -58,15 +65,31 @@ class DiscordClient:
             application_id (str): The application id. Can be left to None if client will not use Interactions.
         '''
         # Discord attributes
-        self.__class__.token = token
-        self.__class__.application_id = application_id
-        self.__class__.intent = 0
-        self.__class__.ready = False
+        self.token = token
+        self.application_id = application_id
+        self.api = api.API(token, application_id)
+        self.cache = utilities.Cache()
+        self.intent = 0
+        self.ready = False
+        self.resuming = False
+        self.me = None
+
+        # Session attributes, these must survive a reconnect so we can resume.
+        self.session_id = None
+        self._sequence_number = None
+
+        # Handler registrations
+        self._raw_callbacks = list()
+        self._wrapper_registrations = defaultdict(list)
+        self._wrapper_class_registrations = list()
 
         # Private attributes
         self._heartbeat_task = None
         self._last_heartbeat_ack = None
         self._listener_task = None
+        self._gateway_ws = None
+        self._reconnect_lock = asyncio.Lock()
+        self._closing = None
         self._intents_defined = False
 
     def configure_intents(self,  # noqa: C901
@@ -147,46 +170,81 @@ class DiscordClient:
             self.intent += intent
         self._intents_defined = True
 
-    def run(self, loop: asyncio.AbstractEventLoop = None):
-        '''Start the async loop and run forever.
+    def run(self,
+            loop: asyncio.AbstractEventLoop = None,
+            loop_factory: Optional[Callable[[], asyncio.AbstractEventLoop]] = None,
+            use_uvloop: bool = False,
+            ):
+        '''Start the async loop and run until `close()` is called.
+
+        This is a blocking convenience wrapper around `start()`. Applications that already own a running loop (an ASGI app, for example) should `await client.start()`
+        instead.
 
         Arguments:
             loop (asyncio.AbstractEventLoop): If desired, use a given asyncio compatible loop. One will be created if not given.
+            loop_factory (Callable): Callable returning a new event loop, used when `loop` is not given. Defaults to `asyncio.new_event_loop`.
+            use_uvloop (bool): Shortcut for `loop_factory=uvloop.new_event_loop`. Requires the `uvloop` extra to be installed.
         '''
+        if use_uvloop:
+            if loop is not None or loop_factory is not None:
+                raise ValueError('use_uvloop cannot be combined with loop or loop_factory.')
+            try:
+                import uvloop  # type: ignore
+            except ImportError as e:
+                raise ImportError('use_uvloop requires uvloop, install it with `pip install dyscord[uvloop]`.') from e
+            loop_factory = uvloop.new_event_loop
+
+        if loop is not None and loop_factory is not None:
+            raise ValueError('Only one of loop or loop_factory may be given.')
+
         self._log.notice('Starting...')
         self._log.notice(f'Platform: [{platform.platform()}]')
         self._log.notice(f'Python Version: [{sys.version}]')
         self._log.notice(f'Python Version Info: [{sys.version_info}]')
         self._log.notice(f'Dyscord Version: [v{__version__}]')
 
-        loop = loop if loop is not None else asyncio.get_event_loop()
-
-        nest_asyncio.apply(loop)
-
-        loop.create_task(self._run())
-
-        loop.run_forever()
-
-    async def _run(self, ):  # noqa: C901
-
+        owns_loop = loop is None
+        loop = loop if loop is not None else (loop_factory or asyncio.new_event_loop)()
+        asyncio.set_event_loop(loop)
+        self._log.notice(f'Event Loop: [{type(loop).__module__}.{type(loop).__qualname__}]')
+
+        try:
+            loop.run_until_complete(self.start())
+        except KeyboardInterrupt:
+            self._log.critical('KeyboardInterrupt detected, exiting now!')
+        finally:
+            loop.run_until_complete(self.close())
+            loop.run_until_complete(api.API.close_pool())
+            if owns_loop:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
+    async def start(self):  # noqa: C901
+        '''Connect to discord and keep the connection alive until `close()` is called.
+
+        Safe to await from any running asyncio loop, the client never blocks or re-enters the loop.
+        '''
         if self._intents_defined is False:
             warnings.warn('Started without defining intents. Client will likely get ZERO input. Consider calling the \'configure_intents\' function.', UserWarning)
 
-        # BUG: This might cause Runtime errors, we need to wait and see. See https://github.com/erdewit/nest_asyncio/issues/22.
-        # This will be left here for now, as it avoids weird issues and allows us to work if the user bypasses run().
-        nest_asyncio.apply()
+        # Created here so they bind to the loop we are actually running on.
+        self._closing = asyncio.Event()
+        self._reconnect_lock = asyncio.Lock()
 
-        loop = asyncio.get_event_loop()
-        if not hasattr(loop, '_nest_patched'):
-            raise RuntimeError('Cannot run this library without running \'nest_asyncio.apply()\' first.')
+        # Every task spawned from here on talks to the REST API with our credentials.
+        self.api.activate()
 
         # Start up the listener
         await self._connect()
 
-        # Sleep forever
-        while True:
+        # Watch the listener until we are told to stop
+        while not self._closing.is_set():
 
-            await asyncio.sleep(1)
+            try:
+                await asyncio.wait_for(self._closing.wait(), 1)
+                break
+            except asyncio.TimeoutError:
+                pass
 
             if self._reconnect_lock.locked():
                 continue
@@ -200,22 +258,42 @@ class DiscordClient:
                     if exception:
                         try:
                             raise exception
-                        except KeyboardInterrupt:
-                            self._log.critical('KeyboardInterrupt detected, exiting now!')
-                            exit()
                         except Exception:
                             self._log.exception('Caught exception')
                     self._log.critical('Listener task has died, sleeping for 30 seconds and reconnecting.')
                     await asyncio.sleep(30)
                     await self._reconnect()
 
+    async def close(self):
+        '''Stop the gateway connection and background tasks.
+
+        `start()` returns once this completes. The shared HTTP pool is left open for any other clients, see `API.close_pool()`.
+        '''
+        if self._closing is not None:
+            self._closing.set()
+
+        self.ready = False
+
+        for task in (self._heartbeat_task, self._listener_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._heartbeat_task = None
+        self._listener_task = None
+        self._last_heartbeat_ack = None
+
+        if self._gateway_ws is not None:
+            await self._gateway_ws.close()
+            self._gateway_ws = None
+
+        self._log.info('Client closed.')
+
     async def _connect(self, is_reconnect=False):
         '''TODO: Implement connection to discord's servers.'''
-        api.API.TOKEN = self.token
-        if type(self.application_id) is str:
-            api.API.APPLICATION_ID = self.application_id
-
-        gateway_uri = (await api.API.get_gateway_bot(self.token))['url']
+        gateway_uri = (await self.api.get_gateway_bot())['url']
         self._log.debug(f'Try to connect to {gateway_uri}')
 
         if self._listener_task is not None:
@@ -273,8 +351,8 @@ class DiscordClient:
                     await callback(data)
 
                 if 's' in data and data['s'] is not None:
-                    self.__class__._sequence_number = data['s']
-                    self._log.trace(f'Updated seq count to [{self.__class__._sequence_number}].')
+                    self._sequence_number = data['s']
+                    self._log.trace(f'Updated seq count to [{self._sequence_number}].')
 
                 opcode = data['op']
 
@@ -285,7 +363,7 @@ class DiscordClient:
 
                 elif opcode == 1:
                     self._log.debug('OPCODE 1: HEARTBEAT')
-                    data = {'op': 1, 'd': self.__class__._sequence_number}
+                    data = {'op': 1, 'd': self._sequence_number}
                     await self._gateway_ws.send(json.dumps(data))
 
                 elif opcode == 7:
@@ -312,7 +390,7 @@ class DiscordClient:
 
         self._log.debug('New heartbeat task started. Send new heartbeat NOW.')
 
-        data = {'op': 1, 'd': self.__class__._sequence_number}
+        data = {'op': 1, 'd': self._sequence_number}
         await self._gateway_ws.send(json.dumps(data))
 
         self._log.debug('Heartbeat sent, loop time.')
@@ -329,7 +407,7 @@ class DiscordClient:
                 asyncio.shield(self._reconnect())
                 return
 
-            data = {'op': 1, 'd': self.__class__._sequence_number}
+            data = {'op': 1, 'd': self._sequence_number}
             self._log.debug(f'Sending heartbeat: {data}')
 
             current_last_heartbeat = self._last_heartbeat_ack
@@ -408,7 +486,7 @@ class DiscordClient:
     async def __reconnect(self):
         '''Send a reconnect message.'''
         self._log.warning('Starting __reconnect...')
-        self.__class__.ready = False
+        self.ready = False
 
         if self._listener_task is not None:
             self._log.trace('Kill listener...')
@@ -452,13 +530,13 @@ class DiscordClient:
             'op': 6,
             'd': {
                 'token': self.token,
-                'session_id': self.__class__.session_id,
-                'seq': self.__class__._sequence_number,
+                'session_id': self.session_id,
+                'seq': self._sequence_number,
             }
         }
         self._log.debug('Sending resume.')
         self._log.debug(f'{data}')
-        self.__class__.resuming = True
+        self.resuming = True
         await self._gateway_ws.send(json.dumps(data))
 
     async def _event_dispatcher(self, data):  # noqa: C901
@@ -472,32 +550,34 @@ class DiscordClient:
 
         if event_type == 'READY':
             obj = objects.Ready().from_dict(data['d'])
-            self.__class__.session_id = obj.session_id
-            self.__class__.ready = True
-            self.__class__.me = obj.user
+            self.session_id = obj.session_id
+            self.ready = True
+            self.me = obj.user
+            self.cache.add_ready(obj, owner=self)
             self._log.debug('Discord connection complete, we are ready!')
             self._log.debug(f'We are now {self.me}')
 
         elif event_type == 'RESUMED':
-            self.__class__.ready = True
-            self.__class__.resuming = False
+            self.ready = True
+            self.resuming = False
             self._log.info('Discord resume complete, we are ready!')
 
-        elif not self.__class__.ready and not self.resuming:
+        elif not self.ready and not self.resuming:
             self._log.warning(f'Got event of type [{event_type}] before we were ready!')
             return
 
         elif event_type == 'CHANNEL_CREATE':
-            obj = objects.ChannelImporter().from_dict(data['d'])
+            obj = self.cache.merge_channel(data['d'])
 
         elif event_type == 'CHANNEL_DELETE':
             obj = objects.ChannelImporter().from_dict(data['d'])
+            self.cache.remove_channel(obj.id, data['d'].get('guild_id'))
 
         elif event_type == 'CHANNEL_PINS_UPDATE':
             warnings.warn(f'Encountered unhandled event {event_type}')
 
         elif event_type == 'CHANNEL_UPDATE':
-            obj = objects.ChannelImporter().from_dict(data['d'])
+            obj = self.cache.merge_channel(data['d'])
 
         elif event_type == 'GUILD_BAN_ADD':
             warnings.warn(f'Encountered unhandled event {event_type}')
@@ -506,10 +586,16 @@ class DiscordClient:
             warnings.warn(f'Encountered unhandled event {event_type}')
 
         elif event_type == 'GUILD_CREATE':
-            obj = objects.Guild().from_dict(data['d'])
+            obj = self.cache.merge_guild(data['d'], owner=self)
 
         elif event_type == 'GUILD_DELETE':
-            warnings.warn(f'Encountered unhandled event {event_type}')
+            if data['d'].get('unavailable'):
+                # An outage, the guild is sent again with GUILD_CREATE once it is back.
+                obj = self.cache.get_guild(data['d']['id'])
+                if obj is not None:
+                    obj.unavailable = True
+            else:
+                obj = self.cache.remove_guild(data['d']['id'], owner=self)
 
         elif event_type == 'GUILD_EMOJIS_UPDATE':
             warnings.warn(f'Encountered unhandled event {event_type}')
@@ -518,13 +604,15 @@ class DiscordClient:
             warnings.warn(f'Encountered unhandled event {event_type}')
 
         elif event_type == 'GUILD_MEMBER_ADD':
-            warnings.warn(f'Encountered unhandled event {event_type}')
+            obj = self.cache.merge_member(data['d'])
 
         elif event_type == 'GUILD_MEMBER_REMOVE':
-            warnings.warn(f'Encountered unhandled event {event_type}')
+            obj = objects.User.canonical(data['d']['user'])
+            self.cache.remove_member(data['d']['guild_id'], obj.id)
 
         elif event_type == 'GUILD_MEMBER_UPDATE':
             obj = objects.events.GuildMemberUpdate(data['d'])
+            self.cache.merge_member(data['d'])
 
         elif event_type == 'GUILD_ROLE_CREATE':
             warnings.warn(f'Encountered unhandled event {event_type}')
@@ -539,7 +627,7 @@ class DiscordClient:
             warnings.warn(f'Encountered unhandled event {event_type}')
 
         elif event_type == 'GUILD_UPDATE':
-            obj = objects.Guild().from_dict(data['d'])
+            obj = self.cache.merge_guild(data['d'], owner=self)
 
         elif event_type == 'INTEGRATION_CREATE':
             warnings.warn(f'Encountered unhandled event {event_type}')
@@ -558,12 +646,17 @@ class DiscordClient:
 
         elif event_type == 'MESSAGE_CREATE':
             obj = objects.Message().from_dict(data['d'])
+            self.cache.add_message(obj, data['d'])
 
         elif event_type == 'MESSAGE_DELETE':
-            obj = objects.Message().from_dict(data['d'])
+            # Hand over the cached message when there is one, so handlers can see what was deleted.
+            obj = self.cache.remove_message(data['d']['id'])
+            if obj is None:
+                obj = objects.Message().from_dict(data['d'])
 
         elif event_type == 'MESSAGE_DELETE_BULK':
-            warnings.warn(f'Encountered unhandled event {event_type}')
+            obj = objects.events.MessageDeleteBulk(data['d'])
+            obj.messages = self.cache.remove_messages(obj.ids)
 
         elif event_type == 'MESSAGE_REACTION_ADD':
             warnings.warn(f'Encountered unhandled event {event_type}')
@@ -579,9 +672,13 @@ class DiscordClient:
 
         elif event_type == 'MESSAGE_UPDATE':
             obj = objects.MessageUpdate().from_dict(data['d'])
+            obj.cached = self.cache.get_message(obj.id)
+            if obj.cached is not None:
+                obj.changes = obj.cached.apply_update(data['d'])
 
         elif event_type == 'PRESENCE_UPDATE':
             obj = objects.Presence(data=data['d'])
+            self.cache.add_presence(obj)
 
         elif event_type == 'STAGE_INSTANCE_CREATE':
             warnings.warn(f'Encountered unhandled event {event_type}')
@@ -593,10 +690,11 @@ class DiscordClient:
             warnings.warn(f'Encountered unhandled event {event_type}')
 
         elif event_type == 'THREAD_CREATE':
-            obj = objects.ChannelImporter().from_dict(data['d'])
+            obj = self.cache.merge_channel(data['d'])
 
         elif event_type == 'THREAD_DELETE':
             obj = objects.ChannelImporter().from_dict(data['d'])
+            self.cache.remove_channel(obj.id, data['d'].get('guild_id'))
 
         elif event_type == 'THREAD_LIST_SYNC':
             warnings.warn(f'Encountered unhandled event {event_type}')
@@ -608,7 +706,7 @@ class DiscordClient:
             warnings.warn(f'Encountered unhandled event {event_type}')
 
         elif event_type == 'THREAD_UPDATE':
-            obj = objects.ChannelImporter().from_dict(data['d'])
+            obj = self.cache.merge_channel(data['d'])
 
         elif event_type == 'TYPING_START':
             obj = objects.events.typing_start.TypingStart().from_dict(data['d'])
@@ -642,17 +740,17 @@ class DiscordClient:
         # Call user wrapped classes, functions and cotoutines.
         # TODO: Should we invoke a create_task when able to avoid blocking calls?
         arguments = (obj, data, self)
-        for user_function in self.__class__._wrapper_registrations[event_type]:
+        for user_function in self._wrapper_registrations[event_type]:
             arg_len = len(inspect.signature(user_function).parameters)
             assert arg_len >= 0 and arg_len <= 3
             if asyncio.iscoroutinefunction(user_function):
-                self._log.critical('Found function!')
+                self._log.trace('Found function!')
                 await user_function(*arguments[:arg_len])
             else:
-                self._log.critical('Found function!')
+                self._log.trace('Found function!')
                 user_function(*arguments[:arg_len])
 
-        for user_class in self.__class__._wrapper_class_registrations:
+        for user_class in self._wrapper_class_registrations:
             if hasattr(user_class, event_handler_name):
                 user_function = getattr(user_class, event_handler_name)
                 arg_len = len(inspect.signature(user_function).parameters)
@@ -660,14 +758,14 @@ class DiscordClient:
                 if list(inspect.signature(user_function).parameters.items())[0][0] != 'cls':
                     warnings.warn('Wrapped class does not appear to be using class methods, unexpected behavior may result!', UserWarning)
                 if asyncio.iscoroutinefunction(user_function):
-                    self._log.critical('Found function!')
+                    self._log.trace('Found function!')
                     await user_function(user_class, *arguments[:arg_len])
                 else:
-                    self._log.critical('Found function!')
+                    self._log.trace('Found function!')
                     user_function(user_class, *arguments[:arg_len])
 
         # Handle the special case of the ANY event.
-        for user_function in self.__class__._wrapper_registrations['ANY']:
+        for user_function in self._wrapper_registrations['ANY']:
             arg_len = len(inspect.signature(user_function).parameters)
             assert arg_len >= 0 and arg_len <= 3
             if asyncio.iscoroutinefunction(user_function):
@@ -675,7 +773,7 @@ class DiscordClient:
             else:
                 user_function(*arguments[:arg_len])
 
-        for user_class in self.__class__._wrapper_class_registrations:
+        for user_class in self._wrapper_class_registrations:
             if hasattr(user_class, 'on_any'):
                 user_function = getattr(user_class, event_handler_name)
                 arg_len = len(inspect.signature(user_function).parameters)
@@ -738,8 +836,7 @@ class DiscordClient:
     on_webhooks_update = on_webhooks_update
     on_interaction_create = on_interaction_create
 
-    @classmethod
-    def decorate_handler(cls, event: str):
+    def decorate_handler(self, event: str):
         '''Register a given function to a given event string.
 
         This function should be used as a decorator around a function to map that function to a given event. The decorator takes one argument, a string which maps to the type of event we should map
@@ -758,6 +855,8 @@ class DiscordClient:
         The `raw_dict` is a raw dictionary the API emitted.
 
         The `client` is the DiscordClient instance.
+
+        Handlers are registered against this client only. Other clients running in the same process will not see them.
         '''
         if not hasattr(DISCORD_EVENTS, event) and event != 'ANY':
             raise ValueError(f'Attempted to bind to unknown event \'{event}\', must be exact match for existing {DISCORD_EVENTS} entry.')
@@ -770,20 +869,19 @@ class DiscordClient:
                 async def wrapped_func(*args, **kwargs):  # type: ignore
                     await func(*args, **kwargs)
 
-                cls._wrapper_registrations[event].append(wrapped_func)
+                self._wrapper_registrations[event].append(wrapped_func)
                 return wrapped_func
             else:
                 @functools.wraps(func)
                 def wrapped_func(*args, **kwargs):  # type: ignore
                     func(*args, **kwargs)
 
-                cls._wrapper_registrations[event].append(wrapped_func)
+                self._wrapper_registrations[event].append(wrapped_func)
                 return wrapped_func
 
         return func_wrapper
 
-    @classmethod
-    def decorate_class(cls, target_class):
+    def decorate_class(self, target_class):
         '''Register a given class and attempt to call any valid on_<event> functions.
 
         By convention functions of the class should be async.
@@ -793,11 +891,10 @@ class DiscordClient:
         async def class_wrapper(cls, *args, **kwargs):
             pass
 
-        cls._wrapper_class_registrations.append(class_wrapper)
+        self._wrapper_class_registrations.append(class_wrapper)
 
         return class_wrapper
 
-    @classmethod
-    def _register_raw_callback(cls, callback: Callable[[dict], Any]):
+    def _register_raw_callback(self, callback: Callable[[dict], Any]):
         '''Register a raw callback that will receive pure dicts from the API.'''
-        cls._raw_callbacks.append(callback)
+        self._raw_callbacks.append(callback)
@@ -268,7 +268,7 @@ async def on_invite_delete(self, object: BaseDiscordObject, raw_object: dict):
     pass
 
 
-async def on_message_create(self, message: objects.Message, raw_message: dict):
+async def on_message_create(self, message: 'objects.Message', raw_message: dict):
     '''Empty placeholder for given event.
 
     Arguments:
@@ -279,23 +279,23 @@ async def on_message_create(self, message: objects.Message, raw_message: dict):
     pass
 
 
-async def on_message_delete(self, object: BaseDiscordObject, raw_object: dict):
+async def on_message_delete(self, message: 'objects.Message', raw_object: dict):
     '''Empty placeholder for given event.
 
     Arguments:
         self (DiscordClient): Client
-        object (BaseDiscordObject): Python object representing the event.
+        message (Message): The deleted message as it was cached. When it was not cached, only `id`, `channel_id` and `guild_id` are set.
         raw_object (dict): Raw dict from discord API.
     '''
     pass
 
 
-async def on_message_delete_bulk(self, object: BaseDiscordObject, raw_object: dict):
+async def on_message_delete_bulk(self, event: 'objects.events.MessageDeleteBulk', raw_object: dict):
     '''Empty placeholder for given event.
 
     Arguments:
         self (DiscordClient): Client
-        object (BaseDiscordObject): Python object representing the event.
+        event (MessageDeleteBulk): IDs of the deleted messages, and in `messages` those that were cached.
         raw_object (dict): Raw dict from discord API.
     '''
     pass
@@ -345,12 +345,13 @@ async def on_message_reaction_remove_emoji(self, object: BaseDiscordObject, raw_
     pass
 
 
-async def on_message_update(self, message: objects.MessageUpdate, raw_object: dict):
+async def on_message_update(self, message: 'objects.MessageUpdate', raw_object: dict):
     '''Empty placeholder for given event.
 
     Arguments:
         self (DiscordClient): Client
-        message (MessageUpdate): Updated message. Note that many fields may be missing from this entity!
+        message (MessageUpdate): Updated message. Note that many fields may be missing from this entity! When the message was cached, `message.cached`
+            is the cached message with the update applied and `message.changes` holds the `(old, new)` value of every field that changed.
         raw_object (dict): Raw dict from discord API.
     '''
     pass
@@ -367,7 +368,7 @@ async def on_presence_update(self, object: BaseDiscordObject, raw_object: dict):
     pass
 
 
-async def on_ready(self, ready: objects.Ready, raw_ready: dict):
+async def on_ready(self, ready: 'objects.Ready', raw_ready: dict):
     '''Empty placeholder for given event.
 
     Arguments:
@@ -0,0 +1,186 @@
+'''Record raw gateway traffic to disk and replay it into a client offline.
+
+Recordings are gzip compressed JSON lines, one `{"ts": <epoch seconds>, "frame": <gateway payload>}` object per line. Each time a recorder is opened it appends a new gzip
+member to the file, so a recording can grow across restarts and a crash only loses the frames still sitting in the write buffer.
+'''
+import asyncio
+import gzip
+import time
+import zlib
+
+from typing import Iterator, Optional, Tuple, TYPE_CHECKING
+
+import orjson as json
+
+from ..utilities import Log
+
+if TYPE_CHECKING:
+    from .discord_client import DiscordClient
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, dict]]:
+    '''Yield `(timestamp, frame)` pairs from a recording.
+
+    A truncated tail, left behind when the recording process died, ends the iteration instead of raising.
+
+    Arguments:
+        path (str): Path of the recording.
+    '''
+    with gzip.open(path, 'rb') as fp:
+        while True:
+            try:
+                line = fp.readline()
+            except (EOFError, zlib.error, gzip.BadGzipFile):
+                return
+            if not line:
+                return
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Partial last line, the writer was interrupted mid frame.
+                return
+            yield record['ts'], record['frame']
+
+
+class GatewayRecorder:
+    '''Append raw gateway frames, with the time they were received, to a compressed file.
+
+    Examples:
+        ```python
+        client = DiscordClient(token)
+        GatewayRecorder('gateway.jsonl.gz').attach(client)
+        client.run()
+        ```
+
+    Attributes:
+        path (str): Recording file, opened in append mode.
+        frames (int): Number of frames written by this recorder.
+    '''
+
+    _log = Log()
+
+    def __init__(self, path: str, compresslevel: int = 6):
+        '''Create a recorder.
+
+        Arguments:
+            path (str): File to append to. Created if it does not exist.
+            compresslevel (int): gzip compression level, 1 (fastest) to 9 (smallest).
+        '''
+        self.path = path
+        self.frames = 0
+        self._compresslevel = compresslevel
+        self._fp: Optional[gzip.GzipFile] = None
+
+    def __enter__(self) -> 'GatewayRecorder':
+        '''Open the recording.'''
+        return self
+
+    def __exit__(self, *args):
+        '''Close the recording.'''
+        self.close()
+
+    def attach(self, client: 'DiscordClient') -> 'GatewayRecorder':
+        '''Record every frame `client` receives from the gateway.'''
+        client._register_raw_callback(self.record)
+        self._log.info(f'Recording gateway traffic to [{self.path}].')
+        return self
+
+    async def record(self, data: dict):
+        '''Raw callback, see `DiscordClient._register_raw_callback`.'''
+        self.write(data)
+
+    def write(self, data: dict, timestamp: Optional[float] = None):
+        '''Append a single frame.
+
+        Arguments:
+            data (dict): Gateway payload, as received.
+            timestamp (float): Epoch time the frame was received. Defaults to now.
+        '''
+        if self._fp is None:
+            self._fp = gzip.open(self.path, 'ab', compresslevel=self._compresslevel)  # type: ignore
+        record = {'ts': time.time() if timestamp is None else timestamp, 'frame': data}
+        self._fp.write(json.dumps(record) + b'\n')  # type: ignore
+        self.frames += 1
+
+    def flush(self):
+        '''Push buffered frames to disk, without ending the gzip member.'''
+        if self._fp is not None:
+            self._fp.flush()
+
+    def close(self):
+        '''Finish the gzip member and close the file. Further writes start a new member.'''
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+class GatewayReplayer:
+    '''Feed a recording back into a client's event dispatcher.
+
+    Only dispatch frames (opcode 0) reach `_event_dispatcher`, the connection level opcodes are skipped as there is no gateway on the other end.
+
+    Attributes:
+        path (str): Recording to replay.
+        speed (float|None): Playback rate relative to the recording. `1.0` is real time, `10.0` is ten times faster and `None` replays as fast as possible.
+    '''
+
+    _log = Log()
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        '''Create a replayer.
+
+        Arguments:
+            path (str): Recording to replay.
+            speed (float|None): Playback rate, see class attributes.
+        '''
+        if speed is not None and speed <= 0:
+            raise ValueError(f'speed must be positive or None, got [{speed}].')
+        self.path = path
+        self.speed = speed
+
+    async def replay(self, client: 'DiscordClient', assume_ready: bool = False) -> dict:
+        '''Replay the recording into `client`.
+
+        Arguments:
+            client (DiscordClient): Client to dispatch events to. It does not need to be connected.
+            assume_ready (bool): Mark the client ready first, for recordings that were started after `READY` was received.
+
+        Returns:
+            dict: `frames` and `events` replayed, `elapsed` wall time in seconds and `events_per_second`.
+        '''
+        if assume_ready:
+            client.ready = True
+
+        frames = 0
+        events = 0
+        first_ts = None
+        start = time.perf_counter()
+
+        for timestamp, frame in read_recording(self.path):
+            frames += 1
+
+            if self.speed is not None:
+                if first_ts is None:
+                    first_ts = timestamp
+                delay = (timestamp - first_ts) / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if frame.get('s') is not None:
+                client._sequence_number = frame['s']
+
+            if frame.get('op') != 0:
+                continue
+
+            await client._event_dispatcher(frame)
+            events += 1
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            'frames': frames,
+            'events': events,
+            'elapsed': elapsed,
+            'events_per_second': events / elapsed if elapsed else float('inf'),
+        }
+        self._log.info(f'Replayed {events:,} events from {frames:,} frames in {elapsed:,.3f}s.')
+        return stats
@@ -1,8 +1,18 @@
 '''Provide a alias namespace for common Commanding actions.'''
+from typing import TYPE_CHECKING
 
-from ..helper.command_handler import CommandHandler
-from ..objects.interactions import Command
-from ..objects.interactions.enumerations import COMMAND_TYPE
+from ..utilities.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ..helper.command_handler import CommandHandler
+    from ..objects.interactions import Command
+    from ..objects.interactions.enumerations import COMMAND_TYPE
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'CommandHandler': ('..helper.command_handler', 'CommandHandler'),
+    'Command': ('..objects.interactions', 'Command'),
+    'COMMAND_TYPE': ('..objects.interactions.enumerations', 'COMMAND_TYPE'),
+})
 
 __all__ = [
     'CommandHandler',
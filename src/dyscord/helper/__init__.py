@@ -1,6 +1,16 @@
+from typing import TYPE_CHECKING
 
-from .command_handler import CommandHandler
-from .interactions import Question, Confirmation
+from ..utilities.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .command_handler import CommandHandler
+    from .interactions import Question, Confirmation
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'CommandHandler': ('.command_handler', 'CommandHandler'),
+    'Question': ('.interactions', 'Question'),
+    'Confirmation': ('.interactions', 'Confirmation'),
+})
 
 __all__ = [
     'CommandHandler',
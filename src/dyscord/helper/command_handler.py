@@ -1,7 +1,6 @@
 import warnings
 import inspect
 import functools
-import httpx
 from cachetools import TTLCache
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -20,6 +19,40 @@ class CallbackData:
     unlimited: bool
 
 
+class _GuildLookup(dict):
+    '''Dict counting its changes in `version`, so what is derived from it, such as the guilds `ActiveGuilds` caches, is only recomputed after a change.'''
+
+    version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+
 class CommandHandler:
     '''Manage commands for the user.'''
     _log = Log()
@@ -28,7 +61,7 @@ class CommandHandler:
 
     global_lookup: 'Dict[str, Callable]' = dict()
 
-    guild_lookup: 'Dict[Tuple[str, Optional[snowflake.Snowflake]], Callable]' = dict()
+    guild_lookup: 'Dict[Tuple[str, Optional[snowflake.Snowflake]], Callable]' = _GuildLookup()
 
     registered_custom_ids: 'TTLCache[str, CallbackData]' = TTLCache(
         maxsize=float('inf'),
@@ -111,6 +144,8 @@ class CommandHandler:
     @classmethod
     async def handle_application_command(cls, interaction: 'interactions.Interaction', raw_data: dict, client: 'discord_client.DiscordClient') -> None:  # noqa: C901
         '''Handle interactions against Messages and Users.'''
+        import httpx  # Deferred, only needed once a request has been made.
+
         assert interaction.data is not None
         key: Tuple[Any, Optional['snowflake.Snowflake']]
 
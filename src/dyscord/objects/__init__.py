@@ -1,19 +1,50 @@
-from .activity import Activity
-from .embed import Embed, EmbedAdder
-from .emoji import Emoji
-from .guild import Guild
-from .message import Message, MessageUpdate
-from .permissions import Permissions
-from .presence import Presence
-from .ready import Ready
-from .role import Role
-from .snowflake import Snowflake
-from .user import User, Member
+from typing import TYPE_CHECKING
 
-from .channel import Channel, ChannelImporter, CategoryChannel, NewsChannel, TextChannel, StoreChannel, VoiceChannel
+from ..utilities.lazy import lazy_exports
 
-from . import interactions
-from . import events
+if TYPE_CHECKING:
+    from .activity import Activity
+    from .embed import Embed, EmbedAdder
+    from .emoji import Emoji
+    from .guild import Guild
+    from .message import Message, MessageUpdate
+    from .permissions import Permissions
+    from .presence import Presence
+    from .ready import Ready
+    from .role import Role
+    from .snowflake import Snowflake
+    from .user import User, Member
+
+    from .channel import Channel, ChannelImporter, CategoryChannel, NewsChannel, TextChannel, StoreChannel, VoiceChannel
+
+    from . import interactions
+    from . import events
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'Activity': ('.activity', 'Activity'),
+    'CategoryChannel': ('.channel', 'CategoryChannel'),
+    'Channel': ('.channel', 'Channel'),
+    'ChannelImporter': ('.channel', 'ChannelImporter'),
+    'Embed': ('.embed', 'Embed'),
+    'EmbedAdder': ('.embed', 'EmbedAdder'),
+    'Emoji': ('.emoji', 'Emoji'),
+    'events': ('.events', None),
+    'Guild': ('.guild', 'Guild'),
+    'interactions': ('.interactions', None),
+    'Member': ('.user', 'Member'),
+    'Message': ('.message', 'Message'),
+    'MessageUpdate': ('.message', 'MessageUpdate'),
+    'NewsChannel': ('.channel', 'NewsChannel'),
+    'Permissions': ('.permissions', 'Permissions'),
+    'Presence': ('.presence', 'Presence'),
+    'Ready': ('.ready', 'Ready'),
+    'Role': ('.role', 'Role'),
+    'Snowflake': ('.snowflake', 'Snowflake'),
+    'StoreChannel': ('.channel', 'StoreChannel'),
+    'TextChannel': ('.channel', 'TextChannel'),
+    'User': ('.user', 'User'),
+    'VoiceChannel': ('.channel', 'VoiceChannel'),
+})
 
 __all__ = [
     'Activity',
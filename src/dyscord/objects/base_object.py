@@ -1,15 +1,271 @@
 from datetime import datetime
-from abc import ABC
-from typing import Any, Dict, Optional
+from abc import ABC, ABCMeta
+from typing import Any, Callable, ClassVar, Dict, Optional, Set, Tuple
+import keyword
 import warnings
 from ..utilities import log
 
 
-class BaseDiscordObject(ABC):
-    '''Abstract base of all common discord objects. All subclasses map directly to an actual API object.'''
+class DiscordObjectMeta(ABCMeta):
+    '''Metaclass of discord objects, building their `_auto_map` parser and optionally storing attributes in `__slots__`.
+
+    Whenever a class defines or is assigned an `_auto_map` dict, a parser specialised to that map is generated once and stored as `_auto_parser`, see
+    `_compile_parser()`.
+
+    Slotted classes may list timestamp attributes in `_timestamp_fields`, mapping each to its parse function. Those slots accept the raw ISO 8601 string,
+    which is parsed and stored the first time the attribute is read, see `BaseDiscordObject.lazy_timestamps`.
+
+    Opt in to slots with `class Foo(Base, slots=True)`, subclasses of a slotted class are slotted as well. Every annotated attribute becomes a slot. Class level
+    defaults, usually `None`, are moved to `_slot_defaults` and returned by `__getattr__` until the slot is assigned, so reading an unset attribute behaves as
+    before. Assigning an attribute that was never declared raises `AttributeError`. Pass `weakref=True` as well to allow weak references to instances.
+    '''
+
+    def __new__(mcs, name, bases, namespace, slots: bool = False, weakref: bool = False, **kwargs):
+        '''Create the class, converting annotated defaults into slots when slotted and compiling its `_auto_map`.'''
+        inherited = [base for base in bases if getattr(base, '_slot_defaults', None) is not None]
+        if slots or inherited:
+            _convert_to_slots(bases, namespace, root=not inherited, weakref=weakref)
+        if '_auto_map' in namespace:
+            namespace['_auto_parser'] = _compile_parser(name, namespace['_auto_map'])
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        if '_timestamp_fields' in namespace:
+            _wrap_timestamp_slots(cls, namespace['_timestamp_fields'])
+        return cls
+
+    def __init__(cls, name, bases, namespace, slots: bool = False, weakref: bool = False, **kwargs):
+        '''Swallow the `slots` and `weakref` keywords.'''
+        super().__init__(name, bases, namespace, **kwargs)
+
+    def __setattr__(cls, name: str, value: Any):
+        '''Recompile the parser when `_auto_map` is replaced after class creation.'''
+        super().__setattr__(name, value)
+        if name == '_auto_map':
+            super().__setattr__('_auto_parser', _compile_parser(cls.__qualname__, value))
+
+
+class _TimestampSlot:
+    '''Wrap the slot of a timestamp attribute, so a raw string stored in it is parsed on first read.'''
+
+    __slots__ = ('slot', 'name', 'parse')
+
+    def __init__(self, slot: Any, name: str, parse: Callable[[str], datetime]):
+        self.slot = slot
+        self.name = name
+        self.parse = parse
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        try:
+            value = self.slot.__get__(obj, objtype)
+        except AttributeError:
+            value = type(obj).__getattr__(obj, self.name)
+        if value.__class__ is str:
+            value = self.parse(value)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any):
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj: Any):
+        self.slot.__delete__(obj)
+
+
+def _convert_to_slots(bases: tuple, namespace: 'Dict[str, Any]', root: bool, weakref: bool = False):
+    '''Turn the annotated attributes of a class namespace into `__slots__`, moving their defaults to `_slot_defaults`.'''
+    defaults: Dict[str, Any] = dict()
+    existing = set()
+    for base in reversed(bases):
+        defaults.update(getattr(base, '_slot_defaults', None) or {})
+        for klass in base.__mro__:
+            existing.update(klass.__dict__.get('__slots__', ()))
+
+    new_slots = ['__weakref__'] if weakref else list()
+    for attribute, annotation in namespace.get('__annotations__', {}).items():
+        if 'ClassVar' in str(annotation):
+            continue
+        if attribute in namespace:
+            defaults[attribute] = namespace.pop(attribute)
+        if attribute not in existing and attribute not in new_slots:
+            new_slots.append(attribute)
+
+    namespace['__slots__'] = tuple(new_slots)
+    namespace['_slot_defaults'] = defaults
+    if root and '__getattr__' not in namespace:
+        namespace['__getattr__'] = _slot_default
+
+
+def _wrap_timestamp_slots(cls: type, fields: 'Dict[str, Callable[[str], datetime]]'):
+    '''Replace the slot of every field in `fields` with a `_TimestampSlot` using its parse function.'''
+    for attribute, parse in fields.items():
+        slot = cls.__dict__.get(attribute)
+        if slot is not None and not isinstance(slot, _TimestampSlot):
+            setattr(cls, attribute, _TimestampSlot(slot, attribute, parse))
+
+
+def _slot_default(self, name: str) -> Any:
+    '''Return the class default of a slot that has not been assigned yet.'''
+    try:
+        return type(self)._slot_defaults[name]
+    except KeyError:
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}') from None
+
+
+def _lazy_field(self, name: str) -> Any:
+    '''`__getattr__` of objects that support lazy parsing.
+
+    Parses `name` from the payload kept in `_raw` with the class's `_field_parsers` the first time it is read, and stores the result on the object so later
+    reads are plain attribute reads. Fields missing from the payload read as their slot default, or raise `AttributeError` when there is none.
+    '''
+    parse = type(self)._field_parsers.get(name)
+    if parse is not None:
+        raw = self._raw
+        if raw is not None and name in raw:
+            value = parse(self, raw[name])
+            setattr(self, name, value)
+            return value
+    defaults = getattr(type(self), '_slot_defaults', None)
+    if defaults is not None and name in defaults:
+        return defaults[name]
+    raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+
+FieldChanges = Dict[str, Tuple[Any, Any]]
+'''`(old, new)` values of the fields an update changed, keyed by attribute name.'''
+
+_unknown_fields: Dict[type, Dict[str, int]] = dict()
+
+
+def _unchanged(new: Any, old: Any, seen: Optional[set] = None) -> bool:
+    '''Whether a merged value equals the current one.
+
+    Discord objects compare by identity first, then field by field, since the `__eq__` of `User` only compares IDs and refuses `None`. `seen` holds the
+    pairs already being compared, so objects referring back to each other do not recurse forever.
+    '''
+    if new is old:
+        return True
+    if isinstance(new, BaseDiscordObject) or isinstance(old, BaseDiscordObject):
+        if type(new) is not type(old):
+            return False
+        pair = (id(new), id(old))
+        if seen is None:
+            seen = set()
+        elif pair in seen:
+            return True
+        seen.add(pair)
+        return all(_unchanged(getattr(new, name, None), getattr(old, name, None), seen) for name in _field_names(new) | _field_names(old))
+    if new.__class__ is list and old.__class__ is list:
+        return len(new) == len(old) and all(_unchanged(item, old_item, seen) for item, old_item in zip(new, old))
+    return new == old
+
+
+def _field_names(obj: 'BaseDiscordObject') -> Set[str]:
+    '''Public attribute names of a discord object, from its slots and its `__dict__`.'''
+    names = {name for klass in type(obj).__mro__ for name in klass.__dict__.get('__slots__', ()) if not name.startswith('_')}
+    names.update(name for name in getattr(obj, '__dict__', ()) if not name.startswith('_'))
+    return names
+
+
+def _unexpected_key(self, attribute_key: str, value: Any):
+    '''Count a key missing from the `_auto_map`, warning the first time it is seen on this class, and keep it when the class captures unknown fields.'''
+    counts = _unknown_fields.setdefault(type(self), dict())
+    if attribute_key in counts:
+        counts[attribute_key] += 1
+    else:
+        counts[attribute_key] = 1
+        warnings.warn(RuntimeWarning(f'Saw unexpected attribute key [{attribute_key}] in [{self.__class__}].'))
+    if self.capture_unknown_fields:
+        setattr(self, attribute_key, value)
+
+
+def _unexpected_keys(self, data: 'Dict[str, Any]', known: frozenset):
+    '''Handle every key of `data` missing from the `_auto_map`.'''
+    for attribute_key, value in data.items():
+        if attribute_key not in known:
+            _unexpected_key(self, attribute_key, value)
+
+
+def _raise_not_implemented(self, data: 'Dict[str, Any]'):
+    raise NotImplementedError(f'_auto_map not defined for {self.__class__}.')
+
+
+def _compile_parser(name: str, auto_map: Optional[dict]) -> Optional[Callable[[Any, 'Dict[str, Any]'], Any]]:
+    '''Generate a parser specialised to `auto_map`.
+
+    The parser behaves like `BaseDiscordObject._auto_dict_generic()`, but checks for unexpected keys with one set comparison and then assigns every mapped key
+    with straight line code, instead of looking each key and its conversion up in the map. Misconfigured entries still raise when they are first used, as before.
+
+    Arguments:
+        name (str): Class name, used to label the generated function.
+        auto_map (dict): The `_auto_map` to compile. `None` gives a parser raising `NotImplementedError`.
+
+    Returns:
+        Callable: `parser(self, data)`, or `None` when `auto_map` is not a dict, in which case the generic path is used.
+    '''
+    if auto_map is None:
+        return _raise_not_implemented
+    if not isinstance(auto_map, dict):
+        return None
+
+    namespace: Dict[str, Any] = {'_unexpected_keys': _unexpected_keys, '_known': frozenset(auto_map), '_list': list}
+    lines = [
+        'def _auto_parser(self, data):',
+        '    if not data.keys() <= _known:',
+        '        _unexpected_keys(self, data, _known)',
+    ]
+    for index, (attribute_key, function) in enumerate(auto_map.items()):
+        if function is None:
+            continue
+        namespace[f'_k{index}'] = attribute_key
+        if attribute_key.isidentifier() and not keyword.iskeyword(attribute_key) and not attribute_key.startswith('__'):
+            assign = f'self.{attribute_key} = {{}}'.format
+        else:
+            assign = f'setattr(self, _k{index}, {{}})'.format
+        lines += [
+            f'    value = data.get({attribute_key!r})',
+            '    if value is not None:',
+        ]
+        if isinstance(function, list):
+            if len(function) != 1:
+                lines.append("        raise IndexError('Auto map has function list in excess of 1.')")
+                continue
+            namespace[f'_f{index}'] = function[0]
+            namespace[f'_t{index}'] = function
+            lines += [
+                '        if not isinstance(value, _list):',
+                f"            raise TypeError(f'Data from input dict [{{_k{index}}}:{{value}}] was not a list with list auto_mapped type [{{_t{index}}}].')",
+                '        ' + assign(f'[_f{index}(item) for item in value]'),
+            ]
+        else:
+            namespace[f'_f{index}'] = function
+            lines.append('        ' + assign(f'_f{index}(value)'))
+    lines.append('    return self')
+
+    exec(compile('\n'.join(lines), f'<auto_parser {name}>', 'exec'), namespace)
+    parser = namespace['_auto_parser']
+    parser.__qualname__ = f'{name}._auto_parser'
+    return parser
+
+
+class BaseDiscordObject(ABC, metaclass=DiscordObjectMeta):
+    '''Abstract base of all common discord objects. All subclasses map directly to an actual API object.
+
+    Keys Discord sends that are missing from a class's `_auto_map` are counted per class, see `unknown_field_stats()`. A `RuntimeWarning` is issued the first
+    time each key is seen on a class. The value is kept as an attribute unless `capture_unknown_fields` is `False`, set it on a class or on
+    `BaseDiscordObject` to drop them.
+
+    With `lazy_timestamps` set, classes that declare `_timestamp_fields` keep the timestamp strings from the payload and parse each one the first time it is
+    read.
+    '''
+
+    __slots__ = ()
 
     _log = log.Log()
+    capture_unknown_fields: ClassVar[bool] = True
+    lazy_timestamps: ClassVar[bool] = False
     _auto_map: dict = None  # type: ignore
+    _auto_parser: Optional[Callable[..., Any]]
 
     def __init__(self, data: Optional[dict] = None):
         '''Base generic __init__ function.
@@ -32,16 +288,60 @@ class BaseDiscordObject(ABC):
         '''Convert object to dictionary suitable for API or other generic useage.'''
         raise NotImplementedError(f'{self.__class__.__name__} does not yet implement this function.')
 
+    def apply_update(self, data: 'Dict[str, Any]') -> FieldChanges:
+        '''Merge a partial payload, such as the one of an update event, into this object.
+
+        Only the fields present in `data` are parsed and assigned, everything else is left as it is. A field whose parsed value equals the current one is not
+        reported. Nested discord objects, such as users, also in lists, count as unchanged when they are the same instance, as the identity map returns, see
+        `User.enable_identity_map()`, or when all of their fields are unchanged.
+
+        Arguments:
+            data (dict): Partial API compliant dict.
+
+        Returns:
+            Dict[str, Tuple[Any, Any]]: `(old, new)` of every field that changed, keyed by attribute name.
+
+        Raises:
+            NotImplementedError: The class has no `_field_parsers` table to merge with.
+        '''
+        parsers = getattr(type(self), '_field_parsers', None)
+        if parsers is None:
+            raise NotImplementedError(f'{self.__class__.__name__} does not support merging updates.')
+
+        changes: FieldChanges = dict()
+        for key, parse in parsers.items():
+            if key in data:
+                self._merge_field(changes, key, parse(self, data[key]))
+        return changes
+
+    def _merge_field(self, changes: FieldChanges, attribute: str, new: Any):
+        '''Assign `new` to `attribute` and record it in `changes`, unless it equals the current value.'''
+        old = getattr(self, attribute, None)
+        if _unchanged(new, old):
+            return
+        setattr(self, attribute, new)
+        if new.__class__ is str:
+            # Timestamp slots keep the string until read, compare and report the parsed value.
+            new = getattr(self, attribute)
+            if new == old:
+                return
+        changes[attribute] = (old, new)
+
     def _auto_dict(self, data: 'Dict[str, Any]') -> 'BaseDiscordObject':
         '''Attempt an automatic conversion of a dict to this objects type.'''
+        parser = self._auto_parser
+        if parser is None:
+            return self._auto_dict_generic(data)
+        return parser(data)
+
+    def _auto_dict_generic(self, data: 'Dict[str, Any]') -> 'BaseDiscordObject':
+        '''Convert a dict by walking the `_auto_map`, the reference for the generated parsers and the fallback for maps that are not dicts.'''
         if self._auto_map is None:
             raise NotImplementedError(f'_auto_map not defined for {self.__class__}.')
 
         for attribute_key, value in data.items():
-            self._log.trace(attribute_key)
             if attribute_key not in self._auto_map:
-                warnings.warn(RuntimeWarning(f'Saw unexpected attribute key [{attribute_key}] in [{self.__class__}].'))
-                setattr(self, attribute_key, value)
+                _unexpected_key(self, attribute_key, value)
                 continue
             function = self._auto_map[attribute_key]
             if (function is None) or (value is None):
@@ -59,6 +359,20 @@ class BaseDiscordObject(ABC):
                 setattr(self, attribute_key, function(value))
         return self
 
+    @staticmethod
+    def unknown_field_stats() -> Dict[str, Dict[str, int]]:
+        '''How often each unexpected key was seen, per class.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Counts by key, keyed by the dotted path of the class.
+        '''
+        return {f'{cls.__module__}.{cls.__qualname__}': dict(counts) for cls, counts in _unknown_fields.items()}
+
+    @staticmethod
+    def reset_unknown_field_stats():
+        '''Forget all counts, so every unexpected key warns again the next time it is seen.'''
+        _unknown_fields.clear()
+
     def validate(self):
         '''Check for valid object type.
 
@@ -4,9 +4,10 @@ from abc import ABC
 from .. import utilities
 from ..client import api
 from . import snowflake, message as ext_message, enumerations
+from .base_object import DiscordObjectMeta
 
 
-class Channel(ABC):
+class Channel(ABC, metaclass=DiscordObjectMeta, slots=True):
     '''Abstract base class for Channels.'''
 
     _log = utilities.Log()
@@ -36,6 +37,11 @@ class Channel(ABC):
     @classmethod
     async def get_channel(cls, channel_id: snowflake.Snowflake):
         '''Invoke cache or API to get a channel of given channel_id.'''
+        cache = utilities.Cache()
+        cached = cache.get_channel(channel_id)
+        if cached is not None:
+            return cached
+        cache.record_refetch('channels')
         return ChannelImporter().from_dict(await api.API.get_channel(channel_id))
 
 
@@ -74,7 +80,7 @@ class TextChannel(Channel):
             self.default_auto_archive_duration = data['default_auto_archive_duration']
         return self
 
-    async def send_message(self, message: Union[ext_message.Message, str]) -> 'ext_message.Message':
+    async def send_message(self, message: Union['ext_message.Message', str]) -> 'ext_message.Message':
         '''Send message to this channel. Will also accept a string.'''
         if type(message) is ext_message.Message:
             message.validate()
@@ -2,8 +2,6 @@ import abc
 import datetime
 from typing import Optional, List, Dict
 
-import validators  # type: ignore
-
 from .base_object import BaseDiscordObject
 from . import enumerations
 
@@ -120,6 +118,7 @@ class Embed(BaseDiscordObject):
         if self.url is not None:
             assert type(self.url) is str,\
                 f'Got invalid type {type(self.url)} for url.'
+            import validators  # type: ignore # Deferred, only needed when validating.
             if not validators.url(self.url, public=False):
                 raise AssertionError(f'URL fails validation: [{self.url}].')
 
@@ -593,12 +592,14 @@ class EmbedAdder(abc.ABC):
     Caution: This is an abstract class, and is not intended for direct instantiation.
     '''
 
+    __slots__ = ()
+
     embeds: Optional[List['Embed']] = None
 
     def add_embeds(self) -> 'Embed':
         '''Add embeds to the object.'''
         if not isinstance(self.embeds, list):
-            self.embeds: Optional[List['Embed']] = list()
+            self.embeds: Optional[List['Embed']] = list()  # type: ignore
         assert type(self.embeds) is list
         new_embed = Embed()
         self.embeds.append(new_embed)
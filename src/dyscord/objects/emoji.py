@@ -1,6 +1,4 @@
-import emoji
-
-from.base_object import BaseDiscordObject
+from .base_object import BaseDiscordObject
 
 
 class Emoji(BaseDiscordObject):
@@ -16,6 +14,7 @@ class Emoji(BaseDiscordObject):
 
         if (unicode is None) and (name is not None):
             assert type(self.name) is str
+            import emoji  # Deferred, its unicode tables are large and only needed here.
             self.unicode = emoji.unicode_codes.EMOJI_UNICODE_ENGLISH[self.name]
 
     def __str__(self):
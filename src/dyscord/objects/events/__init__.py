@@ -2,11 +2,13 @@
 
 from .typing_start import TypingStart
 from .guild_member_update import GuildMemberUpdate
+from .message_delete_bulk import MessageDeleteBulk
 from .voice_state import VoiceState
 
 
 __all__ = [
     'GuildMemberUpdate',
+    'MessageDeleteBulk',
     'TypingStart',
     'VoiceState'
 ]
@@ -4,6 +4,7 @@ import copy
 
 from ..base_object import BaseDiscordObject
 from .. import snowflake, user as ext_user
+from ...utilities.timestamps import parse_timestamp_cached
 
 
 class GuildMemberUpdate(BaseDiscordObject):
@@ -34,19 +35,17 @@ class GuildMemberUpdate(BaseDiscordObject):
     pending: 'Optional[bool]' = None  # type: ignore
     is_pending: 'Optional[bool]' = None  # type: ignore
 
-    @property
-    def _auto_map(self):
-        return {
-            'guild_id': snowflake.Snowflake,
-            'roles': [snowflake.Snowflake],
-            'user': ext_user.User,
-            'nick': str,
-            'avatar': str,
-            'joined_at': datetime.fromisoformat,
-            'premium_since': datetime.fromisoformat,
-            'deaf': bool,
-            'mute': bool,
-            'pending': bool,
-            'hoisted_role': copy.copy,
-            'is_pending': bool,
-        }
+    _auto_map = {
+        'guild_id': snowflake.Snowflake,
+        'roles': [snowflake.Snowflake],
+        'user': ext_user.User.canonical,
+        'nick': str,
+        'avatar': str,
+        'joined_at': parse_timestamp_cached,
+        'premium_since': parse_timestamp_cached,
+        'deaf': bool,
+        'mute': bool,
+        'pending': bool,
+        'hoisted_role': copy.copy,
+        'is_pending': bool,
+    }
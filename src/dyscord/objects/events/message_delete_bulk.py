@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+from ..base_object import BaseDiscordObject
+from .. import snowflake
+from ... import objects
+
+
+class MessageDeleteBulk(BaseDiscordObject):
+    '''Event given when several messages are deleted at once.
+
+    Attributes:
+        ids ([Snowflake]): IDs of the deleted messages.
+        channel_id (Snowflake): ID of the channel the messages were in.
+        guild_id (Snowflake|None): ID of the guild the messages were in.
+        messages ([Message]): The deleted messages that were cached, as they were before the deletion.
+    '''
+
+    ids: 'List[objects.Snowflake]' = None  # type: ignore
+    channel_id: 'objects.Snowflake' = None  # type: ignore
+    guild_id: 'Optional[objects.Snowflake]' = None  # type: ignore
+    messages: 'List[objects.Message]' = None  # type: ignore
+
+    _auto_map = {
+        'ids': [snowflake.Snowflake],
+        'channel_id': snowflake.Snowflake,
+        'guild_id': snowflake.Snowflake,
+    }
@@ -34,5 +34,5 @@ class TypingStart(BaseDiscordObject):
         if 'timestamp' in data:
             self.timestamp = datetime.fromtimestamp(data['timestamp'])
         if 'member' in data:
-            self.member = objects.Member().from_dict(data['member'])
+            self.member = objects.Member.canonical(data['member'], self.guild_id)
         return self
@@ -3,6 +3,7 @@ from datetime import datetime
 
 from ..base_object import BaseDiscordObject
 from .. import snowflake, user as ext_user
+from ...utilities.timestamps import parse_timestamp
 
 
 class VoiceState(BaseDiscordObject):
@@ -22,20 +23,25 @@ class VoiceState(BaseDiscordObject):
     suppress: 'bool' = None  # type: ignore #  boolean whether this user is muted by the current user
     request_to_speak_timestamp: 'Optional[datetime]' = None  # type: ignore #  ?ISO8601 timestamp the time at which the user requested to speak
 
-    @property
-    def _auto_map(self):
-        return {
-            'guild_id': snowflake.Snowflake,
-            'channel_id': snowflake.Snowflake,
-            'user_id': snowflake.Snowflake,
-            'member': ext_user.Member,
-            'session_id': str,
-            'deaf': bool,
-            'mute': bool,
-            'self_deaf': bool,
-            'self_mute': bool,
-            'self_stream': bool,
-            'self_video': bool,
-            'suppress': bool,
-            'request_to_speak_timestamp': datetime.fromtimestamp,
-        }
+    _auto_map = {
+        'guild_id': snowflake.Snowflake,
+        'channel_id': snowflake.Snowflake,
+        'user_id': snowflake.Snowflake,
+        'member': None,  # Parsed in `from_dict()`, it needs the guild to share the member.
+        'session_id': str,
+        'deaf': bool,
+        'mute': bool,
+        'self_deaf': bool,
+        'self_mute': bool,
+        'self_stream': bool,
+        'self_video': bool,
+        'suppress': bool,
+        'request_to_speak_timestamp': parse_timestamp,
+    }
+
+    def from_dict(self, data: dict) -> 'VoiceState':
+        '''Parse a VoiceState from an API compliant dict.'''
+        self._auto_dict(data)
+        if data.get('member') is not None:
+            self.member = ext_user.Member.canonical(data['member'], self.guild_id, self.user_id)
+        return self
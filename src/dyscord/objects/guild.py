@@ -1,7 +1,7 @@
 import enum
-from typing import Optional, List
+from typing import Any, Callable, ClassVar, Dict, List, Optional
 
-from .base_object import BaseDiscordObject
+from .base_object import BaseDiscordObject, FieldChanges
 
 from . import snowflake, channel as ext_channel
 
@@ -120,6 +120,8 @@ class Guild(BaseDiscordObject):
     stage_instances: type = None  # type: ignore # * array of stage instance objects Stage instances in the guild
     stickers: type = None  # type: ignore # array of sticker objects custom guild stickers
 
+    _field_parsers: ClassVar[Dict[str, Callable[['Guild', Any], Any]]]
+
     def __str__(self):
         '''Return string representation.'''
         fields = []
@@ -163,3 +165,59 @@ class Guild(BaseDiscordObject):
                 self.channels.append(new_channel)
 
         return self
+
+    def apply_update(self, data: dict) -> FieldChanges:
+        '''Merge a partial guild payload, such as the one of GUILD_UPDATE, into this guild.
+
+        Besides the fields of `BaseDiscordObject.apply_update()`, `owner` is merged into `am_owner`. When `channels` is present, channels that already exist
+        are updated in place and matched by ID, so references held elsewhere stay valid. `channels` is only reported when channels were added or removed.
+
+        Arguments:
+            data (dict): Partial API compliant dict.
+
+        Returns:
+            Dict[str, Tuple[Any, Any]]: `(old, new)` of every field that changed, keyed by attribute name.
+        '''
+        changes = super().apply_update(data)
+        if 'owner' in data:
+            self._merge_field(changes, 'am_owner', data['owner'])
+        if 'channels' in data:
+            self._merge_channels(changes, data['channels'])
+        return changes
+
+    def _merge_channels(self, changes: FieldChanges, channel_dicts: List[dict]):
+        '''Update existing channels from `channel_dicts` in place, adding new ones and dropping those no longer listed.'''
+        old = self.channels or []
+        existing = {channel.id: channel for channel in old}
+        channels = []
+        for channel_dict in channel_dicts:
+            channel = existing.get(snowflake.Snowflake(channel_dict['id']))
+            if channel is not None and channel.type == channel_dict['type']:
+                channel.from_dict(channel_dict, self)
+            else:
+                channel = ext_channel.ChannelImporter.from_dict(channel_dict, self)
+            channels.append(channel)
+
+        self.channels = channels
+        if len(channels) != len(old) or any(new is not previous for new, previous in zip(channels, old)):
+            changes['channels'] = (old, channels)
+
+
+def _optional_snowflake(guild: Guild, value: Any) -> Optional[snowflake.Snowflake]:
+    return None if value is None else snowflake.Snowflake(value)
+
+
+# Fields merged by `apply_update()`, matching those parsed by `from_dict()`. `owner` and `channels` need the guild and are handled there.
+Guild._field_parsers = {
+    'id': _optional_snowflake,
+    'name': lambda guild, value: value,
+    'icon': lambda guild, value: value,
+    'icon_hash': lambda guild, value: value,
+    'splash': lambda guild, value: value,
+    'discovery_splash': lambda guild, value: value,
+    'afk_channel_id': lambda guild, value: value,
+    'verification_level': lambda guild, value: value,
+    'owner_id': _optional_snowflake,
+    'approximate_member_count': lambda guild, value: value,
+    'approximate_presence_count': lambda guild, value: value,
+}
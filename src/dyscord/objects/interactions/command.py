@@ -4,17 +4,20 @@ import abc
 import builtins
 import copy
 import re
-from typing import Optional, Union, List, Dict
+from typing import TYPE_CHECKING, Optional, Union, List, Dict
 
 from ...client import api
 
 from ..base_object import BaseDiscordObject
 
-from .. import snowflake, guild as ext_guild
+from .. import snowflake
 from ..enumerations import CHANNEL_TYPES
 
 from . import enumerations
 
+if TYPE_CHECKING:
+    from .. import guild as ext_guild
+
 
 class ChoiceAdderBase(abc.ABC):
     '''Allow other objects to start adding components to themselves with a common set of helper functions.
@@ -192,6 +195,8 @@ class Command(BaseDiscordObject):
 
         Note that discord will limit you to 200 of these calls per bot per guild per day.
         '''
+        from .. import guild as ext_guild  # Deferred, guild imports this module through channel and message.
+
         if isinstance(guild, snowflake.Snowflake):
             guild_id = guild
         elif isinstance(guild, ext_guild.Guild):
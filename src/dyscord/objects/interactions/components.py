@@ -2,7 +2,7 @@
 
 import abc
 import uuid
-from typing import Callable, Dict, List, Union, Optional
+from typing import Callable, Dict, List, Union, Optional, Tuple
 
 from . import command, enumerations
 from ..base_object import BaseDiscordObject
@@ -21,10 +21,12 @@ class ComponentAdder(abc.ABC):
     Caution: This is an abstract class, and is not intended for direct instantiation.
     '''
 
+    __slots__: Tuple[str, ...] = ()
+
     def add_components(self) -> 'ActionRow':
         '''Start adding components by starting an ACTION_ROW.'''
         if not hasattr(self, 'components') or self.components is None:
-            self.components: Optional[List['Component']] = list()
+            self.components: Optional[List['Component']] = list()  # type: ignore
         assert type(self.components) is list
         new_action_row = ActionRow()
         self.components.append(new_action_row)
@@ -1,9 +1,9 @@
 from collections import defaultdict
-from typing import Any, Optional, Union, List, Dict
+from typing import Any, Callable, ClassVar, Optional, Union, List, Dict
 
 from ...client import api
 
-from ..base_object import BaseDiscordObject
+from ..base_object import BaseDiscordObject, _lazy_field
 
 from .. import channel
 from .. import snowflake
@@ -28,6 +28,9 @@ class Interaction(BaseDiscordObject):
         token (str): Unique one time use token used in an InteractionResponse.
         version (int): Unique version number generated by discord when the command is registered.
         message (Message|None): For components, the message they were attached to
+
+    Set `Interaction.lazy_parsing = True` to parse `data`, `user`, `member`, `message` and the guild and channel IDs on first access instead of in
+    `from_dict()`.
     '''
 
     INTERACTION_RESPONSE_TYPES = enumerations.INTERACTION_RESPONSE_TYPES
@@ -47,6 +50,12 @@ class Interaction(BaseDiscordObject):
     version: int
     message: Optional['ext_message.Message']
 
+    lazy_parsing: ClassVar[bool] = False
+    _raw: Optional[dict] = None
+    _field_parsers: ClassVar[Dict[str, Callable[['Interaction', Any], Any]]]
+
+    __getattr__ = _lazy_field
+
     def __init__(self):
         '''Simple initialization.'''
         self._response_generated = False
@@ -65,29 +74,24 @@ class Interaction(BaseDiscordObject):
         return self._response_generated is True
 
     def from_dict(self, data: dict) -> 'Interaction':
-        '''Import data from dict and populate object with it.'''
+        '''Import data from dict and populate object with it.
+
+        With `lazy_parsing` set on the class only the fields needed to respond are parsed here. The payload is kept and every other field is parsed the
+        first time it is read.
+        '''
         self.application_id = snowflake.Snowflake(data['application_id'])
         self.id = snowflake.Snowflake(data['id'])
         self.token = str(data['token'])
         self.version = int(data['version'])
         self.type = enumerations.INTERACTION_TYPES(data['type'])
-        if 'channel_id' in data:
-            self.channel_id = snowflake.Snowflake(data['channel_id'])
-        if 'guild_id' in data:
-            self.guild_id = snowflake.Snowflake(data['guild_id'])
-        if 'data' in data:
-            # Provide none if we don't get a guild_id!
-            guild_id = snowflake.Snowflake(data['guild_id']) if 'guild_id' in data else None
-            self.data = InteractionData().from_dict(data['data'], guild_id)
-        if 'channel_id' in data:
-            self.channel_id = snowflake.Snowflake(data['channel_id'])
-        if 'user' in data:
-            self.user = ext_user.User().from_dict(data['user'])
-        if 'member' in data:
-            self.member = ext_user.Member().from_dict(data['member'])
-        if 'message' in data:
-            self.message = ext_message.Message().from_dict(data['message'])
 
+        if self.lazy_parsing:
+            self._raw = data
+            return self
+
+        for key, parse in self._field_parsers.items():
+            if key in data:
+                setattr(self, key, parse(self, data[key]))
         return self
 
     def generate_response(self,
@@ -127,6 +131,22 @@ class Interaction(BaseDiscordObject):
         return new_followup
 
 
+def _parse_interaction_data(interaction: Interaction, value: dict) -> 'InteractionData':
+    # Provide none if we don't get a guild_id!
+    return InteractionData().from_dict(value, getattr(interaction, 'guild_id', None))
+
+
+# Every field parsed from a payload besides those needed to respond, in parsing order. `data` reads `guild_id`, so it follows it.
+Interaction._field_parsers = {
+    'channel_id': lambda interaction, value: snowflake.Snowflake(value),
+    'guild_id': lambda interaction, value: snowflake.Snowflake(value),
+    'data': _parse_interaction_data,
+    'user': lambda interaction, value: ext_user.User.canonical(value),
+    'member': lambda interaction, value: ext_user.Member.canonical(value, getattr(interaction, 'guild_id', None)),
+    'message': lambda interaction, value: ext_message.Message().from_dict(value),
+}
+
+
 class InteractionData(BaseDiscordObject):
     '''Handle data from an Interaction.'''
 
@@ -153,9 +173,9 @@ class InteractionData(BaseDiscordObject):
             for resolution_type in data['resolved']:
                 for entry_id in data['resolved'][resolution_type]:
                     if resolution_type == 'members':
-                        self.resolved[resolution_type][entry_id] = ext_user.Member().from_dict(data['resolved'][resolution_type][entry_id])
+                        self.resolved[resolution_type][entry_id] = ext_user.Member.canonical(data['resolved'][resolution_type][entry_id], guild_id, entry_id)
                     elif resolution_type == 'users':
-                        self.resolved[resolution_type][entry_id] = ext_user.User().from_dict(data['resolved'][resolution_type][entry_id])
+                        self.resolved[resolution_type][entry_id] = ext_user.User.canonical(data['resolved'][resolution_type][entry_id])
                     elif resolution_type == 'messages':
                         self.resolved[resolution_type][entry_id] = ext_message.Message().from_dict(data['resolved'][resolution_type][entry_id])
                     elif resolution_type == 'channels':
@@ -1,9 +1,8 @@
-import asyncio
 import datetime
 import enum
-from typing import Union, Optional, List, Dict
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Union
 
-from .base_object import BaseDiscordObject
+from .base_object import BaseDiscordObject, FieldChanges, _lazy_field
 from . import snowflake, enumerations
 from . import user as ext_user,\
     channel as ext_channel,\
@@ -11,19 +10,22 @@ from . import user as ext_user,\
     guild as ext_guild,\
     role as ext_role
 from ..utilities import log
+from ..utilities.cache import Cache
+from ..utilities.timestamps import parse_timestamp
 from .interactions import components as ext_components
 
 from ..client import api
 
 
-class Message(BaseDiscordObject, ext_components.ComponentAdder, ext_embed.EmbedAdder):
+class Message(BaseDiscordObject, ext_components.ComponentAdder, ext_embed.EmbedAdder, slots=True):
     '''Message containing infomation about it's content, origin, authors, etc.
 
     Attributes:
         id (Snowflake): Unique ID of the message.
         channel_id (Snowflake): Unique ID of the channel the message came from.
         guild_id (Snowflake|None): Unique ID of the channel the message came from. Defaults to None.
-        guild (Guild|None): Actual guild object item is from. This will autopopulate from the API if it is not present.
+        guild (Guild|None): Actual guild object item is from, once loaded with `fetch_guild()`.
+        channel (Channel|None): Actual channel object item is from, once loaded with `fetch_channel()`.
         author (User): The author of the message.
         member (Member): If the message was in a guild, this will be the Member object of the author.
         content (str): The actual content of the message.
@@ -45,6 +47,11 @@ class Message(BaseDiscordObject, ext_components.ComponentAdder, ext_embed.EmbedA
         referenced_message (Message|None): Message object refereed to in message_reference.
         thread (Channel): Thread the message is a part of.
         components ([Component]): List of components in the message if it is an interaction.
+
+    Set `Message.lazy_parsing = True` to parse fields on first access instead of in `from_dict()`. Handlers that read a few fields, such as `content`,
+    `author` and `channel_id`, then skip the cost of the rest, at the price of keeping the payload dict alive with the message.
+
+    To keep a cached message current, merge the payload of MESSAGE_UPDATE into it with `apply_update()`, which reports the fields that changed.
     '''
 
     _log = log.Log()
@@ -82,6 +89,16 @@ class Message(BaseDiscordObject, ext_components.ComponentAdder, ext_embed.EmbedA
     components: List['ext_components.Component'] = None  # type: ignore
     # sticker_items: List[Sticker] = []  # type: ignore
 
+    _channel: 'Optional[ext_channel.Channel]' = None
+    _guild: 'Optional[ext_guild.Guild]' = None
+    _raw: Optional[dict] = None
+
+    lazy_parsing: ClassVar[bool] = False
+    _field_parsers: ClassVar[Dict[str, Callable[['Message', Any], Any]]]
+    _timestamp_fields: ClassVar[dict] = {'timestamp': parse_timestamp, 'edited_timestamp': parse_timestamp}
+
+    __getattr__ = _lazy_field
+
     def __init__(self,
                  content: str = None
                  ):
@@ -90,96 +107,94 @@ class Message(BaseDiscordObject, ext_components.ComponentAdder, ext_embed.EmbedA
             self.content = content
 
     @property
-    def channel(self):
-        '''Attempt to grab channel from the API.'''
-        if self.channel_id is None:
-            return None
-        loop = asyncio.get_event_loop()
-        channel_dict = loop.run_until_complete(api.API.get_channel(self.channel_id))
-        channel = ext_channel.ChannelImporter().from_dict(channel_dict)
-        self._log.info('Got channel from the API.')
-        return channel
+    def channel(self) -> 'Optional[ext_channel.Channel]':
+        '''Channel the message came from, when it is cached or was already loaded, otherwise `None`.
+
+        Await `fetch_channel()` to load it from the API when it is missing.
+        '''
+        if self._channel is None and self.channel_id is not None:
+            return Cache().get_channel(self.channel_id)
+        return self._channel
 
     @property
-    def guild(self):
-        '''Attempt to grab guild from the API.'''
+    def guild(self) -> 'Optional[ext_guild.Guild]':
+        '''Guild the message came from, when it is cached or was already loaded, otherwise `None`.
+
+        Await `fetch_guild()` to load it from the API when it is missing.
+        '''
+        if self._guild is None and self.guild_id is not None:
+            return Cache().get_guild(self.guild_id)
+        return self._guild
+
+    async def fetch_channel(self) -> 'Optional[ext_channel.Channel]':
+        '''Grab the channel from the cache, or from the API without blocking the event loop.
+
+        The result is kept on the message, so `channel` may be used afterwards.
+        '''
+        if self.channel_id is None:
+            return None
+        if self._channel is None:
+            self._channel = Cache().get_channel(self.channel_id)
+        if self._channel is None:
+            Cache().record_refetch('channels')
+            channel_dict = await api.API.get_channel(self.channel_id)
+            self._channel = ext_channel.ChannelImporter().from_dict(channel_dict)
+            self._log.info('Got channel from the API.')
+        return self._channel
+
+    async def fetch_guild(self) -> 'Optional[ext_guild.Guild]':
+        '''Grab the guild from the cache, or from the API without blocking the event loop.
+
+        The result is kept on the message, so `guild` may be used afterwards.
+        '''
         if self.guild_id is None:
             return None
-        loop = asyncio.get_event_loop()
-        guild_dict = loop.run_until_complete(api.API.get_guild(self.guild_id))
-        guild = ext_guild.Guild().from_dict(guild_dict)
-        self._log.info('Got guild from the API.')
-        return guild
-
-    def from_dict(self, data: dict) -> 'Message':  # noqa: C901
-        '''Parse a Message from an API compliant dict.'''
+        if self._guild is None:
+            self._guild = Cache().get_guild(self.guild_id)
+        if self._guild is None:
+            Cache().record_refetch('guilds')
+            guild_dict = await api.API.get_guild(self.guild_id)
+            self._guild = ext_guild.Guild().from_dict(guild_dict)
+            self._log.info('Got guild from the API.')
+        return self._guild
+
+    def from_dict(self, data: dict) -> 'Message':
+        '''Parse a Message from an API compliant dict.
+
+        With `lazy_parsing` set on the class only the mandatory fields are parsed here. The payload is kept and every other field is parsed the first time it
+        is read.
+        '''
         # Mandatory Fields
         self.id = snowflake.Snowflake(data['id'])
-
-        if 'attachments' in data:
-            self.attachments = list()
-            for attachment in data['attachments']:
-                self.attachments.append(attachment)
-        if 'author' in data:
-            self.author = ext_user.User().from_dict(data['author'])  # TODO: Update after we can parse in users.
         self.channel_id = snowflake.Snowflake(data['channel_id'])
-        if 'components' in data:
-            self.components = list()
-            for component in data['components']:
-                self.components.append(component)
-        if 'content' in data:
-            self.content = data['content']
-        if 'edited_timestamp' in data and data['edited_timestamp'] is not None:
-            self.edited_timestamp = datetime.datetime.fromisoformat(data['edited_timestamp'])
-        if 'embeds' in data:
-            self.embeds = list()
-            for embed in data['embeds']:
-                self.embeds.append(embed)
-        if 'flags' in data:
-            self.flags = data['flags']
-        if 'mention_everyone' in data:
-            self.mention_everyone = data['mention_everyone']
-        if 'menion_roles' in data:
-            self.mention_roles = list()
-            for role in data['mention_roles']:
-                # TODO: Roles are just ID's here, we need to parse them into actual role objects.
-                # self.mention_roles.append(ext_role.Role().from_dict(role))
-                pass
-        if 'mentions' in data:
-            self.mentions = list()
-            for user_dict in data['mentions']:
-                self.mentions.append(ext_user.User().from_dict(user_dict))
-        if 'pinned' in data:
-            self.pinned = data['pinned']
-        if 'timestamp' in data:
-            self.timestamp = datetime.datetime.fromisoformat(data['timestamp'])
-        if 'tts' in data:
-            self.tts = data['tts']
-        if 'type' in data:
-            self.type = enumerations.MESSAGE_TYPE(data['type'])
-
-        # Optional fields
-        if 'guild_id' in data:
-            self.guild_id = snowflake.Snowflake(data['guild_id'])
-        if 'member' in data:
-            self.member = ext_user.Member().from_dict(data['member'])  # TODO: Update after we can parse in users.
-            if self.author is not None:
-                self.member.update_from_user(self.author)
-        if 'nonce' in data:
-            self.nonce = data['nonce']
-        if 'webhook_id' in data:
-            self.webhook_id = snowflake.Snowflake(data['webhook_id'])
-        if 'message_reference' in data:
-            self.message_reference = MessageReference().from_dict(data['message_reference'])
-        if 'referenced_message' in data and data['referenced_message'] is not None:
-            self.referenced_message = Message().from_dict(data['referenced_message'])
-        if 'mention_channels' in data:
-            self.mention_channels = list()
-            for user_dict in data['mention_channels']:
-                self.mention_channels.append(ext_channel.ChannelImporter().from_dict(user_dict))
 
+        if self.lazy_parsing:
+            self._raw = data
+            return self
+
+        for key, parse in self._field_parsers.items():
+            if key in data:
+                setattr(self, key, parse(self, data[key]))
         return self
 
+    def apply_update(self, data: dict) -> FieldChanges:
+        '''Merge a partial message payload, such as the one of MESSAGE_UPDATE, into this message.
+
+        Besides the fields of `BaseDiscordObject.apply_update()`, the update is merged into the payload kept by lazy parsing or by the `Tiered` cache
+        policy, so a message rebuilt from that payload includes it.
+
+        Arguments:
+            data (dict): Partial API compliant dict.
+
+        Returns:
+            Dict[str, Tuple[Any, Any]]: `(old, new)` of every field that changed, keyed by attribute name.
+        '''
+        changes = super().apply_update(data)
+        if self._raw is not None:
+            # A new dict, the payload may still be held by whoever parsed the message.
+            self._raw = {**self._raw, **data}
+        return changes
+
     def to_sendable_dict(self) -> dict:
         '''Sending a message only allows a subset of attributes. Ignore anything else about this message when producing that dict.'''
         new_dict: Dict[str, object] = dict()
@@ -366,7 +381,7 @@ class Message(BaseDiscordObject, ext_components.ComponentAdder, ext_embed.EmbedA
             return f'<@&{role_id}>'
 
 
-class MessageReference(BaseDiscordObject):
+class MessageReference(BaseDiscordObject, slots=True):
     '''Slim data holding class.
 
     Attributes:
@@ -396,8 +411,53 @@ class MessageReference(BaseDiscordObject):
         return self
 
 
+def _parse_member(message: Message, value: dict) -> 'ext_user.Member':
+    author = message.author
+    member = ext_user.Member.canonical(value, message.guild_id, author.id if author is not None else None)
+    if author is not None:
+        member.update_from_user(author)
+    return member
+
+
+# Every field parsed from a payload besides `id` and `channel_id`, in parsing order. `member` reads `author`, so it follows it.
+# TODO: `mention_roles` are just ID's, we need to parse them into actual role objects.
+Message._field_parsers = {
+    'attachments': lambda message, value: list(value),
+    'author': lambda message, value: ext_user.User.canonical(value),
+    'components': lambda message, value: list(value),
+    'content': lambda message, value: value,
+    'edited_timestamp': lambda message, value: value if value is None or message.lazy_timestamps else parse_timestamp(value),
+    'embeds': lambda message, value: list(value),
+    'flags': lambda message, value: value,
+    'mention_everyone': lambda message, value: value,
+    'mentions': lambda message, value: [ext_user.User.canonical(user_dict) for user_dict in value],
+    'pinned': lambda message, value: value,
+    'timestamp': lambda message, value: value if message.lazy_timestamps else parse_timestamp(value),
+    'tts': lambda message, value: value,
+    'type': lambda message, value: enumerations.MESSAGE_TYPE(value),
+    'guild_id': lambda message, value: snowflake.Snowflake(value),
+    'member': _parse_member,
+    'nonce': lambda message, value: value,
+    'webhook_id': lambda message, value: snowflake.Snowflake(value),
+    'message_reference': lambda message, value: MessageReference().from_dict(value),
+    'referenced_message': lambda message, value: None if value is None else Message().from_dict(value),
+    'mention_channels': lambda message, value: [ext_channel.ChannelImporter().from_dict(channel_dict) for channel_dict in value],
+}
+
+
 class MessageUpdate(Message):
-    '''Duplicate of the Message class, but most fields are now annotated as optional.'''
+    '''Duplicate of the Message class, but most fields are now annotated as optional.
+
+    Parsing an update gives a new object holding only the fields sent. Use `Message.apply_update()` to merge an update into a message already held instead.
+
+    Attributes:
+        cached (Message|None): The cached message this update was merged into, set by the client when the message is cached.
+        changes (Dict[str, Tuple[Any, Any]]|None): `(old, new)` of every field the update changed on the cached message, so `changes['content'][0]` is the
+            content before the edit.
+    '''
+    cached: 'Optional[Message]' = None  # type: ignore
+    changes: 'Optional[FieldChanges]' = None  # type: ignore
+
     guild_id: 'Optional[snowflake.Snowflake]'  # type: ignore
     author: 'Optional[ext_user.User]'  # type: ignore
     member: 'Optional[ext_user.Member]'  # type: ignore
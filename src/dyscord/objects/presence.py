@@ -3,6 +3,20 @@ from .base_object import BaseDiscordObject
 from . import user as ext_user, snowflake, activity as ext_activity
 
 
+class ClientStatus(BaseDiscordObject):
+    '''ClientStatus.'''
+
+    desktop: 'Optional[str]' = None  # tpye: ignore # string the user's status set for an active desktop (Windows, Linux, Mac) application session
+    mobile: 'Optional[str]' = None  # tpye: ignore # string the user's status set for an active mobile (iOS, Android) application session
+    web: 'Optional[str]' = None  # tpye: ignore # string the user's status set for an active web (browser, bot account) application session
+
+    _auto_map = {
+        'desktop': str,
+        'mobile': str,
+        'web': str,
+    }
+
+
 class Presence(BaseDiscordObject):
     '''Presence.'''
 
@@ -12,28 +26,10 @@ class Presence(BaseDiscordObject):
     activities: 'List[ext_activity.Activity]' = None  # type: ignore # array of activity objects user's current activities
     client_status: 'ClientStatus' = None  # type: ignore # client_status object user's platform-dependent status
 
-    @property
-    def _auto_map(self):
-        return {
-            'user': ext_user.User,
-            'guild_id': snowflake.Snowflake,
-            'status': str,
-            'activities': [ext_activity.Activity],
-            'client_status': ClientStatus,
-        }
-
-
-class ClientStatus(BaseDiscordObject):
-    '''ClientStatus.'''
-
-    desktop: 'Optional[str]' = None  # tpye: ignore # string the user's status set for an active desktop (Windows, Linux, Mac) application session
-    mobile: 'Optional[str]' = None  # tpye: ignore # string the user's status set for an active mobile (iOS, Android) application session
-    web: 'Optional[str]' = None  # tpye: ignore # string the user's status set for an active web (browser, bot account) application session
-
-    @property
-    def _auto_map(self):
-        return {
-            'desktop': str,
-            'mobile': str,
-            'web': str,
-        }
+    _auto_map = {
+        'user': ext_user.User.canonical,
+        'guild_id': snowflake.Snowflake,
+        'status': str,
+        'activities': [ext_activity.Activity],
+        'client_status': ClientStatus,
+    }
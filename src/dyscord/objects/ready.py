@@ -43,7 +43,7 @@ class Ready(BaseDiscordObject):
             new_guild.id = snowflake.Snowflake(partial_guild_dict['id'])
             self.guilds.append(new_guild)
         self.session_id = data['session_id']
-        self.user = ext_user.User().from_dict(data['user'])
+        self.user = ext_user.User.canonical(data['user'])
         self.version = data['v']
 
         return self
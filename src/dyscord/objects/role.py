@@ -5,7 +5,7 @@ from .base_object import BaseDiscordObject
 from . import snowflake
 
 
-class Role(BaseDiscordObject):
+class Role(BaseDiscordObject, slots=True):
     '''Roles represent a set of permissions attached to a group of users.'''
 
     id: snowflake.Snowflake = None  # type: ignore
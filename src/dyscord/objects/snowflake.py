@@ -1,82 +1,137 @@
 import datetime
-from typing import Union
+from typing import Dict, Optional, Union
 
+_int_new = int.__new__
+_int_eq = int.__eq__
 
-class Snowflake:
-    '''Discord specific UUID like object. Generally interchangable with a string contained the same sequence of characters.'''
 
-    DISCORD_EPOCH = 1420070400000
+class Snowflake(int):
+    '''Discord specific UUID like object. Generally interchangable with a string contained the same sequence of characters.
 
-    def __init__(self, identifier: Union[int, str, 'Snowflake'] = None):
-        '''Initialize the Snowflake.
+    A Snowflake is an `int`, so it hashes, sorts and compares like one and may be used wherever an `int` key is expected. It also compares equal to the
+    string of its digits, the form Discord sends.
 
-        Arguments:
-            identifier (int, str, Snowflake): Identifier to base off of.
-        '''
-        self.identifier: int
+    Guild, channel and role IDs repeat in nearly every event. With `enable_interning()` repeated identifiers resolve to one shared instance, so cached
+    objects holding the same ID share it instead of each keeping a copy.
+    '''
 
-        if type(identifier) is int:
-            self.identifier = identifier
-        elif type(identifier) is str:
-            self.identifier = int(identifier)
-        elif type(identifier) is Snowflake:
-            self.identifier = identifier.identifier
-        else:
-            self.generate()
+    __slots__ = ()
 
-        assert type(self.identifier) is int
+    DISCORD_EPOCH = 1420070400000
 
-    def __str__(self):
-        '''Return string representation.'''
-        return str(self.identifier)
+    _interned: Optional[Dict['Snowflake', 'Snowflake']] = None
+    _intern_maxsize: int = 0
+    _intern_hits: int = 0
+    _intern_misses: int = 0
+    _intern_evictions: int = 0
 
-    def __repr__(self):
-        '''Return string representation.'''
-        return self.__str__()
+    def __new__(cls, identifier: Union[int, str, 'Snowflake'] = None):
+        '''Create the Snowflake.
+
+        Arguments:
+            identifier (int, str, Snowflake): Identifier to base off of. A new one is generated from the current time when omitted.
+        '''
+        if identifier is None:
+            identifier = (int(datetime.datetime.now().timestamp() * 1000) - cls.DISCORD_EPOCH) << 22
+        elif Snowflake._interned is not None and cls is Snowflake:
+            return Snowflake._intern(identifier)
+        return _int_new(cls, identifier)
+
+    @staticmethod
+    def _intern(identifier: Union[int, str, 'Snowflake']) -> 'Snowflake':
+        '''Look `identifier` up in the interning table, adding it when missing.'''
+        table = Snowflake._interned
+        assert table is not None
+        value = identifier if type(identifier) is Snowflake else _int_new(Snowflake, identifier)
+        shared = table.get(value)
+        if shared is not None:
+            Snowflake._intern_hits += 1
+            return shared
+
+        Snowflake._intern_misses += 1
+        if len(table) >= Snowflake._intern_maxsize:
+            # Evict the oldest entry. Hot identifiers are simply added again on their next use.
+            del table[next(iter(table))]
+            Snowflake._intern_evictions += 1
+        table[value] = value
+        return value
+
+    @classmethod
+    def enable_interning(cls, maxsize: int = 65_536):
+        '''Share one instance per identifier from now on, remembering at most `maxsize` identifiers.
+
+        Each entry costs a little memory, so interning pays off for IDs that repeat, such as guilds, channels and roles, and not for one off message IDs.
+
+        Arguments:
+            maxsize (int): Entries kept before the oldest is evicted.
+        '''
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be at least 1, got [{maxsize}].')
+        Snowflake._interned = dict()
+        Snowflake._intern_maxsize = maxsize
+        Snowflake._intern_hits = Snowflake._intern_misses = Snowflake._intern_evictions = 0
+
+    @classmethod
+    def disable_interning(cls):
+        '''Stop interning and drop the table. Existing shared instances are unaffected.'''
+        Snowflake._interned = None
+        Snowflake._intern_maxsize = 0
+
+    @classmethod
+    def interning_stats(cls) -> dict:
+        '''Size and hit counts of the interning table.
+
+        Returns:
+            dict: `enabled`, `size`, `maxsize`, `hits`, `misses` and `evictions`.
+        '''
+        return {
+            'enabled': Snowflake._interned is not None,
+            'size': len(Snowflake._interned) if Snowflake._interned is not None else 0,
+            'maxsize': Snowflake._intern_maxsize,
+            'hits': Snowflake._intern_hits,
+            'misses': Snowflake._intern_misses,
+            'evictions': Snowflake._intern_evictions,
+        }
 
     def __eq__(self, other):
-        '''Determine if other is equivalent to this Snowflake..'''
-        if type(other) in [str, int]:
-            other = Snowflake(other)
-        elif type(other) is Snowflake:
-            pass
-        else:
-            return NotImplemented
+        '''Determine if other is equivalent to this Snowflake.'''
+        if other.__class__ is str:
+            return other.isdigit() and _int_eq(self, int(other))
+        return _int_eq(self, other)
 
-        return self.identifier == other.identifier
+    def __ne__(self, other):
+        '''Determine if other is not equivalent to this Snowflake.'''
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
 
-    def __hash__(self):
-        '''Hash.'''
-        return hash(self.identifier)
+    __hash__ = int.__hash__
 
     @property
-    def timestamp(self):
-        '''The timestamp of the Snowflake.'''
-        assert type(self.identifier) is int
+    def identifier(self) -> int:
+        '''The Snowflake as a plain `int`.'''
+        return int(self)
 
-        return ((self.identifier >> 22) + 1420070400000) / 1000
+    @property
+    def timestamp(self) -> float:
+        '''The timestamp of the Snowflake.'''
+        return ((self >> 22) + 1420070400000) / 1000
 
     @property
-    def worker_id(self):
+    def worker_id(self) -> int:
         '''The worker ID that generated the Snowflake.'''
-        assert type(self.identifier) is int
-
-        return (self.identifier & 0x3E0000) >> 17
+        return (self & 0x3E0000) >> 17
 
     @property
-    def process_id(self):
+    def process_id(self) -> int:
         '''The process ID of the Snowflake.'''
-        assert type(self.identifier) is int
-
-        return (self.identifier & 0x1F000) >> 12
+        return (self & 0x1F000) >> 12
 
     @property
-    def increment(self):
+    def increment(self) -> int:
         '''The increment sequence count of the Snowflake.'''
-        assert type(self.identifier) is int
-
-        return self.identifier & 0xFFF
+        return self & 0xFFF
 
-    def generate(self):
+    @classmethod
+    def generate(cls) -> 'Snowflake':
         '''Generate a fake Snowflake locally.'''
-        self.identifier = (int(datetime.datetime.now().timestamp() * 1000) - 1420070400000) << 22
+        return cls()
@@ -1,12 +1,14 @@
 import enum
 import datetime
-from typing import List
+import weakref
+from typing import Any, ClassVar, List, Optional, Tuple
 
 from . import snowflake, role
 from .base_object import BaseDiscordObject
+from ..utilities.timestamps import parse_timestamp_cached
 
 
-class User(BaseDiscordObject):
+class User(BaseDiscordObject, slots=True, weakref=True):
     '''Discord User.
 
     Attributes:
@@ -15,6 +17,9 @@ class User(BaseDiscordObject):
         discriminator (int): Random set of 4 numbers to discriminate user from others.
         avatar (str): TODO: Look this up.
         bot (bool): User is a bot or not.
+
+    Parsers create users through `User.canonical()`. After `User.enable_identity_map()` every payload for the same user, and every member payload for the
+    same user in the same guild, updates and returns one shared instance, so a user seen in many messages is held once and updates show everywhere.
     '''
 
     @enum.unique
@@ -58,6 +63,53 @@ class User(BaseDiscordObject):
     premium_type: int = None  # type: ignore
     public_flags: int = None  # type: ignore
 
+    _identity: ClassVar[Optional['weakref.WeakValueDictionary']] = None
+    _identity_hits: ClassVar[int] = 0
+    _identity_misses: ClassVar[int] = 0
+
+    @classmethod
+    def canonical(cls, data: dict) -> 'User':
+        '''Parse a User, updating and returning the shared instance for its ID when the identity map is enabled.
+
+        Arguments:
+            data (dict): Discord compliant dict for a user.
+        '''
+        identity = User._identity
+        if identity is None:
+            return cls().from_dict(data)
+        return _shared(cls, identity, snowflake.Snowflake(data['id']), data)
+
+    @classmethod
+    def enable_identity_map(cls):
+        '''Share one `User` per user ID, and one `Member` per guild and user ID, between all parsed payloads from now on.
+
+        Instances are held weakly, so a user is forgotten once nothing else, such as a cached message, refers to it.
+        '''
+        User._identity = weakref.WeakValueDictionary()
+        Member._identity = weakref.WeakValueDictionary()
+        User._identity_hits = User._identity_misses = 0
+
+    @classmethod
+    def disable_identity_map(cls):
+        '''Stop sharing instances. Existing shared instances are unaffected.'''
+        User._identity = None
+        Member._identity = None
+
+    @classmethod
+    def identity_map_stats(cls) -> dict:
+        '''Size and hit counts of the identity map.
+
+        Returns:
+            dict: `enabled`, `users`, `members`, `hits` and `misses`.
+        '''
+        return {
+            'enabled': User._identity is not None,
+            'users': len(User._identity) if User._identity is not None else 0,
+            'members': len(Member._identity) if Member._identity is not None else 0,
+            'hits': User._identity_hits,
+            'misses': User._identity_misses,
+        }
+
     def __str__(self):
         '''Return a discord compatible mention string.'''
         return self.mention_nickname
@@ -131,16 +183,38 @@ class Member(User):
     pending: bool = None  # type: ignore
     permissions: str = None  # type: ignore
 
-    def from_dict(self, data: dict) -> 'Member':
+    _timestamp_fields: ClassVar[dict] = {'joined_at': parse_timestamp_cached, 'premium_since': parse_timestamp_cached}
+
+    _identity: ClassVar[Optional['weakref.WeakValueDictionary']] = None
+
+    @classmethod
+    def canonical(cls, data: dict, guild_id: 'Optional[snowflake.Snowflake]' = None, user_id: 'Optional[snowflake.Snowflake]' = None) -> 'Member':  # type: ignore
+        '''Parse a Member, updating and returning the shared instance for its guild and user when the identity map is enabled.
+
+        Arguments:
+            data (dict): Discord compliant dict for a member.
+            guild_id (Snowflake): Guild the member belongs to. Members are only shared when it is known.
+            user_id (Snowflake): ID of the user, for payloads without a `user` object such as the `member` of a message.
+        '''
+        identity = Member._identity
+        if 'user' in data:
+            user_id = data['user']['id']
+        if identity is None or guild_id is None or user_id is None:
+            return cls().from_dict(data)
+        key: Tuple[int, int] = (int(guild_id), int(user_id))
+        return _shared(cls, identity, key, data)
+
+    def from_dict(self, data: dict) -> 'Member':  # noqa: C901
         '''Parse a Member from an API compliant dict.'''
         if 'nick' in data:
             self.nick = data['nick']
         if 'avatar' in data:
             self.avatar = data['avatar']
         if 'joined_at' in data:
-            self.joined_at = datetime.datetime.fromisoformat(data['joined_at'])
-        if 'premium_since' in data and data['premium_since'] is not None:
-            self.premium_since = datetime.datetime.fromisoformat(data['premium_since'])
+            self.joined_at = data['joined_at'] if self.lazy_timestamps else parse_timestamp_cached(data['joined_at'])
+        if 'premium_since' in data:
+            premium_since = data['premium_since']
+            self.premium_since = premium_since if self.lazy_timestamps or premium_since is None else parse_timestamp_cached(premium_since)
         if 'deaf' in data:
             self.deaf = data['deaf']
         if 'mute' in data:
@@ -150,8 +224,12 @@ class Member(User):
         if 'permissions' in data:
             self.permissions = data['permissions']
         if 'user' in data:
-            tmp_user = User().from_dict(data['user'])
+            tmp_user = User.canonical(data['user'])
             self.update_from_user(tmp_user)
+            # `update_from_user` skips unset fields, a null in the payload still clears them on a shared member.
+            for field in _CLEARABLE_USER_FIELDS:
+                if field in data['user'] and data['user'][field] is None:
+                    setattr(self, field, None)
         return self
 
     def update_from_user(self, user: User) -> 'Member':  # noqa: C901
@@ -187,3 +265,19 @@ class Member(User):
         if user.public_flags is not None:
             self.public_flags = user.public_flags
         return self
+
+
+# The member's own `avatar` wins over the user's, so it is left to `from_dict`.
+_CLEARABLE_USER_FIELDS = tuple(name for name in User.__annotations__ if name not in ('id', 'avatar') and not name.startswith('_'))
+
+
+def _shared(cls: Any, identity: 'weakref.WeakValueDictionary', key, data: dict):
+    '''Update and return the instance stored under `key`, or parse and store a new one.'''
+    shared = identity.get(key)
+    if shared is not None and type(shared) is cls:
+        User._identity_hits += 1
+        return shared.from_dict(data)
+    User._identity_misses += 1
+    shared = cls().from_dict(data)
+    identity[key] = shared
+    return shared
@@ -0,0 +1,8 @@
+'''Offline stand-ins for Discord, for tests, soak runs and benchmarks.'''
+from .fake_gateway import FakeGateway
+from .fake_rest import FakeRestServer
+
+__all__ = [
+    'FakeGateway',
+    'FakeRestServer',
+]
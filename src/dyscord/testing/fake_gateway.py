@@ -0,0 +1,297 @@
+'''Local stand-in for the Discord gateway.
+
+Speaks just enough of the gateway protocol for `DiscordClient` to connect, identify, heartbeat, resume and receive dispatches, with no network access. Events are pushed
+by the test or benchmark, either one at a time or at a fixed rate, and disconnects can be injected at any point.
+'''
+import asyncio
+import collections
+import itertools
+import time
+import uuid
+
+from typing import Callable, Deque, Dict, Iterable, Optional, Set, Tuple
+
+import orjson as json
+from websockets.exceptions import ConnectionClosed
+from websockets.server import WebSocketServer, serve
+
+from ..utilities import Log
+
+
+EventFactory = Callable[[int], Tuple[str, dict]]
+
+
+class _Session:
+    '''Gateway session, which can outlive the websocket it was created on.'''
+
+    def __init__(self, session_id: str, backlog: int):
+        self.session_id = session_id
+        self.sequence = 0
+        self.sent: Deque[dict] = collections.deque(maxlen=backlog)
+        self.websocket = None
+
+    def next_frame(self, event_type: str, data: dict) -> dict:
+        self.sequence += 1
+        frame = {'op': 0, 's': self.sequence, 't': event_type, 'd': data}
+        self.sent.append(frame)
+        return frame
+
+
+class FakeGateway:
+    '''Websocket server speaking the gateway opcodes used by `DiscordClient`.
+
+    Handled opcodes are HELLO (10), HEARTBEAT (1) and its ACK (11), IDENTIFY (2), RESUME (6), dispatch (0), RECONNECT (7) and INVALID_SESSION (9).
+
+    Examples:
+        ```python
+        async with FakeGateway() as gateway:
+            client.api.get_gateway_bot = AsyncMock(return_value={'url': gateway.url})
+            asyncio.create_task(client.start())
+            await gateway.wait_for_ready()
+            await gateway.emit(message_factory, rate=20_000, count=100_000)
+        ```
+
+    Attributes:
+        url (str): Address to connect to, available once started.
+        stats (Dict[str, int]): Counters of connections, identifies, resumes, heartbeats, events sent and injected disconnects.
+    '''
+
+    _log = Log()
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 heartbeat_interval: int = 41250,
+                 ack_heartbeats: bool = True,
+                 user: Optional[dict] = None,
+                 guilds: Iterable[dict] = (),
+                 backlog: int = 10_000,
+                 ):
+        '''Configure the gateway. Nothing listens until `start()`.
+
+        Arguments:
+            host (str): Interface to bind.
+            port (int): Port to bind, `0` picks a free one.
+            heartbeat_interval (int): Interval in milliseconds sent with HELLO.
+            ack_heartbeats (bool): Set False to simulate a zombie connection.
+            user (dict): User object sent in READY. A bot user is made up if not given.
+            guilds (Iterable[dict]): Guild objects, listed as unavailable in READY and then sent as a GUILD_CREATE storm.
+            backlog (int): Dispatches kept per session so RESUME can replay what the client missed.
+        '''
+        self.host = host
+        self.port = port
+        self.heartbeat_interval = heartbeat_interval
+        self.ack_heartbeats = ack_heartbeats
+        self.user = user if user is not None else {
+            'id': '889065662641737791',
+            'username': 'fake-bot',
+            'discriminator': '0000',
+            'avatar': None,
+            'bot': True,
+        }
+        self.guilds = list(guilds)
+        self.backlog = backlog
+        self.url: Optional[str] = None
+        self.stats: Dict[str, int] = collections.Counter()
+
+        self._server: Optional[WebSocketServer] = None
+        self._sessions: Dict[str, _Session] = dict()
+        self._live: Set[_Session] = set()
+        # Created in `start()`, so it belongs to the running loop on Pythons before 3.10.
+        self._ready: Optional[asyncio.Event] = None
+
+    async def __aenter__(self) -> 'FakeGateway':
+        '''Start the server.'''
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        '''Stop the server.'''
+        await self.stop()
+
+    async def start(self) -> 'FakeGateway':
+        '''Start listening.'''
+        self._ready = asyncio.Event()
+        self._server = await serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # type: ignore
+        self.url = f'ws://{self.host}:{self.port}'
+        self._log.info(f'Fake gateway listening on [{self.url}].')
+        return self
+
+    async def stop(self):
+        '''Close every connection and stop listening.'''
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def wait_for_ready(self, timeout: Optional[float] = 30):
+        '''Wait until at least one client has identified or resumed and has been sent READY or RESUMED.'''
+        if self._ready is None:
+            raise RuntimeError('The fake gateway has not been started.')
+        await asyncio.wait_for(self._ready.wait(), timeout)
+
+    async def dispatch(self, event_type: str, data: dict) -> int:
+        '''Send a single dispatch to every live session.
+
+        Returns:
+            int: Number of sessions the event was sent to.
+        '''
+        sent = 0
+        for session in list(self._live):
+            if await self._send(session, session.next_frame(event_type, data)):
+                sent += 1
+        self.stats['events_sent'] += sent
+        return sent
+
+    async def emit(self, factory: EventFactory, rate: Optional[float] = None, count: Optional[int] = None, duration: Optional[float] = None) -> int:
+        '''Dispatch events produced by `factory` at a steady rate.
+
+        Arguments:
+            factory (Callable[[int], Tuple[str, dict]]): Called with a running index, returns the event name and payload.
+            rate (float|None): Events per second. `None` sends as fast as the sockets accept them.
+            count (int|None): Stop after this many events.
+            duration (float|None): Stop after this many seconds.
+
+        Returns:
+            int: Number of events emitted.
+        '''
+        if count is None and duration is None:
+            raise ValueError('emit needs a count, a duration, or both.')
+
+        start = time.perf_counter()
+        emitted = 0
+        for index in itertools.count():
+            if count is not None and emitted >= count:
+                break
+            elapsed = time.perf_counter() - start
+            if duration is not None and elapsed >= duration:
+                break
+            if rate is not None:
+                ahead = emitted / rate - elapsed
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+            event_type, data = factory(index)
+            await self.dispatch(event_type, data)
+            emitted += 1
+        return emitted
+
+    async def guild_create_storm(self, guilds: Optional[Iterable[dict]] = None) -> int:
+        '''Send GUILD_CREATE for each guild to every live session.
+
+        Clients that identify are sent their own storm after READY, this is for replaying one on demand.
+        '''
+        emitted = 0
+        for guild in (guilds if guilds is not None else self.guilds):
+            await self.dispatch('GUILD_CREATE', guild)
+            emitted += 1
+        return emitted
+
+    async def send_reconnect(self):
+        '''Ask every client to reconnect and resume, opcode 7.'''
+        await self._broadcast({'op': 7, 'd': None})
+
+    async def invalidate_session(self, resumable: bool = False):
+        '''Invalidate every live session, opcode 9.'''
+        if not resumable:
+            for session in self._live:
+                self._sessions.pop(session.session_id, None)
+        await self._broadcast({'op': 9, 'd': resumable})
+
+    async def drop_connections(self, code: int = 4000, abort: bool = False):
+        '''Disconnect every client.
+
+        Arguments:
+            code (int): Close code to send. `4000` is resumable.
+            abort (bool): Tear the TCP connection down without a close frame, like a network failure.
+        '''
+        for session in list(self._live):
+            websocket = session.websocket
+            if websocket is None:
+                continue
+            self.stats['disconnects'] += 1
+            if abort:
+                websocket.transport.abort()
+            else:
+                await websocket.close(code)
+
+    async def _send_guilds(self, session: _Session):
+        for guild in self.guilds:
+            if await self._send(session, session.next_frame('GUILD_CREATE', guild)):
+                self.stats['events_sent'] += 1
+
+    async def _broadcast(self, frame: dict):
+        for session in list(self._live):
+            await self._send(session, frame)
+
+    async def _send(self, session: _Session, frame: dict) -> bool:
+        websocket = session.websocket
+        if websocket is None:
+            return False
+        try:
+            await websocket.send(json.dumps(frame))
+        except ConnectionClosed:
+            return False
+        return True
+
+    async def _handler(self, websocket, path=None):  # noqa: C901
+        self.stats['connections'] += 1
+        session: Optional[_Session] = None
+
+        await websocket.send(json.dumps({'op': 10, 's': None, 't': None, 'd': {'heartbeat_interval': self.heartbeat_interval}}))
+
+        try:
+            async for raw in websocket:
+                data = json.loads(raw)
+                opcode = data.get('op')
+
+                if opcode == 1:
+                    self.stats['heartbeats'] += 1
+                    if self.ack_heartbeats:
+                        await websocket.send(json.dumps({'op': 11, 's': None, 't': None, 'd': None}))
+
+                elif opcode == 2:
+                    self.stats['identifies'] += 1
+                    session = _Session(uuid.uuid4().hex, self.backlog)
+                    session.websocket = websocket
+                    self._sessions[session.session_id] = session
+                    self._live.add(session)
+                    ready = {
+                        'v': 9,
+                        'user': self.user,
+                        'guilds': [{'id': guild['id'], 'unavailable': True} for guild in self.guilds],
+                        'session_id': session.session_id,
+                        'geo_ordered_rtc_regions': [],
+                        'guild_join_requests': [],
+                        'presences': [],
+                        'private_channels': [],
+                        'relationships': [],
+                        'user_settings': {},
+                    }
+                    await self._send(session, session.next_frame('READY', ready))
+                    self._ready.set()
+                    await self._send_guilds(session)
+
+                elif opcode == 6:
+                    self.stats['resumes'] += 1
+                    session = self._sessions.get(data['d']['session_id'])
+                    if session is None:
+                        await websocket.send(json.dumps({'op': 9, 's': None, 't': None, 'd': False}))
+                        continue
+                    session.websocket = websocket
+                    self._live.add(session)
+                    missed = [frame for frame in session.sent if frame['s'] > (data['d']['seq'] or 0)]
+                    for frame in missed:
+                        await self._send(session, frame)
+                    await self._send(session, session.next_frame('RESUMED', {}))
+                    self._ready.set()
+
+                else:
+                    self._log.warning(f'Fake gateway ignoring opcode [{opcode}].')
+
+        except ConnectionClosed:
+            pass
+
+        finally:
+            if session is not None and session.websocket is websocket:
+                session.websocket = None
+                self._live.discard(session)
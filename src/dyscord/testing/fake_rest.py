@@ -0,0 +1,316 @@
+'''Local stand-in for the Discord REST API.
+
+Serves the routes `API_V9` calls over plain HTTP/1.1 on localhost, with Discord style rate limiting: per route buckets keyed on the major parameter, a global per token
+limit, `429` responses with `Retry-After`, and the `x-ratelimit-*` headers. Latency and jitter can be added to model a real network.
+'''
+import asyncio
+import collections
+import hashlib
+import math
+import random
+import re
+import time
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import orjson as json
+
+from ..utilities import Log
+
+
+# Routes used by `API_V9`, in its formatting style.
+ROUTES = (
+    ('GET', '/gateway/bot'),
+    ('GET', '/gateway'),
+    ('GET', '/applications/{application_id}/commands'),
+    ('POST', '/applications/{application_id}/commands'),
+    ('GET', '/applications/{application_id}/commands/{command_id}'),
+    ('PATCH', '/applications/{application_id}/commands/{command_id}'),
+    ('DELETE', '/applications/{application_id}/commands/{command_id}'),
+    ('GET', '/applications/{application_id}/guilds/{guild_id}/commands'),
+    ('POST', '/applications/{application_id}/guilds/{guild_id}/commands'),
+    ('GET', '/applications/{application_id}/guilds/{guild_id}/commands/{command_id}'),
+    ('DELETE', '/applications/{application_id}/guilds/{guild_id}/commands/{command_id}'),
+    ('POST', '/interactions/{interaction_id}/{interaction_token}/callback'),
+    ('GET', '/webhooks/{application_id}/{interaction_token}/messages/{message_id}'),
+    ('PATCH', '/webhooks/{application_id}/{interaction_token}/messages/{message_id}'),
+    ('DELETE', '/webhooks/{application_id}/{interaction_token}/messages/{message_id}'),
+    ('POST', '/webhooks/{application_id}/{interaction_token}'),
+    ('GET', '/channels/{channel_id}'),
+    ('POST', '/channels/{channel_id}/messages'),
+    ('GET', '/guilds/{guild_id}'),
+    ('GET', '/guilds/{guild_id}/roles'),
+    ('GET', '/users/@me'),
+    ('GET', '/users/{user_id}'),
+    ('POST', '/users/@me/channels'),
+)
+
+_MAJOR_PARAMETERS = ('channel_id', 'guild_id', 'interaction_token')
+
+_REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 429: 'Too Many Requests'}
+
+Responder = Callable[[Dict[str, str], Any], Union[Tuple[int, Any], Any]]
+
+
+def _compile(template: str) -> 're.Pattern':
+    pattern = re.escape(template).replace(r'\{', '{').replace(r'\}', '}')
+    return re.compile('^' + re.sub(r'{(\w+)}', r'(?P<\1>[^/]+)', pattern) + '$')
+
+
+class _Bucket:
+    '''Fixed window counter, like the ones Discord reports through `x-ratelimit-*`.'''
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def take(self, now: float) -> bool:
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+class FakeRestServer:
+    '''HTTP server answering the `API_V9` routes with realistic rate limits.
+
+    Point a client at it with `API(token, application_id, base_url=server.base_url)`.
+
+    Responses default to small, parseable objects built from the route parameters. Replace any of them with `set_response()`.
+
+    Attributes:
+        base_url (str): Root of the fake API, available once started.
+        stats (Dict[str, int]): Counters of `requests`, `rate_limited`, `global_rate_limited` and `not_found`.
+        log (List[Tuple[float, str, str, int]]): `(time, method, path, status)` for every request served.
+    '''
+
+    _log = Log()
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 bucket_limit: int = 5,
+                 bucket_window: float = 5.0,
+                 route_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+                 global_limit: Optional[int] = 50,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 seed: Optional[int] = None,
+                 gateway_url: str = 'wss://gateway.discord.gg',
+                 ):
+        '''Configure the server. Nothing listens until `start()`.
+
+        Arguments:
+            host (str): Interface to bind.
+            port (int): Port to bind, `0` picks a free one.
+            bucket_limit (int): Requests allowed per route bucket per window.
+            bucket_window (float): Length of a bucket window in seconds.
+            route_limits (Dict[str, Tuple[int, float]]): Per route `(limit, window)` overrides, keyed like `'POST /channels/{channel_id}/messages'`.
+            global_limit (int|None): Authenticated requests allowed per token per second. `None` disables the global limit.
+            latency (float): Seconds added to every response.
+            jitter (float): Up to this many extra seconds, drawn uniformly, added to every response.
+            seed (int|None): Seed for the jitter, for repeatable runs.
+            gateway_url (str): Returned from `GET /gateway/bot`, point it at a `FakeGateway`.
+        '''
+        self.host = host
+        self.port = port
+        self.bucket_limit = bucket_limit
+        self.bucket_window = bucket_window
+        self.route_limits = dict(route_limits) if route_limits is not None else dict()
+        self.global_limit = global_limit
+        self.latency = latency
+        self.jitter = jitter
+        self.gateway_url = gateway_url
+        self.base_url: Optional[str] = None
+        self.stats: Dict[str, int] = collections.Counter()
+        self.log: List[Tuple[float, str, str, int]] = list()
+
+        self._random = random.Random(seed)
+        self._routes = [(method, template, _compile(template)) for method, template in ROUTES]
+        self._responses: Dict[Tuple[str, str], Responder] = dict()
+        self._buckets: Dict[Tuple[str, Tuple[str, ...]], _Bucket] = dict()
+        self._global_buckets: Dict[str, _Bucket] = dict()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def __aenter__(self) -> 'FakeRestServer':
+        '''Start the server.'''
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        '''Stop the server.'''
+        await self.stop()
+
+    async def start(self) -> 'FakeRestServer':
+        '''Start listening.'''
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://{self.host}:{self.port}/api/v9'
+        self._log.info(f'Fake REST API listening on [{self.base_url}].')
+        return self
+
+    async def stop(self):
+        '''Stop listening and drop open connections.'''
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def set_response(self, method: str, route: str, response: Union[Responder, Any]):
+        '''Replace the response for a route.
+
+        Arguments:
+            method (str): HTTP method.
+            route (str): Route template exactly as listed in `ROUTES`.
+            response: Either a JSON-able value, or a callable taking `(route_parameters, request_json)` returning a value or `(status, value)`.
+        '''
+        if (method, route) not in ROUTES:
+            raise ValueError(f'Unknown route [{method} {route}].')
+        self._responses[(method, route)] = response if callable(response) else (lambda parameters, body: response)
+
+    def _match(self, method: str, path: str) -> Tuple[Optional[str], Dict[str, str], bool]:
+        '''Return the template, parameters and whether the path exists under another method.'''
+        path_exists = False
+        for route_method, template, pattern in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return template, match.groupdict(), True
+            path_exists = True
+        return None, dict(), path_exists
+
+    def _default_response(self, method: str, template: str, parameters: Dict[str, str], body: Any) -> Tuple[int, Any]:  # noqa: C901
+        if method == 'DELETE' or template.endswith('/callback'):
+            return 204, None
+        if template == '/gateway/bot':
+            return 200, {'url': self.gateway_url, 'shards': 1,
+                         'session_start_limit': {'total': 1000, 'remaining': 1000, 'reset_after': 0, 'max_concurrency': 1}}
+        if template == '/gateway':
+            return 200, {'url': self.gateway_url}
+        if template == '/channels/{channel_id}':
+            return 200, {'id': parameters['channel_id'], 'type': 0, 'name': 'general', 'position': 0, 'permission_overwrites': [], 'nsfw': False}
+        if template == '/guilds/{guild_id}':
+            return 200, {'id': parameters['guild_id'], 'name': 'Fake Guild', 'icon': None, 'roles': [], 'emojis': [], 'features': []}
+        if template == '/guilds/{guild_id}/roles':
+            return 200, [{'id': parameters['guild_id'], 'name': '@everyone', 'color': 0, 'hoist': False, 'position': 0, 'permissions': '0',
+                          'managed': False, 'mentionable': False}]
+        if template in ('/users/@me', '/users/{user_id}'):
+            return 200, {'id': parameters.get('user_id', '889065662641737791'), 'username': 'fake-user', 'discriminator': '0000', 'avatar': None}
+        if template == '/users/@me/channels':
+            return 200, {'id': str((body or {}).get('recipient_id', '1')), 'type': 1, 'recipients': []}
+        if template.endswith('/commands') and method == 'GET':
+            return 200, []
+        if method in ('POST', 'PATCH'):
+            # Echo the payload back as the created object, like Discord does.
+            data = dict(body or {})
+            data.setdefault('id', str(int(time.time() * 1000 - 1420070400000) << 22))
+            data.update({key: value for key, value in parameters.items() if key in ('channel_id', 'guild_id', 'application_id')})
+            return 200, data
+        return 200, {key: value for key, value in parameters.items()}
+
+    def _rate_limit(self, method: str, template: str, parameters: Dict[str, str], authorization: Optional[str]) -> Tuple[bool, Dict[str, str], Dict[str, Any]]:
+        '''Apply the global then the route limit. Returns (allowed, headers, 429 body).'''
+        now = time.monotonic()
+        route_key = f'{method} {template}'
+
+        if authorization is not None and self.global_limit is not None:
+            global_bucket = self._global_buckets.setdefault(authorization, _Bucket(self.global_limit, 1.0))
+            if not global_bucket.take(now):
+                retry_after = global_bucket.reset_at - now
+                self.stats['global_rate_limited'] += 1
+                headers = {'retry-after': str(math.ceil(retry_after)), 'x-ratelimit-global': 'true', 'x-ratelimit-scope': 'global'}
+                return False, headers, {'message': 'You are being rate limited.', 'retry_after': round(retry_after, 3), 'global': True}
+
+        limit, window = self.route_limits.get(route_key, (self.bucket_limit, self.bucket_window))
+        major = tuple(parameters[key] for key in _MAJOR_PARAMETERS if key in parameters)
+        bucket = self._buckets.setdefault((route_key, major), _Bucket(limit, window))
+        allowed = bucket.take(now)
+        reset_after = max(bucket.reset_at - now, 0.0)
+        headers = {
+            'x-ratelimit-limit': str(bucket.limit),
+            'x-ratelimit-remaining': str(bucket.remaining),
+            'x-ratelimit-reset': f'{time.time() + reset_after:.3f}',
+            'x-ratelimit-reset-after': f'{reset_after:.3f}',
+            'x-ratelimit-bucket': hashlib.md5(route_key.encode()).hexdigest()[:16],
+        }
+        if allowed:
+            return True, headers, dict()
+
+        self.stats['rate_limited'] += 1
+        headers['retry-after'] = str(math.ceil(reset_after))
+        headers['x-ratelimit-scope'] = 'user'
+        return False, headers, {'message': 'You are being rate limited.', 'retry_after': round(reset_after, 3), 'global': False}
+
+    async def _respond(self, method: str, path: str, headers: Dict[str, str], raw_body: bytes) -> Tuple[int, Dict[str, str], Optional[bytes]]:
+        prefix = '/api/v9'
+        route_path = path.split('?', 1)[0]
+        if route_path.startswith(prefix):
+            route_path = route_path[len(prefix):]
+
+        template, parameters, path_exists = self._match(method, route_path)
+        if template is None:
+            self.stats['not_found'] += 1
+            status = 405 if path_exists else 404
+            return status, {'content-type': 'application/json'}, json.dumps({'message': _REASONS[status], 'code': 0})
+
+        allowed, response_headers, limited_body = self._rate_limit(method, template, parameters, headers.get('authorization'))
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        if not allowed:
+            response_headers['content-type'] = 'application/json'
+            return 429, response_headers, json.dumps(limited_body)
+
+        body = json.loads(raw_body) if raw_body else None
+        responder = self._responses.get((method, template))
+        if responder is not None:
+            result = responder(parameters, body)
+            status, data = result if isinstance(result, tuple) else (200, result)
+        else:
+            status, data = self._default_response(method, template, parameters, body)
+
+        if data is None:
+            return status, response_headers, None
+        response_headers['content-type'] = 'application/json'
+        return status, response_headers, json.dumps(data)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers: Dict[str, str] = dict()
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, value = line.decode('latin-1').split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+
+                raw_body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                self.stats['requests'] += 1
+                status, response_headers, body = await self._respond(method, path, headers, raw_body)
+                self.log.append((time.time(), method, path, status))
+
+                response_headers['content-length'] = str(len(body) if body is not None else 0)
+                head = f'HTTP/1.1 {status} {_REASONS.get(status, "Unknown")}\r\n'
+                head += ''.join(f'{name}: {value}\r\n' for name, value in response_headers.items())
+                writer.write(head.encode('latin-1') + b'\r\n' + (body or b''))
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,404 @@
+'''Deterministic generator of API shaped payloads.
+
+Every payload is a plain dict in the shape Discord sends, accepted by the matching `from_dict` parser. The same seed always produces the same data, so benchmarks and
+soak tests are repeatable without any recorded traffic.
+'''
+import datetime
+import itertools
+import random
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..objects.snowflake import Snowflake
+
+
+class DataGenerator:
+    '''Produce users, members, roles, channels, threads, guilds, messages, interactions and presences.
+
+    Snowflakes follow Discord's layout, milliseconds since the Discord epoch shifted left 22 bits, then worker, process and increment, and are minted from a clock that
+    only moves forward. `Snowflake(id).timestamp` therefore always matches the time the generator says the object was created.
+
+    Examples:
+        ```python
+        generator = DataGenerator(seed=1)
+        guild = Guild().from_dict(generator.guild(members=250_000))
+        ```
+    '''
+
+    def __init__(self, seed: int = 0, start: Optional[datetime.datetime] = None):
+        '''Create a generator.
+
+        Arguments:
+            seed (int): Seed for every random choice.
+            start (datetime): Time of the first snowflake. Defaults to 2021-01-01 UTC.
+        '''
+        self.random = random.Random(seed)
+        start = start if start is not None else datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+        self._clock_ms = int(start.timestamp() * 1000)
+        self._increment = 0
+        self._worker_id = self.random.randrange(32)
+        self._process_id = self.random.randrange(32)
+
+    # Primitives
+
+    def advance(self, milliseconds: int):
+        '''Move the generator clock forward.'''
+        self._clock_ms += milliseconds
+
+    def snowflake(self) -> str:
+        '''Mint a new snowflake at the current clock, as the string Discord sends.'''
+        self._increment = (self._increment + 1) & 0xFFF
+        if self._increment == 0:
+            self._clock_ms += 1
+        value = ((self._clock_ms - Snowflake.DISCORD_EPOCH) << 22) | (self._worker_id << 17) | (self._process_id << 12) | self._increment
+        return str(value)
+
+    def timestamp(self) -> str:
+        '''ISO8601 timestamp of the current clock, as Discord formats it.'''
+        moment = datetime.datetime.fromtimestamp(self._clock_ms / 1000, tz=datetime.timezone.utc)
+        return moment.isoformat(timespec='microseconds')
+
+    def _words(self, low: int, high: int) -> str:
+        return ' '.join(self.random.choice(_WORDS) for _ in range(self.random.randint(low, high)))
+
+    def _hash(self) -> str:
+        return '%032x' % self.random.getrandbits(128)
+
+    # Users
+
+    def user(self, bot: bool = False) -> dict:
+        '''Partial user object, as found on messages and members.'''
+        self.advance(self.random.randint(1, 5_000))
+        return {
+            'id': self.snowflake(),
+            'username': f'{self.random.choice(_WORDS)}{self.random.randint(0, 9999)}',
+            'discriminator': f'{self.random.randint(1, 9999):04d}',
+            'avatar': self._hash() if self.random.random() < 0.8 else None,
+            'public_flags': self.random.choice((0, 0, 0, 64, 128, 256)),
+            **({'bot': True} if bot else {}),
+        }
+
+    def member(self, role_ids: Optional[List[str]] = None, user: Optional[dict] = None, include_user: bool = True) -> dict:
+        '''Guild member object.
+
+        Arguments:
+            role_ids ([str]): Roles to pick from, each member gets up to five.
+            user (dict): User to wrap, a new one is generated if not given.
+            include_user (bool): Message payloads omit the nested user.
+        '''
+        roles = self.random.sample(role_ids, min(len(role_ids), self.random.randint(0, 5))) if role_ids else []
+        member: Dict[str, Any] = {
+            'nick': self._words(1, 2) if self.random.random() < 0.2 else None,
+            'avatar': None,
+            'roles': roles,
+            'joined_at': self.timestamp(),
+            'premium_since': self.timestamp() if self.random.random() < 0.02 else None,
+            'deaf': False,
+            'mute': False,
+            'pending': False,
+        }
+        if include_user:
+            member['user'] = user if user is not None else self.user()
+        return member
+
+    # Guilds
+
+    def role(self, position: int, guild_id: Optional[str] = None) -> dict:
+        '''Role object. Position 0 is `@everyone`, which shares the guild's id.'''
+        return {
+            'id': guild_id if position == 0 and guild_id is not None else self.snowflake(),
+            'name': '@everyone' if position == 0 else self._words(1, 3),
+            'color': 0 if position == 0 else self.random.randrange(0xFFFFFF),
+            'hoist': position != 0 and self.random.random() < 0.3,
+            'icon': None,
+            'unicode_emoji': None,
+            'position': position,
+            'permissions': str(self.random.getrandbits(40)),
+            'managed': self.random.random() < 0.05,
+            'mentionable': self.random.random() < 0.5,
+        }
+
+    def channel(self, guild_id: Optional[str] = None, type: int = 0, position: int = 0, parent_id: Optional[str] = None) -> dict:
+        '''Guild channel object, text by default.'''
+        channel = {
+            'id': self.snowflake(),
+            'type': type,
+            'name': '-'.join(self._words(1, 3).split()),
+            'position': position,
+            'permission_overwrites': [],
+            'nsfw': False,
+        }
+        if guild_id is not None:
+            channel['guild_id'] = guild_id
+        if parent_id is not None:
+            channel['parent_id'] = parent_id
+        if type == 0:
+            channel.update({
+                'topic': self._words(3, 12) if self.random.random() < 0.6 else None,
+                'rate_limit_per_user': self.random.choice((0, 0, 0, 5, 30)),
+                'last_message_id': self.snowflake(),
+                'default_auto_archive_duration': 1440,
+            })
+        elif type == 2:
+            channel.update({'bitrate': 64000, 'user_limit': 0, 'rtc_region': None})
+        return channel
+
+    def thread(self, guild_id: str, parent_id: str, owner_id: Optional[str] = None, private: bool = False) -> dict:
+        '''Active thread object, as listed in GUILD_CREATE and sent with THREAD_CREATE.'''
+        thread = self.channel(guild_id, type=12 if private else 11, parent_id=parent_id)
+        thread.update({
+            'owner_id': owner_id if owner_id is not None else self.snowflake(),
+            'last_message_id': self.snowflake(),
+            'message_count': int(self.random.paretovariate(1.2)) * 5,
+            'member_count': min(50, int(self.random.paretovariate(1.5)) + 1),
+            'rate_limit_per_user': 0,
+            'thread_metadata': {
+                'archived': False,
+                'auto_archive_duration': self.random.choice((60, 1440, 4320)),
+                'archive_timestamp': self.timestamp(),
+                'locked': False,
+            },
+        })
+        del thread['permission_overwrites'], thread['position']
+        return thread
+
+    def guild(self, members: int = 100, roles: int = 20, channels: int = 30, threads: int = 0, presences: int = 0) -> dict:
+        '''GUILD_CREATE payload.
+
+        Arguments:
+            members (int): Members to include, Discord sends all of them for guilds the bot is in.
+            roles (int): Roles including `@everyone`.
+            channels (int): Channels, a category for every ten with text and voice channels under them.
+            threads (int): Active threads, spread over the text channels.
+            presences (int): Presences of the first members, Discord only sends those that are not offline.
+        '''
+        guild_id = self.snowflake()
+        role_list = [self.role(position, guild_id) for position in range(roles)]
+        role_ids = [role['id'] for role in role_list[1:]]
+
+        channel_list: List[dict] = list()
+        category_id = None
+        for position in range(channels):
+            if position % 10 == 0:
+                category = self.channel(guild_id, type=4, position=position)
+                category_id = category['id']
+                channel_list.append(category)
+            else:
+                channel_list.append(self.channel(guild_id, type=0 if self.random.random() < 0.8 else 2, position=position, parent_id=category_id))
+
+        member_list = [self.member(role_ids) for _ in range(members)]
+        owner_id = member_list[0]['user']['id'] if member_list else self.snowflake()
+
+        text_ids = [channel['id'] for channel in channel_list if channel['type'] == 0] or [channel_list[0]['id'] if channel_list else guild_id]
+        thread_list = [
+            self.thread(guild_id, self.random.choice(text_ids), self.random.choice(member_list)['user']['id'] if member_list else None, private=self.random.random() < 0.1)
+            for _ in range(threads)
+        ]
+        presence_list = list()
+        for member in member_list[:presences]:
+            presence = self.presence(member['user']['id'], activities=self.random.choice((0, 0, 1, 1, 2)))
+            del presence['guild_id']
+            presence_list.append(presence)
+
+        return {
+            'id': guild_id,
+            'name': self._words(1, 4).title(),
+            'icon': self._hash(),
+            'icon_hash': None,
+            'splash': None,
+            'discovery_splash': None,
+            'owner_id': owner_id,
+            'afk_channel_id': None,
+            'afk_timeout': 300,
+            'verification_level': 1,
+            'default_message_notifications': 1,
+            'explicit_content_filter': 2,
+            'roles': role_list,
+            'emojis': [],
+            'features': ['COMMUNITY', 'NEWS'] if members > 1000 else [],
+            'mfa_level': 0,
+            'application_id': None,
+            'system_channel_id': channel_list[1]['id'] if len(channel_list) > 1 else None,
+            'system_channel_flags': 0,
+            'rules_channel_id': None,
+            'joined_at': self.timestamp(),
+            'large': members > 250,
+            'unavailable': False,
+            'member_count': members,
+            'voice_states': [],
+            'members': member_list,
+            'channels': channel_list,
+            'threads': thread_list,
+            'presences': presence_list,
+            'max_members': 500000,
+            'vanity_url_code': None,
+            'description': None,
+            'banner': None,
+            'premium_tier': 0,
+            'premium_subscription_count': 0,
+            'preferred_locale': 'en-US',
+            'public_updates_channel_id': None,
+            'nsfw_level': 0,
+            'stage_instances': [],
+            'stickers': [],
+        }
+
+    # Messages
+
+    def embed(self) -> dict:
+        '''Rich embed object.'''
+        return {
+            'type': 'rich',
+            'title': self._words(2, 6),
+            'description': self._words(10, 60),
+            'url': f'https://example.com/{self.random.getrandbits(32):x}',
+            'color': self.random.randrange(0xFFFFFF),
+            'timestamp': self.timestamp(),
+            'footer': {'text': self._words(1, 4)},
+            'fields': [{'name': self._words(1, 3), 'value': self._words(1, 10), 'inline': self.random.random() < 0.5} for _ in range(self.random.randint(0, 6))],
+        }
+
+    def message(self,
+                channel_id: Optional[str] = None,
+                guild_id: Optional[str] = None,
+                author: Optional[dict] = None,
+                embeds: int = 0,
+                mentions: int = 0,
+                mention_roles: Optional[List[str]] = None,
+                reference: bool = False,
+                ) -> dict:
+        '''MESSAGE_CREATE payload.
+
+        Arguments:
+            channel_id (str): Channel, a new id if not given.
+            guild_id (str): Guild, omitted for direct messages.
+            author (dict): Author user, a new user if not given.
+            embeds (int): Rich embeds to attach.
+            mentions (int): Users to mention.
+            mention_roles ([str]): Role ids to mention.
+            reference (bool): Make the message a reply, with `message_reference` and `referenced_message`.
+        '''
+        self.advance(self.random.randint(1, 2_000))
+        author = author if author is not None else self.user()
+        channel_id = channel_id if channel_id is not None else self.snowflake()
+        mentioned = [self.user() for _ in range(mentions)]
+        content = self._words(1, 40)
+        if mentioned:
+            content = ' '.join(f'<@!{user["id"]}>' for user in mentioned) + ' ' + content
+
+        message = {
+            'id': self.snowflake(),
+            'channel_id': channel_id,
+            'author': author,
+            'content': content,
+            'timestamp': self.timestamp(),
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': mentioned,
+            'mention_roles': list(mention_roles or []),
+            'attachments': [],
+            'embeds': [self.embed() for _ in range(embeds)],
+            'pinned': False,
+            'type': 19 if reference else 0,
+            'flags': 0,
+            'components': [],
+            'nonce': self.snowflake(),
+        }
+        if guild_id is not None:
+            message['guild_id'] = guild_id
+            message['member'] = self.member(include_user=False)
+        if reference:
+            referenced = self.message(channel_id, guild_id)
+            message['message_reference'] = {'message_id': referenced['id'], 'channel_id': channel_id, **({'guild_id': guild_id} if guild_id else {})}
+            message['referenced_message'] = referenced
+        return message
+
+    # Events
+
+    def interaction(self, guild_id: Optional[str] = None, channel_id: Optional[str] = None, command_id: Optional[str] = None, options: int = 2) -> dict:
+        '''INTERACTION_CREATE payload for a chat input (slash) command.'''
+        guild_id = guild_id if guild_id is not None else self.snowflake()
+        return {
+            'id': self.snowflake(),
+            'application_id': self.snowflake(),
+            'type': 2,
+            'data': {
+                'id': command_id if command_id is not None else self.snowflake(),
+                'name': self.random.choice(_WORDS),
+                'type': 1,
+                'options': [{'name': f'option_{index}', 'type': 3, 'value': self._words(1, 5)} for index in range(options)],
+            },
+            'guild_id': guild_id,
+            'channel_id': channel_id if channel_id is not None else self.snowflake(),
+            'member': {**self.member(), 'permissions': str(self.random.getrandbits(40))},
+            'token': self._hash() * 4,
+            'version': 1,
+        }
+
+    def presence(self, user_id: Optional[str] = None, guild_id: Optional[str] = None, activities: int = 1) -> dict:
+        '''PRESENCE_UPDATE payload.'''
+        status = self.random.choice(('online', 'online', 'idle', 'dnd'))
+        return {
+            'user': {'id': user_id if user_id is not None else self.snowflake()},
+            'guild_id': guild_id if guild_id is not None else self.snowflake(),
+            'status': status,
+            'activities': [{
+                'id': f'{self.random.getrandbits(64):x}',
+                'name': self._words(1, 3),
+                'type': self.random.choice((0, 2, 3)),
+                'created_at': self._clock_ms,
+                'details': self._words(1, 6),
+                'state': self._words(1, 4),
+            } for _ in range(activities)],
+            'client_status': {self.random.choice(('desktop', 'mobile', 'web')): status},
+        }
+
+    def guild_member_update(self, guild_id: Optional[str] = None, role_ids: Optional[List[str]] = None) -> dict:
+        '''GUILD_MEMBER_UPDATE payload.'''
+        member = self.member(role_ids)
+        member['guild_id'] = guild_id if guild_id is not None else self.snowflake()
+        return member
+
+    def messages(self,
+                 count: int,
+                 guild_id: Optional[str] = None,
+                 channel_ids: Optional[List[str]] = None,
+                 authors: Optional[List[dict]] = None,
+                 rate: float = 5.0,
+                 ) -> Iterator[dict]:
+        '''Stream of MESSAGE_CREATE payloads with a realistic mix.
+
+        Channel and author activity follow a power law, so a few channels and users produce most of the traffic. Roughly 8% of messages are replies, 10% mention
+        other users and 5% carry an embed. Timestamps advance as a Poisson process.
+
+        Arguments:
+            count (int): Messages to produce.
+            guild_id (str): Guild the channels belong to, `None` for direct messages.
+            channel_ids ([str]): Channels to post in, ten new ones when omitted.
+            authors ([dict]): User objects to post as, fifty new ones when omitted.
+            rate (float): Mean messages per second, sets the spacing of timestamps and snowflakes.
+        '''
+        channel_ids = channel_ids if channel_ids else [self.snowflake() for _ in range(10)]
+        authors = authors if authors else [self.user() for _ in range(50)]
+        channel_weights = list(itertools.accumulate(1 / (rank + 1) ** 1.1 for rank in range(len(channel_ids))))
+        author_weights = list(itertools.accumulate(1 / (rank + 1) ** 1.2 for rank in range(len(authors))))
+
+        for _ in range(count):
+            self.advance(int(self.random.expovariate(rate) * 1000))
+            roll = self.random.random()
+            yield self.message(
+                channel_id=self.random.choices(channel_ids, cum_weights=channel_weights)[0],
+                guild_id=guild_id,
+                author=self.random.choices(authors, cum_weights=author_weights)[0],
+                embeds=1 if roll < 0.05 else 0,
+                mentions=self.random.randint(1, 3) if 0.05 <= roll < 0.15 else 0,
+                reference=self.random.random() < 0.08,
+            )
+
+
+_WORDS = (
+    'alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india', 'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa', 'quebec',
+    'romeo', 'sierra', 'tango', 'uniform', 'victor', 'whiskey', 'xray', 'yankee', 'zulu', 'dyscord', 'gateway', 'snowflake', 'guild', 'channel', 'thread', 'role',
+    'emoji', 'sticker', 'voice', 'stage', 'lurk', 'pog', 'gg', 'lol', 'ok', 'yes', 'no', 'the', 'a', 'is', 'to', 'and', 'of', 'in', 'it', 'you', 'that', 'this',
+)
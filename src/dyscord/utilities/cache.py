@@ -1,11 +1,528 @@
-'''Cache values for discord to use. NOT CURRENTLY USED.'''
+'''State cache of the entities the gateway has told us about.'''
+
+import collections.abc
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, MutableMapping, Optional, Set, Tuple, Union
+
+import cachetools
 
-from .. import objects
 from .borg import Borg
 
+if TYPE_CHECKING:
+    from .. import objects
+
+Identifier = Union[int, str, 'objects.Snowflake']
+
+KINDS = ('guilds', 'channels', 'users', 'members', 'messages', 'presences')
+
+
+def _key(identifier: Identifier) -> int:
+    '''Key of an identifier. Snowflakes hash like their integer, so strings are the only form needing conversion.'''
+    if isinstance(identifier, int):
+        return identifier
+    from ..objects.snowflake import Snowflake
+    return Snowflake(identifier)
+
+
+class CachePolicy:
+    '''Decides which entries of one entity type the cache keeps. The base policy keeps every entry until an event removes it.'''
+
+    def index(self, on_evict: Callable[[int], None]) -> MutableMapping:
+        '''Create the mapping holding the entries.
+
+        Arguments:
+            on_evict (Callable): Called with the number of entries the mapping dropped by itself.
+        '''
+        return dict()
+
+    def admits(self, guild_id: Optional[int]) -> bool:
+        '''Whether an entry belonging to `guild_id` should be cached at all. Entries outside any guild pass `None`.'''
+        return True
+
+    def __repr__(self):
+        '''Return string representation.'''
+        return f'{self.__class__.__name__}()'
+
+
+class Unbounded(CachePolicy):
+    '''Keep every entry until an event removes it.'''
+
+
+class LRU(CachePolicy):
+    '''Keep at most `maxsize` entries, dropping the least recently used first.
+
+    Arguments:
+        maxsize (int): Entries kept.
+    '''
+
+    def __init__(self, maxsize: int):
+        '''Init.'''
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be at least 1, got [{maxsize}].')
+        self.maxsize = maxsize
+
+    def index(self, on_evict: Callable[[int], None]) -> MutableMapping:
+        '''Create an LRU mapping that reports its evictions.'''
+        return _LRUIndex(self.maxsize, on_evict)
+
+    def __repr__(self):
+        '''Return string representation.'''
+        return f'LRU(maxsize={self.maxsize})'
+
+
+class TTL(CachePolicy):
+    '''Keep entries for `ttl` seconds after they were last stored, and at most `maxsize` of them.
+
+    Arguments:
+        ttl (float): Seconds an entry lives.
+        maxsize (float): Entries kept, the least recently used are dropped first. Unlimited by default.
+    '''
+
+    def __init__(self, ttl: float, maxsize: float = float('inf')):
+        '''Init.'''
+        if ttl <= 0:
+            raise ValueError(f'ttl must be positive, got [{ttl}].')
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+    def index(self, on_evict: Callable[[int], None]) -> MutableMapping:
+        '''Create a TTL mapping that reports its evictions and expirations.'''
+        return _TTLIndex(self.maxsize, self.ttl, on_evict)
+
+    def __repr__(self):
+        '''Return string representation.'''
+        return f'TTL(ttl={self.ttl}, maxsize={self.maxsize})'
+
+
+class PerChannel(CachePolicy):
+    '''Keep the latest `capacity` messages of every channel, and at most `maxsize` messages across all channels. Only for `messages`.
+
+    Each channel has a ring buffer of message IDs. A new message pushes the oldest of its channel out once the buffer is full, and the oldest message
+    overall once `maxsize` is reached, so a busy channel cannot crowd every other channel out. Lookups by ID are a single hash.
+
+    Arguments:
+        capacity (int): Messages kept per channel.
+        maxsize (int): Messages kept in total.
+    '''
+
+    def __init__(self, capacity: int = 100, maxsize: int = 1000):
+        '''Init.'''
+        if capacity < 1 or maxsize < 1:
+            raise ValueError(f'capacity and maxsize must be at least 1, got [{capacity}] and [{maxsize}].')
+        self.capacity = capacity
+        self.maxsize = maxsize
+
+    def index(self, on_evict: Callable[[int], None]) -> MutableMapping:
+        '''Create the per channel ring buffers.'''
+        return _ChannelRingIndex(self.capacity, self.maxsize, on_evict)
+
+    def __repr__(self):
+        '''Return string representation.'''
+        return f'PerChannel(capacity={self.capacity}, maxsize={self.maxsize})'
+
+
+class Tiered(PerChannel):
+    '''Keep the latest `capacity` messages of every channel like `PerChannel`, but only the `hot` most recently used of each channel as `Message` objects.
+
+    Older messages are demoted to their payload, serialized and compressed, which takes a fraction of the memory of a parsed message. Reading a demoted
+    message inflates it back into a `Message` and makes it hot again, so deeper history can be kept for the same memory. Demoting needs the payload, the
+    client passes it when caching MESSAGE_CREATE. Messages cached without one are dropped instead of demoted, and changes made to a message other than
+    with `apply_update()` are lost once it is demoted.
+
+    Arguments:
+        capacity (int): Messages kept per channel.
+        hot (int): Messages of each channel kept parsed.
+        maxsize (int): Messages kept in total.
+    '''
+
+    def __init__(self, capacity: int = 1000, hot: int = 20, maxsize: int = 100_000):
+        '''Init.'''
+        super().__init__(capacity, maxsize)
+        if hot < 1:
+            raise ValueError(f'hot must be at least 1, got [{hot}].')
+        self.hot = hot
+
+    def index(self, on_evict: Callable[[int], None]) -> MutableMapping:
+        '''Create the per channel ring buffers with a compressed tier.'''
+        return _TieredChannelIndex(self.capacity, self.maxsize, self.hot, on_evict)
+
+    def __repr__(self):
+        '''Return string representation.'''
+        return f'Tiered(capacity={self.capacity}, hot={self.hot}, maxsize={self.maxsize})'
+
+
+class ActiveGuilds(CachePolicy):
+    '''Only cache entries of guilds something is listening to. Entries outside any guild, such as direct messages, are always cached.
+
+    Arguments:
+        guild_ids (Iterable[Snowflake]): Guilds to cache. When omitted, the guilds with callbacks registered to `CommandHandler` are followed.
+        policy (CachePolicy): Policy of the entries that are admitted. Unbounded by default.
+    '''
+
+    def __init__(self, guild_ids: Optional[Iterable[Identifier]] = None, policy: Optional[CachePolicy] = None):
+        '''Init.'''
+        self.guild_ids: Optional[Set[int]] = None if guild_ids is None else {_key(guild_id) for guild_id in guild_ids}
+        self.policy = policy if policy is not None else Unbounded()
+        self._handler_guilds: Set[int] = set()
+        self._handler_lookup: Optional[dict] = None
+        self._handler_version: Any = None
+
+    def index(self, on_evict: Callable[[int], None]) -> MutableMapping:
+        '''Create the mapping of the wrapped policy.'''
+        return self.policy.index(on_evict)
+
+    def admits(self, guild_id: Optional[int]) -> bool:
+        '''Whether `guild_id` is listed, or has callbacks registered when no guilds are listed.'''
+        if guild_id is None:
+            return True
+        guild_id = _key(guild_id)
+        if self.guild_ids is not None:
+            return guild_id in self.guild_ids
+        return guild_id in self._command_handler_guilds()
+
+    def _command_handler_guilds(self) -> Set[int]:
+        '''Guilds with callbacks registered to `CommandHandler`, recomputed only when registrations change.'''
+        from ..helper.command_handler import CommandHandler
+        lookup = CommandHandler.guild_lookup
+        # The lookup counts its changes. A plain dict assigned in its place is compared by its keys instead.
+        version = getattr(lookup, 'version', None)
+        if version is None:
+            version = frozenset(lookup)
+        if lookup is not self._handler_lookup or version != self._handler_version:
+            self._handler_guilds = {_key(guild) for _, guild in lookup if guild is not None}
+            self._handler_lookup = lookup
+            self._handler_version = version
+        return self._handler_guilds
+
+    def __repr__(self):
+        '''Return string representation.'''
+        guilds = 'handlers' if self.guild_ids is None else sorted(self.guild_ids)
+        return f'ActiveGuilds(guild_ids={guilds}, policy={self.policy!r})'
+
+
+_stored_size = cachetools.Cache.currsize.fget
+
+
+class _LRUIndex(cachetools.LRUCache):
+    '''LRU mapping reporting the entries it evicts.'''
+
+    def __init__(self, maxsize: int, on_evict: Callable[[int], None]):
+        super().__init__(maxsize)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        item = super().popitem()
+        self._on_evict(1)
+        return item
+
+
+class _TTLIndex(cachetools.TTLCache):
+    '''TTL mapping reporting the entries it evicts or expires.'''
+
+    def __init__(self, maxsize: float, ttl: float, on_evict: Callable[[int], None]):
+        super().__init__(maxsize, ttl, timer=time.monotonic)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        item = super().popitem()
+        self._on_evict(1)
+        return item
+
+    def expire(self, time=None):
+        # The `currsize` of TTLCache expires entries itself, read the size kept by the base class instead.
+        before = _stored_size(self)
+        result = super().expire(time)
+        after = _stored_size(self)
+        if after < before:
+            self._on_evict(before - after)
+        return result
+
+
+class _ChannelRingIndex(collections.abc.MutableMapping):
+    '''Messages by ID, with a ring buffer of the IDs of every channel. The dict keeps arrival order across channels, so its first key is the oldest.
+
+    Each ring is a dict of IDs in arrival order, rather than a deque, so a deleted message leaves its ring in constant time.
+    '''
+
+    def __init__(self, capacity: int, maxsize: int, on_evict: Callable[[int], None]):
+        self.capacity = capacity
+        self.maxsize = maxsize
+        self._on_evict = on_evict
+        self._messages: Dict[int, Any] = dict()
+        self._rings: Dict[int, Dict[int, None]] = dict()
+
+    def __getitem__(self, key: int) -> Any:
+        return self._messages[key]
+
+    def get(self, key: int, default: Any = None) -> Any:
+        return self._messages.get(key, default)
+
+    def __setitem__(self, key: int, message: Any):
+        messages = self._messages
+        if key in messages:
+            messages[key] = message
+            return
+
+        ring = self._rings.get(message.channel_id)
+        if ring is None:
+            ring = self._rings[message.channel_id] = dict()
+        elif len(ring) == self.capacity:
+            # Full, the oldest message of the channel makes room.
+            oldest = next(iter(ring))
+            del ring[oldest]
+            self._discard(oldest, message.channel_id)
+            self._on_evict(1)
+        ring[key] = None
+        messages[key] = message
+
+        if len(messages) > self.maxsize:
+            self.popitem()
+
+    def __delitem__(self, key: int):
+        channel_id = self._messages[key].channel_id
+        self._discard(key, channel_id)
+        ring = self._rings[channel_id]
+        del ring[key]
+        if not ring:
+            del self._rings[channel_id]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._messages
+
+    def _discard(self, key: int, channel_id: int):
+        '''Forget a message, its ID is taken out of the ring by the caller.'''
+        del self._messages[key]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def popitem(self) -> Tuple[int, Any]:
+        '''Evict the oldest message, which is also the oldest of its channel.'''
+        key = next(iter(self._messages))
+        message = self._messages[key]
+        del self[key]
+        self._on_evict(1)
+        return key, message
+
+    def channel(self, channel_id: int) -> List[Any]:
+        '''Messages of a channel, oldest first.'''
+        ring = self._rings.get(channel_id, ())
+        return [self._messages[key] for key in ring]
+
+
+# Keys and values most message payloads share. Compressing with them as a preset dictionary shrinks a payload to about 60% of what plain zlib gives.
+_MESSAGE_ZDICT = (
+    b'{"id":"","channel_id":"","guild_id":"","author":{"id":"","username":"","discriminator":"","avatar":null,"public_flags":0,"bot":true},'
+    b'"member":{"nick":null,"avatar":null,"roles":[],"joined_at":"","premium_since":null,"deaf":false,"mute":false,"pending":false},'
+    b'"content":"","timestamp":"","edited_timestamp":null,"tts":false,"mention_everyone":false,"mentions":[],"mention_roles":[],"attachments":[],'
+    b'"embeds":[],"reactions":[],"pinned":false,"type":0,"flags":0,"components":[],"nonce":"","message_reference":null,"referenced_message":null}'
+)
+# Copying a compressor primed with the dictionary is cheaper than priming a new one for every message. Created on first use, like the imports of
+# orjson and zlib, so importing the package stays light.
+_message_compressor: Any = None
+
+
+class _ColdMessage:
+    '''A demoted message: its channel, and its payload as compressed JSON.'''
+
+    __slots__ = ('channel_id', 'blob')
+
+    # Bytes of the object itself and of its dict entry, on top of the blob.
+    OVERHEAD = 150
+
+    def __init__(self, channel_id: int, blob: bytes):
+        self.channel_id = channel_id
+        self.blob = blob
+
+    @classmethod
+    def compress(cls, message: 'objects.Message') -> '_ColdMessage':
+        import orjson
+        import zlib
+        global _message_compressor
+        if _message_compressor is None:
+            _message_compressor = zlib.compressobj(zdict=_MESSAGE_ZDICT)
+        compressor = _message_compressor.copy()
+        blob = compressor.compress(orjson.dumps(message._raw)) + compressor.flush()
+        return cls(message.channel_id, blob)
+
+    def inflate(self) -> 'objects.Message':
+        import orjson
+        import zlib
+        from ..objects.message import Message
+        payload = orjson.loads(zlib.decompressobj(zdict=_MESSAGE_ZDICT).decompress(self.blob))
+        message = Message().from_dict(payload)
+        message._raw = payload
+        return message
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.blob) + self.OVERHEAD
+
+
+class _TieredChannelIndex(_ChannelRingIndex):
+    '''Ring buffers of messages, keeping the most recently used of each channel as objects and the rest as `_ColdMessage`.'''
+
+    def __init__(self, capacity: int, maxsize: int, hot: int, on_evict: Callable[[int], None]):
+        super().__init__(capacity, maxsize, on_evict)
+        self.hot = hot
+        # IDs of the hot messages of every channel, least recently used first.
+        self._hot: Dict[int, Dict[int, None]] = dict()
+        # Kept up to date on every change, so the cache can estimate its size on each insert.
+        self.hot_count = 0
+        self.cold_bytes = 0
+
+    def __getitem__(self, key: int) -> Any:
+        message = self._messages[key]
+        if message.__class__ is _ColdMessage:
+            return self._promote(key, message)
+        hot = self._hot[message.channel_id]
+        del hot[key]
+        hot[key] = None
+        return message
+
+    def get(self, key: int, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: int, message: Any):
+        previous = self._messages.get(key)
+        if previous.__class__ is _ColdMessage:
+            self.cold_bytes -= previous.nbytes
+        super().__setitem__(key, message)
+        if key in self._messages:
+            self._mark_hot(key, message.channel_id)
+
+    def pop(self, key: int, *default: Any) -> Any:
+        '''Remove a message and return it, inflated but not made hot.'''
+        if key not in self._messages:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        message = self._messages[key]
+        del self[key]
+        return message.inflate() if message.__class__ is _ColdMessage else message
+
+    def items(self) -> List[Tuple[int, Any]]:  # type: ignore[override]
+        '''Every message, with demoted ones inflated but not made hot.'''
+        return [(key, self._peek(message)) for key, message in self._messages.items()]
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        '''Every message, with demoted ones inflated but not made hot.'''
+        return [self._peek(message) for message in self._messages.values()]
+
+    def channel(self, channel_id: int) -> List[Any]:
+        '''Messages of a channel, oldest first. Demoted messages are inflated but not made hot, so each listing returns new objects for them.'''
+        ring = self._rings.get(channel_id, ())
+        return [self._peek(self._messages[key]) for key in ring]
+
+    def _discard(self, key: int, channel_id: int):
+        message = self._messages[key]
+        if message.__class__ is _ColdMessage:
+            self.cold_bytes -= message.nbytes
+        else:
+            hot = self._hot[channel_id]
+            del hot[key]
+            self.hot_count -= 1
+            if not hot:
+                del self._hot[channel_id]
+        super()._discard(key, channel_id)
+
+    @staticmethod
+    def _peek(message: Any) -> Any:
+        return message.inflate() if message.__class__ is _ColdMessage else message
+
+    def _promote(self, key: int, cold: _ColdMessage) -> Any:
+        '''Inflate a demoted message and make it hot.'''
+        message = cold.inflate()
+        self.cold_bytes -= cold.nbytes
+        self._messages[key] = message
+        self._mark_hot(key, cold.channel_id)
+        return message
+
+    def _mark_hot(self, key: int, channel_id: int):
+        '''Make a message the most recently used of its channel, demoting the least recently used once the channel has too many hot messages.'''
+        hot = self._hot.get(channel_id)
+        if hot is None:
+            hot = self._hot[channel_id] = dict()
+        if key in hot:
+            del hot[key]
+        else:
+            self.hot_count += 1
+        hot[key] = None
+        while len(hot) > self.hot:
+            self._demote(next(iter(hot)), channel_id)
+
+    def _demote(self, key: int, channel_id: int):
+        '''Compress a hot message, or drop it when its payload was not kept.'''
+        message = self._messages[key]
+        if message._raw is None:
+            del self[key]
+            self._on_evict(1)
+            return
+        del self._hot[channel_id][key]
+        self.hot_count -= 1
+        cold = self._messages[key] = _ColdMessage.compress(message)
+        self.cold_bytes += cold.nbytes
+
 
 class Cache(Borg):
-    '''Generic cache of objects we have been told about from the API.'''
+    '''Generic cache of objects we have been told about from the API.
+
+    Every entity type has its own index keyed by Snowflake, so each lookup is a single hash. Members and presences are per guild and are keyed by
+    `(guild_id, user_id)`. The client fills the cache from READY, GUILD_*, CHANNEL_*, THREAD_*, GUILD_MEMBER_*, MESSAGE_* and PRESENCE_UPDATE before handlers
+    run, so handlers may read state from here instead of asking the REST API for it again.
+
+    Cached guilds, channels and messages are updated in place, so references held by handlers stay current.
+
+    How many entries of each type are kept is set with `configure()`, see `Unbounded`, `LRU`, `TTL`, `PerChannel` and `ActiveGuilds`. By default the 100
+    most recent messages of each channel are kept, and 1000 in total. `Tiered` keeps deeper history by compressing all but the most
+    recently used messages of each channel. `set_memory_budget()` caps the estimated size of the whole cache, `stats()` reports evictions and refetches.
+
+    Follows the Borg design pattern, every instance shares the same state.
+    '''
+
+    DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+        'guilds': Unbounded(),
+        'channels': Unbounded(),
+        'users': Unbounded(),
+        'members': Unbounded(),
+        'messages': PerChannel(100, 1000),
+        'presences': Unbounded(),
+    }
+    # Approximate bytes an entry holds, from `python -m dyscord.bench memory`.
+    ENTRY_BYTES: Dict[str, int] = {
+        'guilds': 12_800,
+        'channels': 430,
+        'users': 400,
+        'members': 650,
+        'messages': 2_000,
+        'presences': 1_100,
+    }
+    # Evicted first to last when over the memory budget. Presences are resent by the gateway on the next change, messages, members and users cost one
+    # REST call each, losing channels and guilds leaves every event of the guild without context until they are fetched again.
+    REFETCH_ORDER: Tuple[str, ...] = ('presences', 'messages', 'members', 'users', 'channels', 'guilds')
+
+    guilds: 'MutableMapping[int, objects.Guild]'
+    channels: 'MutableMapping[int, objects.Channel]'
+    users: 'MutableMapping[int, objects.User]'
+    members: 'MutableMapping[Tuple[int, int], objects.Member]'
+    messages: 'MutableMapping[int, objects.Message]'
+    presences: 'MutableMapping[Tuple[int, int], objects.Presence]'
+    policies: Dict[str, CachePolicy]
+    memory_budget: Optional[int]
+    _evictions: Dict[str, int]
+    _rejected: Dict[str, int]
+    _refetches: Dict[str, int]
+    _budget_evictions: int
+    _guild_keys: Dict[str, Dict[int, Set[Tuple[int, int]]]]
+    _guild_key_count: Dict[str, int]
+    _guild_owners: 'Dict[int, weakref.WeakSet]'
 
     def __init__(self):
         '''Create a access to the cache, follows the Borg design pattern.'''
@@ -14,36 +531,453 @@ class Cache(Borg):
         try:
             getattr(self, 'first')
         except AttributeError:
-            self.guilds = set()
-            self.channels = set()
-            self.users = set()
+            self.policies = dict(self.DEFAULT_POLICIES)
+            self.memory_budget = None
+            self.clear()
             self.first = False
 
-    def get(self, identifier: 'objects.Snowflake'):
-        '''Return a given object with an given identifier if we know about it.'''
-        for x in self.guilds:
-            if identifier == x.id:
-                return x
-        for x in self.channels:
-            if identifier == x.id:
-                return x
-        for x in self.users:
-            if identifier == x.id:
-                return x
+    def configure(self, **policies: CachePolicy):
+        '''Set the eviction policy of one or more entity types.
+
+        For example `configure(messages=LRU(5000), presences=ActiveGuilds())`. Entries already cached are moved to the new index, which drops any beyond its
+        limits. Types not given keep their policy.
+
+        Arguments:
+            **policies (CachePolicy): Policy by entity type, one of `guilds`, `channels`, `users`, `members`, `messages` and `presences`.
+
+        Raises:
+            KeyError: Unknown entity type.
+        '''
+        for kind, policy in policies.items():
+            if kind not in KINDS:
+                raise KeyError(f'Unknown entity type [{kind}], expected one of {KINDS}.')
+            self.policies[kind] = policy
+            entries = list(getattr(self, kind).items())
+            index = policy.index(self._counter(kind))
+            for key, value in entries:
+                index[key] = value
+            setattr(self, kind, index)
+
+    def set_memory_budget(self, budget: Optional[int]):
+        '''Cap the estimated size of the cache, `None` to lift the cap.
+
+        Sizes are estimated from `ENTRY_BYTES`. Once over budget, entries are evicted oldest first, from the types cheapest to fetch again first, in
+        `REFETCH_ORDER`.
+
+        Arguments:
+            budget (int): Bytes.
+        '''
+        self.memory_budget = budget
+        self._enforce_budget()
+
+    def estimated_bytes(self) -> int:
+        '''Estimated size of every cached entry, see `ENTRY_BYTES`. Messages demoted by `Tiered` count their compressed size instead.'''
+        total = sum(len(getattr(self, kind)) * self.ENTRY_BYTES[kind] for kind in KINDS)
+        messages = self.messages
+        if isinstance(messages, _TieredChannelIndex):
+            cold = len(messages) - messages.hot_count
+            total += messages.cold_bytes - cold * self.ENTRY_BYTES['messages']
+        return total
+
+    def record_refetch(self, kind: str):
+        '''Count an entity that was not cached and had to be fetched from the REST API.'''
+        self._refetches[kind] = self._refetches.get(kind, 0) + 1
+
+    def stats(self) -> dict:
+        '''Size, policy, evictions, entries rejected by the policy and refetches of every entity type, and the estimated size of the cache.
+
+        Returns:
+            dict: An entry per entity type, `estimated_bytes`, `memory_budget` and `budget_evictions`. With `Tiered` messages also report how many are
+                `hot` and `cold`, and the `cold_bytes` of the compressed ones.
+        '''
+        result: Dict[str, Any] = {
+            kind: {
+                'size': len(getattr(self, kind)),
+                'policy': repr(self.policies[kind]),
+                'evictions': self._evictions.get(kind, 0),
+                'rejected': self._rejected.get(kind, 0),
+                'refetches': self._refetches.get(kind, 0),
+            } for kind in KINDS
+        }
+        messages = self.messages
+        if isinstance(messages, _TieredChannelIndex):
+            result['messages']['hot'] = messages.hot_count
+            result['messages']['cold'] = len(messages) - messages.hot_count
+            result['messages']['cold_bytes'] = messages.cold_bytes
+        result['estimated_bytes'] = self.estimated_bytes()
+        result['memory_budget'] = self.memory_budget
+        result['budget_evictions'] = self._budget_evictions
+        return result
+
+    def get(self, identifier: Identifier):
+        '''Return the guild, channel or user with the given identifier if we know about it.
+
+        Raises:
+            LookupError: Nothing with this identifier is cached.
+        '''
+        key = _key(identifier)
+        for index in (self.guilds, self.channels, self.users):
+            value = index.get(key)
+            if value is not None:
+                return value
         raise LookupError(f'Identifier {identifier} not in cache.')
 
-    def add(self, object):
-        '''Given some generic object, insert it into the cache.'''
-        # Convert to dict
-        # if type(object) is objects.Guild:
-        #     self.guilds.add(object)
-        # elif isinstance(object, objects.Channel):
-        #     self.channels.add(object)
-        # elif type(object) is objects.User:
-        #     self.users.add(object)
+    def get_guild(self, guild_id: Identifier) -> 'Optional[objects.Guild]':
+        '''Return the cached guild with this ID, or `None`.'''
+        return self.guilds.get(_key(guild_id))
+
+    def get_channel(self, channel_id: Identifier) -> 'Optional[objects.Channel]':
+        '''Return the cached channel or thread with this ID, or `None`.'''
+        return self.channels.get(_key(channel_id))
+
+    def get_user(self, user_id: Identifier) -> 'Optional[objects.User]':
+        '''Return the cached user with this ID, or `None`.'''
+        return self.users.get(_key(user_id))
+
+    def get_member(self, guild_id: Identifier, user_id: Identifier) -> 'Optional[objects.Member]':
+        '''Return the cached member of a guild, or `None`.'''
+        return self.members.get((_key(guild_id), _key(user_id)))
+
+    def get_message(self, message_id: Identifier) -> 'Optional[objects.Message]':
+        '''Return the cached message with this ID, or `None`.'''
+        return self.messages.get(_key(message_id))
+
+    def get_presence(self, guild_id: Identifier, user_id: Identifier) -> 'Optional[objects.Presence]':
+        '''Return the last presence of a user in a guild, or `None`.'''
+        return self.presences.get((_key(guild_id), _key(user_id)))
+
+    def add(self, obj: Any):
+        '''Given some generic object, insert it into the cache.
+
+        Arguments:
+            obj: A `Guild`, `Channel`, `Member`, `User`, `Message` or `Presence`. Members and presences need their `guild_id`, use `add_member()` for
+                members.
+
+        Raises:
+            TypeError: Objects of this type are not cached.
+        '''
+        from .. import objects
+        if isinstance(obj, objects.Guild):
+            self.add_guild(obj)
+        elif isinstance(obj, objects.Channel):
+            self.add_channel(obj)
+        elif isinstance(obj, objects.User) and not isinstance(obj, objects.Member):
+            self.add_user(obj)
+        elif isinstance(obj, objects.Message):
+            self.add_message(obj)
+        elif isinstance(obj, objects.Presence):
+            self.add_presence(obj)
+        else:
+            raise TypeError(f'Cannot cache objects of type [{type(obj)}].')
+
+    def add_ready(self, ready: 'objects.Ready', owner: Optional[object] = None):
+        '''Cache the bot user and the unavailable guilds sent with READY, keeping guilds that are already cached.
+
+        Arguments:
+            ready (Ready): The READY event.
+            owner (object): Client the guilds belong to, see `remove_guild()`.
+        '''
+        self.add_user(ready.user)
+        for guild in ready.guilds:
+            self._add_owner(guild.id, owner)
+            if guild.id not in self.guilds:
+                self._store('guilds', guild.id, guild, guild.id)
+
+    def add_user(self, user: 'objects.User'):
+        '''Cache a user.'''
+        self._store('users', user.id, user)
+
+    def add_guild(self, guild: 'objects.Guild'):
+        '''Cache a guild and its channels.'''
+        self._store('guilds', guild.id, guild, guild.id)
+        for channel in guild.channels or ():
+            self._store('channels', channel.id, channel, guild.id)
+
+    def merge_guild(self, data: dict, owner: Optional[object] = None) -> 'objects.Guild':
+        '''Merge a GUILD_CREATE or GUILD_UPDATE payload into the cached guild, caching a new one when it is unknown.
+
+        Members and presences sent with GUILD_CREATE are cached as well.
+
+        Arguments:
+            data (dict): API compliant guild dict.
+            owner (object): Client that received the payload, see `remove_guild()`.
+
+        Returns:
+            Guild: The cached guild.
+        '''
+        from .. import objects
+        guild = self.guilds.get(_key(data['id']))
+        if guild is None or guild.name is None:
+            # Unknown, or only the stub sent with READY.
+            guild = objects.Guild().from_dict(data)
+        else:
+            guild.apply_update(data)
+        # GUILD_DELETE flags an outage, the full payload sent once the guild is back may leave the field out.
+        guild.unavailable = data.get('unavailable', False)
+        self._add_owner(guild.id, owner)
+        self.add_guild(guild)
+
+        for member_dict in data.get('members', ()):
+            self.add_member(guild.id, objects.Member.canonical(member_dict, guild.id))
+        for presence_dict in data.get('presences', ()):
+            presence = objects.Presence(data=presence_dict)
+            presence.guild_id = guild.id
+            self.add_presence(presence)
+        return guild
+
+    def remove_guild(self, guild_id: Identifier, owner: Optional[object] = None) -> 'Optional[objects.Guild]':
+        '''Drop a guild along with its channels, members and presences.
+
+        The cache is shared by every client of the process. Clients pass themselves as `owner` when caching guilds, and a guild one client leaves is only
+        dropped once no other client holds it. Without an `owner` the guild is dropped right away.
+
+        Arguments:
+            guild_id (Snowflake): Guild to drop.
+            owner (object): Client leaving the guild.
+
+        Returns:
+            Guild|None: The guild that was cached, also when other clients keep it cached.
+        '''
+        key = _key(guild_id)
+        owners = self._guild_owners.get(key)
+        if owner is not None and owners is not None:
+            owners.discard(owner)
+            if owners:
+                return self.guilds.get(key)
+        self._guild_owners.pop(key, None)
+
+        guild = self.guilds.pop(key, None)
+        if guild is not None:
+            for channel in guild.channels or ():
+                self.channels.pop(channel.id, None)
+        for kind in ('members', 'presences'):
+            keys = self._guild_keys[kind].pop(key, set())
+            self._guild_key_count[kind] -= len(keys)
+            index = getattr(self, kind)
+            for member_key in keys:
+                index.pop(member_key, None)
+        return guild
+
+    def add_channel(self, channel: 'objects.Channel', guild_id: Optional[Identifier] = None):
+        '''Cache a channel, replacing any channel with the same ID in the list of its guild.'''
+        guild_key = _key(guild_id) if guild_id is not None else None
+        self._store('channels', channel.id, channel, guild_key)
+        guild = self.guilds.get(guild_key) if guild_key is not None else None
+        if guild is None:
+            return
+        if guild.channels is None:
+            guild.channels = []
+        for index, existing in enumerate(guild.channels):
+            if existing.id == channel.id:
+                guild.channels[index] = channel
+                return
+        guild.channels.append(channel)
+
+    def merge_channel(self, data: dict) -> 'objects.Channel':
+        '''Merge a CHANNEL_CREATE, CHANNEL_UPDATE or THREAD_* payload into the cached channel, caching a new one when it is unknown.
+
+        Returns:
+            Channel: The cached channel.
+        '''
+        from .. import objects
+        channel = self.channels.get(_key(data['id']))
+        if channel is not None and channel.type == data['type']:
+            channel.from_dict(data)
+        else:
+            channel = objects.ChannelImporter.from_dict(data)
+        self.add_channel(channel, data.get('guild_id'))
+        return channel
+
+    def remove_channel(self, channel_id: Identifier, guild_id: Optional[Identifier] = None) -> 'Optional[objects.Channel]':
+        '''Drop a channel, also from the list of its guild.
+
+        Returns:
+            Channel|None: The channel that was cached.
+        '''
+        key = _key(channel_id)
+        channel = self.channels.pop(key, None)
+        guild = self.guilds.get(_key(guild_id)) if guild_id is not None else None
+        if guild is not None and guild.channels:
+            guild.channels = [existing for existing in guild.channels if existing.id != key]
+        return channel
+
+    def add_member(self, guild_id: Identifier, member: 'objects.Member'):
+        '''Cache a member of a guild.'''
+        guild_key = _key(guild_id)
+        self._store('members', (guild_key, member.id), member, guild_key)
+
+    def merge_member(self, data: dict) -> 'objects.Member':
+        '''Merge a GUILD_MEMBER_ADD or GUILD_MEMBER_UPDATE payload into the cached member, caching a new one when it is unknown.
+
+        Returns:
+            Member: The cached member.
+        '''
+        from .. import objects
+        guild_id = _key(data['guild_id'])
+        member = self.members.get((guild_id, _key(data['user']['id'])))
+        if member is None:
+            member = objects.Member.canonical(data, data['guild_id'])
+        else:
+            member.from_dict(data)
+        self.add_member(guild_id, member)
+        return member
+
+    def remove_member(self, guild_id: Identifier, user_id: Identifier) -> 'Optional[objects.Member]':
+        '''Drop a member of a guild and their presence there.
+
+        Returns:
+            Member|None: The member that was cached.
+        '''
+        key = (_key(guild_id), _key(user_id))
+        for kind in ('members', 'presences'):
+            keys = self._guild_keys[kind].get(key[0])
+            if keys is not None and key in keys:
+                keys.remove(key)
+                self._guild_key_count[kind] -= 1
+        self.presences.pop(key, None)
+        return self.members.pop(key, None)
+
+    def add_message(self, message: 'objects.Message', data: Optional[dict] = None):
+        '''Cache a message.
+
+        The author and member are cached too, unless the message is parsed lazily and they have not been read yet.
+
+        Arguments:
+            message (Message): Message to cache.
+            data (dict): Payload the message was parsed from. The `Tiered` policy keeps it with the message, to compress it once the message is demoted.
+        '''
+        guild_id = message.guild_id
+        parsed = message._raw is None
+        if parsed and data is not None and isinstance(self.messages, _TieredChannelIndex):
+            message._raw = data
+        self._store('messages', message.id, message, guild_id)
+
+        if parsed:
+            if message.author is not None:
+                self.add_user(message.author)
+            if message.member is not None and guild_id is not None:
+                self._store('members', (guild_id, message.member.id), message.member, guild_id)
+
+    def remove_message(self, message_id: Identifier) -> 'Optional[objects.Message]':
+        '''Drop a message.
+
+        Returns:
+            Message|None: The message that was cached, with the content it had before it was deleted.
+        '''
+        return self.messages.pop(_key(message_id), None)
+
+    def remove_messages(self, message_ids: Iterable[Identifier]) -> 'List[objects.Message]':
+        '''Drop several messages, such as those of MESSAGE_DELETE_BULK.
+
+        Returns:
+            [Message]: The messages that were cached, in the order of `message_ids`.
+        '''
+        removed = (self.messages.pop(_key(message_id), None) for message_id in message_ids)
+        return [message for message in removed if message is not None]
+
+    def get_channel_messages(self, channel_id: Identifier) -> 'List[objects.Message]':
+        '''Cached messages of a channel, oldest first.
+
+        Only the default `PerChannel` policy tracks channels, other message policies scan every cached message.
+        '''
+        key = _key(channel_id)
+        index = self.messages
+        if isinstance(index, _ChannelRingIndex):
+            return index.channel(key)
+        return [message for message in index.values() if message.channel_id == key]
+
+    def add_presence(self, presence: 'objects.Presence'):
+        '''Cache the presence of a user in a guild, replacing their previous one.
+
+        Presences usually carry a partial user, often only its ID. When the user is cached already, the fields the partial user has are merged into the
+        cached one, which the presence then refers to.
+        '''
+        if presence.guild_id is None or presence.user is None:
+            return
+        cached = self.users.get(presence.user.id)
+        if cached is None:
+            self.add_user(presence.user)
+        elif cached is not presence.user:
+            for field in getattr(type(cached), '_slot_defaults', ()):
+                value = getattr(presence.user, field, None)
+                if value is not None:
+                    setattr(cached, field, value)
+            presence.user = cached
+        self._store('presences', (presence.guild_id, presence.user.id), presence, presence.guild_id)
 
     def clear(self):
-        '''Remove all current elements within the cache.'''
-        self.guilds = set()
-        self.channels = set()
-        self.users = set()
+        '''Remove all current elements within the cache and reset the statistics. Policies and the memory budget are kept.'''
+        self._evictions = dict()
+        self._rejected = dict()
+        self._refetches = dict()
+        self._budget_evictions = 0
+        self._guild_keys = {'members': dict(), 'presences': dict()}
+        self._guild_key_count = {'members': 0, 'presences': 0}
+        self._guild_owners = dict()
+        for kind in KINDS:
+            setattr(self, kind, self.policies[kind].index(self._counter(kind)))
+
+    def _store(self, kind: str, key: Any, value: Any, guild_id: Optional[int] = None):
+        '''Insert an entry the policy of its type admits, then keep the cache within its memory budget.'''
+        if guild_id is not None and not self.policies[kind].admits(guild_id):
+            self._rejected[kind] = self._rejected.get(kind, 0) + 1
+            return
+        getattr(self, kind)[key] = value
+        if kind in self._guild_keys:
+            self._track_guild_key(kind, key)
+        if self.memory_budget is not None:
+            self._enforce_budget()
+
+    def _track_guild_key(self, kind: str, key: Tuple[int, int]):
+        '''Remember the key of a member or presence by guild, so a guild is dropped in time proportional to its size.'''
+        by_guild = self._guild_keys[kind]
+        keys = by_guild.get(key[0])
+        if keys is None:
+            keys = by_guild[key[0]] = set()
+        if key in keys:
+            return
+        keys.add(key)
+        count = self._guild_key_count[kind] = self._guild_key_count[kind] + 1
+        # Policies evict without telling which keys, rebuild from the index once stale keys could outnumber live ones.
+        index = getattr(self, kind)
+        if count > 2 * len(index) + 1024:
+            by_guild.clear()
+            for live_key in index:
+                by_guild.setdefault(live_key[0], set()).add(live_key)
+            self._guild_key_count[kind] = len(index)
+
+    def _add_owner(self, guild_id: int, owner: Optional[object]):
+        '''Record that `owner` holds a guild.'''
+        if owner is None:
+            return
+        owners = self._guild_owners.get(guild_id)
+        if owners is None:
+            owners = self._guild_owners[guild_id] = weakref.WeakSet()
+        owners.add(owner)
+
+    def _enforce_budget(self):
+        '''Evict entries, oldest first and cheapest to fetch again first, until the estimated size fits the budget.'''
+        budget = self.memory_budget
+        if budget is None:
+            return
+        excess = self.estimated_bytes() - budget
+        for kind in self.REFETCH_ORDER:
+            index = getattr(self, kind)
+            cost = self.ENTRY_BYTES[kind]
+            while excess > 0 and len(index):
+                if type(index) is dict:
+                    del index[next(iter(index))]
+                    self._evictions[kind] = self._evictions.get(kind, 0) + 1
+                    value = None
+                else:
+                    _, value = index.popitem()  # Least recently used first, counted by the index.
+                self._budget_evictions += 1
+                excess -= value.nbytes if value.__class__ is _ColdMessage else cost
+            if excess <= 0:
+                return
+
+    def _counter(self, kind: str) -> Callable[[int], None]:
+        '''Callback counting entries an index of `kind` evicts by itself.'''
+        def on_evict(count: int):
+            self._evictions[kind] = self._evictions.get(kind, 0) + count
+        return on_evict
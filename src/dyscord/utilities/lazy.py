@@ -0,0 +1,36 @@
+'''Deferred imports for package namespaces.'''
+import importlib
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, Tuple[str, Optional[str]]]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    '''Build a module level `__getattr__` and `__dir__` that import exports on first access.
+
+    Assign the results to `__getattr__` and `__dir__` in a package `__init__`. Once imported, a value is stored in the package namespace so later lookups are
+    plain attribute access.
+
+    Arguments:
+        package (str): `__name__` of the package.
+        exports (Dict[str, Tuple[str, str|None]]): Exported name to the relative module that provides it, and the attribute within that module. An attribute of
+            `None` exports the module itself.
+
+    Returns:
+        Tuple[Callable, Callable]: The `__getattr__` and `__dir__` functions.
+    '''
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module_name, attribute = exports[name]
+        except KeyError:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}') from None
+        module = importlib.import_module(module_name, package)
+        value = module if attribute is None else getattr(module, attribute)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
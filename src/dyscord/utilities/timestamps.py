@@ -0,0 +1,48 @@
+'''Parsing of the ISO 8601 timestamps Discord sends, such as `2021-10-18T07:29:59.855000+00:00`.'''
+import datetime
+import functools
+import re
+
+_fromisoformat = datetime.datetime.fromisoformat
+_FRACTION = re.compile(r'\.(\d+)')
+
+
+def _normalize(value: str) -> str:
+    '''Rewrite forms older `fromisoformat` rejects: a `Z` suffix, and fractions that are not 3 or 6 digits long.'''
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return _FRACTION.sub(lambda match: '.' + match.group(1)[:6].ljust(6, '0'), value, count=1)
+
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    '''Parse a Discord timestamp into an aware `datetime`.
+
+    `datetime.fromisoformat` is implemented in C and handles the usual form directly, so it is tried first. Forms it rejects on older Pythons are normalized
+    and parsed again.
+
+    Arguments:
+        value (str): ISO 8601 timestamp from a payload.
+
+    Returns:
+        datetime: The parsed timestamp.
+    '''
+    try:
+        return _fromisoformat(value)
+    except ValueError:
+        return _fromisoformat(_normalize(value))
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_timestamp_cached(value: str) -> datetime.datetime:
+    '''Parse a Discord timestamp, remembering the most recent results.
+
+    Use it for values that repeat, such as `joined_at` on every update and message of a member. Repeats return the same `datetime` instance, so objects
+    holding them share it. `parse_timestamp_cached.cache_info()` reports hits and misses.
+
+    Arguments:
+        value (str): ISO 8601 timestamp from a payload.
+
+    Returns:
+        datetime: The parsed timestamp.
+    '''
+    return parse_timestamp(value)
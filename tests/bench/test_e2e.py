@@ -0,0 +1,30 @@
+import pytest
+
+from src.dyscord.bench import e2e
+from src.dyscord.bench.__main__ import main
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('workload', e2e.WORKLOADS)
+async def test_workloads(workload):
+    result = await e2e.run_workload(workload, count=50, timeout=30)
+
+    assert result['timed_out'] is False
+    assert result['handled'] == 50
+    assert result['events_per_second'] > 0
+    assert 0 <= result['latency_p50_ms'] <= result['latency_p99_ms']
+    if workload == 'slash':
+        assert result['ack_p50_ms'] <= result['ack_p99_ms']
+    else:
+        assert result['ack_p50_ms'] is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_workload():
+    with pytest.raises(ValueError):
+        await e2e.run_workload('nope')
+
+
+def test_cli(capsys):
+    assert main(['e2e', '--workload', 'presence', '--count', '20', '--json']) == 0
+    assert '"workload": "presence"' in capsys.readouterr().out
@@ -0,0 +1,37 @@
+import pytest
+
+from src.dyscord.bench import imports
+from src.dyscord.bench.__main__ import main
+
+
+def test_package_import_is_light():
+    row, = imports.run(cases=['package'], runs=1)
+
+    assert row['case'] == 'package'
+    assert row['loaded'] == '-'
+    assert row['unexpected'] == '-'
+    assert row['best_ms'] > 0
+
+
+def test_objects_defer_optional_dependencies():
+    row, = imports.run(cases=['objects'], runs=1, budgets={})
+
+    for module in ('emoji', 'httpx', 'validators'):
+        assert module not in row['loaded'].split()
+    assert row['over_budget'] is False
+
+
+def test_budget():
+    row, = imports.run(cases=['package'], runs=1, budgets={'package': 0.0})
+    assert row['over_budget'] is True
+
+
+def test_unknown_case():
+    with pytest.raises(ValueError):
+        imports.run(cases=['nope'])
+
+
+def test_cli_budget(capsys):
+    assert main(['imports', '--case', 'package', '--runs', '1', '--budget', 'package=100000']) == 0
+    assert main(['imports', '--case', 'package', '--runs', '1', '--budget', 'package=0']) == 1
+    assert 'best_ms' in capsys.readouterr().out
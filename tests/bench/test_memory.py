@@ -0,0 +1,51 @@
+import pytest
+
+from src.dyscord.bench import memory
+from src.dyscord.bench.__main__ import main
+
+
+def test_run_small():
+    results = memory.run(scale='small', populations=['snowflake', 'message'])
+
+    assert list(results) == ['snowflake', 'message']
+    assert results['snowflake']['objects'] == memory.SCALES['small']['snowflake']
+    for result in results.values():
+        assert result['bytes_per_object'] > 0
+        assert result['heap_mb'] >= result['total_mb']
+
+    # Populations stay alive, so the heap only grows.
+    assert results['message']['heap_mb'] > results['snowflake']['heap_mb']
+    assert results['message']['bytes_per_object'] > results['snowflake']['bytes_per_object']
+
+
+def test_unknown_population():
+    with pytest.raises(ValueError):
+        memory.run(scale='small', populations=['nope'])
+
+
+def test_compare():
+    baseline = {'results': {
+        'steady': {'bytes_per_object': 100.0},
+        'bigger': {'bytes_per_object': 100.0},
+    }}
+    results = {
+        'steady': {'objects': 10, 'bytes_per_object': 103.0},
+        'bigger': {'objects': 10, 'bytes_per_object': 120.0},
+        'new': {'objects': 10, 'bytes_per_object': 1.0},
+    }
+    rows = {row['population']: row for row in memory.compare(results, baseline, tolerance=0.05)}
+
+    assert rows['steady']['regressed'] is False
+    assert rows['bigger']['regressed'] is True
+    assert rows['new']['regressed'] is False
+    assert rows['new']['bytes_ratio'] is None
+
+
+def test_cli_compare(tmp_path, capsys):
+    path = str(tmp_path / 'baseline.json')
+    arguments = ['memory', '--scale', 'small', '--population', 'role']
+
+    assert main(arguments + ['--save', path]) == 0
+    assert main(arguments + ['--compare', path, '--tolerance', '0.5']) == 0
+    assert main(['memory', '--scale', 'large', '--population', 'role', '--compare', path]) == 2
+    assert 'bytes_per_object' in capsys.readouterr().out
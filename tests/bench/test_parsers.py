@@ -0,0 +1,87 @@
+import pytest
+
+from src.dyscord.bench import parsers
+from src.dyscord.bench.__main__ import main
+from src.dyscord.objects import Message
+from src.dyscord.objects.base_object import BaseDiscordObject
+from src.dyscord.objects.interactions import Interaction
+
+
+def test_run_small():
+    results = parsers.run(scale='small', cases=['message_rich', 'channel'], min_time=0.01, rounds=1)
+
+    assert set(results) == {'message_rich', 'channel'}
+    for result in results.values():
+        assert result['ops_per_second'] > 0
+        assert result['blocks_per_call'] > 0
+        assert result['bytes_per_call'] > 0
+
+    # A rich message holds far more than a bare channel.
+    assert results['message_rich']['bytes_per_call'] > results['channel']['bytes_per_call']
+
+
+def test_all_cases_parse():
+    for name, (parse, payload) in parsers.build_cases('small').items():
+        assert parse(payload) is not None, name
+
+
+def test_unknown_case():
+    with pytest.raises(ValueError):
+        parsers.run(scale='small', cases=['nope'])
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    results = {'case': {'ops_per_second': 100.0, 'blocks_per_call': 10.0, 'bytes_per_call': 1000.0}}
+    parsers.save_baseline(path, results, 'small')
+
+    baseline = parsers.load_baseline(path)
+    assert baseline['scale'] == 'small'
+    assert baseline['results'] == results
+
+
+def test_compare():
+    baseline = {'results': {
+        'steady': {'ops_per_second': 100.0, 'blocks_per_call': 10.0, 'bytes_per_call': 1000.0},
+        'slower': {'ops_per_second': 100.0, 'blocks_per_call': 10.0, 'bytes_per_call': 1000.0},
+        'bigger': {'ops_per_second': 100.0, 'blocks_per_call': 10.0, 'bytes_per_call': 1000.0},
+    }}
+    results = {
+        'steady': {'ops_per_second': 95.0, 'blocks_per_call': 10.0, 'bytes_per_call': 1050.0},
+        'slower': {'ops_per_second': 50.0, 'blocks_per_call': 10.0, 'bytes_per_call': 1000.0},
+        'bigger': {'ops_per_second': 100.0, 'blocks_per_call': 20.0, 'bytes_per_call': 2000.0},
+        'new': {'ops_per_second': 1.0, 'blocks_per_call': 1.0, 'bytes_per_call': 1.0},
+    }
+    rows = {row['case']: row for row in parsers.compare(results, baseline, tolerance=0.15)}
+
+    assert rows['steady']['regressed'] is False
+    assert rows['slower']['regressed'] is True
+    assert rows['bigger']['regressed'] is True
+    assert rows['new']['regressed'] is False
+    assert rows['new']['speed_ratio'] is None
+
+
+def test_cli_compare(tmp_path, capsys):
+    path = str(tmp_path / 'baseline.json')
+    arguments = ['parsers', '--scale', 'small', '--case', 'channel', '--min-time', '0.01', '--rounds', '1']
+
+    assert main(arguments + ['--save', path]) == 0
+    assert main(arguments + ['--compare', path, '--tolerance', '100']) == 0
+    assert main(['parsers', '--scale', 'large', '--case', 'channel', '--compare', path]) == 2
+    assert 'speed_ratio' in capsys.readouterr().out
+
+
+def test_run_generic_restores_generated():
+    generated = BaseDiscordObject._auto_dict
+    results = parsers.run(scale='small', cases=['activity'], min_time=0.01, rounds=1, generic=True)
+
+    assert results['activity']['ops_per_second'] > 0
+    assert BaseDiscordObject._auto_dict is generated
+
+
+def test_run_lazy_restores_eager():
+    results = parsers.run(scale='small', cases=['message_handler'], min_time=0.01, rounds=1, lazy=True)
+
+    assert results['message_handler']['ops_per_second'] > 0
+    assert Message.lazy_parsing is False
+    assert Interaction.lazy_parsing is False
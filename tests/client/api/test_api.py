@@ -1,3 +1,5 @@
+import asyncio
+import time
 from importlib import reload
 from unittest.mock import sentinel, Mock
 
@@ -12,15 +14,13 @@ from ...fixtures import mock_httpx  # noqa: F401
 @pytest.fixture
 def fresh_api():
     reload(api_v9)
-    api_v9.API_V9.TOKEN = sentinel.TOKEN
-    api_v9.API_V9.APPLICATION_ID = sentinel.APPLICATION_ID
-    yield api_v9.API_V9
+    yield api_v9.API_V9(sentinel.TOKEN, sentinel.APPLICATION_ID)
 
 
 @pytest.mark.asyncio
 async def test_get_gateway_bot(mock_httpx, fresh_api):  # noqa: F811
     fresh_api._auth_header()
-    mock_httpx.return_value.get.return_value.json = Mock(return_value={'url': 'https://example.com/gateway'})
+    mock_httpx.return_value.json = Mock(return_value={'url': 'https://example.com/gateway'})
 
     fake_token = Mock(str)
 
@@ -275,7 +275,8 @@ async def test_delete_followup_message(mock_httpx, fresh_api):  # noqa: F811
     fake_token = Mock(str)
 
     await fresh_api.delete_followup_message(fake_token, fake_id)
-    mock_httpx.return_value.delete.assert_called()
+    mock_httpx.assert_called()
+    assert mock_httpx.call_args.args[0] == 'DELETE'
 
     with pytest.raises(TypeError):
         await fresh_api.delete_followup_message(None, fake_id)
@@ -363,7 +364,135 @@ async def test_create_dm(mock_httpx, fresh_api):  # noqa: F811
     ret = await fresh_api.create_dm(fake_id)
     assert ret == sentinel.JSON_RETURN
 
-    mock_httpx.return_value.post.assert_called()
+    mock_httpx.assert_called()
+    assert mock_httpx.call_args.args[0] == 'POST'
 
     with pytest.raises(TypeError):
         await fresh_api.create_dm(None)
+
+
+@pytest.mark.asyncio
+async def test_instances_share_pool(mock_httpx):  # noqa: F811
+    reload(api_v9)
+    first = api_v9.API_V9('FIRST', '1')
+    second = api_v9.API_V9('SECOND', '2')
+
+    await first.get_current_user()
+    assert mock_httpx.call_args.kwargs['headers']['Authorization'] == 'Bot FIRST'
+    await second.get_current_user()
+    assert mock_httpx.call_args.kwargs['headers']['Authorization'] == 'Bot SECOND'
+
+    await first.get_global_application_commands()
+    assert mock_httpx.call_args.args[1].endswith('/applications/1/commands')
+    await second.get_global_application_commands()
+    assert mock_httpx.call_args.args[1].endswith('/applications/2/commands')
+
+    assert first._buckets is not second._buckets
+    assert first.pool() is second.pool()
+
+
+@pytest.mark.asyncio
+async def test_cache_namespaces(mock_httpx):  # noqa: F811
+    reload(api_v9)
+    first = api_v9.API_V9('FIRST', '1')
+    second = api_v9.API_V9('SECOND', '2')
+
+    await first.get_user('1234')
+    await first.get_user('1234')
+    assert mock_httpx.call_count == 1
+
+    await second.get_user('1234')
+    assert mock_httpx.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_class_level_calls_use_active_instance(mock_httpx):  # noqa: F811
+    reload(api_v9)
+    first = api_v9.API_V9('FIRST', '1')
+    second = api_v9.API_V9('SECOND', '2')
+
+    async def call_as(instance):
+        instance.activate()
+        await api_v9.API_V9.get_current_user()
+        return mock_httpx.call_args.kwargs['headers']['Authorization']
+
+    assert await asyncio.create_task(call_as(first)) == 'Bot FIRST'
+    assert await asyncio.create_task(call_as(second)) == 'Bot SECOND'
+
+
+@pytest.mark.asyncio
+async def test_class_level_calls_without_context_never_borrow_a_token(mock_httpx):  # noqa: F811
+    reload(api_v9)
+    first = api_v9.API_V9('FIRST', '1')
+    second = api_v9.API_V9('SECOND', '2')
+
+    async def activate(instance):
+        instance.activate()
+
+    await asyncio.create_task(activate(first))
+    await api_v9.API_V9.get_current_user()
+    assert mock_httpx.call_args.kwargs['headers']['Authorization'] == 'Bot FIRST'
+
+    await asyncio.create_task(activate(second))
+    mock_httpx.reset_mock()
+    with pytest.raises(RuntimeError):
+        await api_v9.API_V9.get_current_user()
+    mock_httpx.assert_not_called()
+
+    api_v9.API_V9.set_default(second)
+    await api_v9.API_V9.get_current_user()
+    assert mock_httpx.call_args.kwargs['headers']['Authorization'] == 'Bot SECOND'
+
+
+@pytest.mark.asyncio
+async def test_retry_on_429(mock_httpx, fresh_api):  # noqa: F811
+    limited = Mock()
+    limited.status_code = 429
+    limited.headers = {'retry-after': '0', 'x-ratelimit-global': 'true'}
+    limited.json = Mock(return_value={'retry_after': 0.01, 'global': True})
+
+    mock_httpx.side_effect = [limited, mock_httpx.return_value]
+
+    ret = await fresh_api.get_current_user()
+    assert ret == sentinel.JSON_RETURN
+    assert mock_httpx.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_bucket_exhaustion_waits(mock_httpx, fresh_api):  # noqa: F811
+    mock_httpx.return_value.headers = {
+        'x-ratelimit-remaining': '0',
+        'x-ratelimit-reset-after': '0.05',
+        'x-ratelimit-bucket': 'abcd',
+    }
+
+    await fresh_api.get_current_user()
+    start = time.monotonic()
+    await fresh_api.get_current_user()
+    assert time.monotonic() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_bucket_refills_to_known_limit():
+    bucket = api_v9._RateLimitBucket()
+    bucket.update({'x-ratelimit-limit': '2', 'x-ratelimit-remaining': '0', 'x-ratelimit-reset-after': '0.02'})
+
+    await bucket.acquire(Mock())
+    assert bucket.remaining == 1
+    await bucket.acquire(Mock())
+    assert bucket.remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_bucket_of_unknown_size_lets_one_request_through():
+    bucket = api_v9._RateLimitBucket()
+    bucket.update({'x-ratelimit-remaining': '0', 'x-ratelimit-reset-after': '0.01'})
+
+    await bucket.acquire(Mock())
+    waiter = asyncio.create_task(bucket.acquire(Mock()))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    bucket.update({'x-ratelimit-remaining': '3', 'x-ratelimit-reset-after': '1'})
+    await asyncio.wait_for(waiter, 1)
+    assert bucket.remaining == 2
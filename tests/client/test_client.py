@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import pytest
 import json
 from importlib import reload
+from unittest.mock import AsyncMock
 
 from src.dyscord.client import discord_client
 from src.dyscord.client import enumerations
 
-from tests.fixtures.fixtures import mock_api, mock_websocket  # noqa
+from tests.fixtures.fixtures import mock_api, mock_httpx, mock_websocket  # noqa
 
 # from ..objects.ready import samples as ready_samples
 
@@ -43,20 +45,155 @@ def test_reloading():
     assert not hasattr(discord_client.DiscordClient, 'token')
 
     x = discord_client.DiscordClient('foo')
-    assert hasattr(discord_client.DiscordClient, 'token')
+    assert not hasattr(discord_client.DiscordClient, 'token')
     assert hasattr(x, 'token')
 
     reload(discord_client)
     assert not hasattr(discord_client.DiscordClient, 'token')
 
 
+def test_instance_isolation():
+
+    x = discord_client.DiscordClient('foo', '1234')
+    y = discord_client.DiscordClient('bar', '5678')
+
+    assert x.token == 'foo'
+    assert y.token == 'bar'
+    assert x.application_id != y.application_id
+
+    x.ready = True
+    x.session_id = 'session'
+    x._sequence_number = 42
+    assert y.ready is False
+    assert y.session_id is None
+    assert y._sequence_number is None
+
+    @x.decorate_handler('MESSAGE_CREATE')
+    async def on_message(message):
+        pass
+
+    async def raw_callback(data):
+        pass
+
+    x._register_raw_callback(raw_callback)
+
+    assert len(x._wrapper_registrations['MESSAGE_CREATE']) == 1
+    assert len(y._wrapper_registrations['MESSAGE_CREATE']) == 0
+    assert len(x._raw_callbacks) == 1
+    assert len(y._raw_callbacks) == 0
+    assert x._reconnect_lock is not y._reconnect_lock
+
+
+@pytest.mark.asyncio
+async def test_start_and_close():
+
+    x = discord_client.DiscordClient('foo')
+    x.set_all_intents()
+    x._connect = AsyncMock()
+
+    task = asyncio.create_task(x.start())
+    await asyncio.sleep(0.1)
+    assert not task.done()
+
+    await x.close()
+    await asyncio.wait_for(task, 5)
+    x._connect.assert_awaited_once()
+
+
+def test_run_on_stock_loop():
+
+    x = discord_client.DiscordClient('foo')
+    x.set_all_intents()
+
+    async def connect():
+        asyncio.get_running_loop().call_later(0.1, lambda: asyncio.ensure_future(x.close()))
+
+    x._connect = connect
+    loop = asyncio.new_event_loop()
+    try:
+        x.run(loop=loop)
+        assert not loop.is_closed()
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize('use_uvloop', [False, True])
+def test_gateway_heartbeat_and_rest_on_loop(mock_websocket, mock_httpx, use_uvloop):  # noqa: F811
+    '''Drive a full connect on a fresh loop, with stock asyncio and with uvloop.'''
+    uvloop = pytest.importorskip('uvloop') if use_uvloop else None
+
+    mock_httpx.return_value.json.return_value = {'url': 'wss://gateway.example'}
+    sent = list()
+    loops = list()
+
+    async def send(raw):
+        data = json.loads(raw)
+        sent.append(data)
+        if data['op'] == 1:
+            await inbox.put(json.dumps({'t': None, 's': None, 'op': 11, 'd': None}))
+
+    async def recv():
+        return await inbox.get()
+
+    websocket = mock_websocket.connect.return_value.__aenter__.return_value
+    websocket.send = AsyncMock(side_effect=send)
+    websocket.recv = AsyncMock(side_effect=recv)
+
+    x = discord_client.DiscordClient('foo')
+    x.set_all_intents()
+
+    async def stop_after_identify():
+        while not any(data['op'] == 2 for data in sent) or len([data for data in sent if data['op'] == 1]) < 3:
+            await asyncio.sleep(0.01)
+        await x.close()
+
+    def loop_factory():
+        loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        loops.append(loop)
+        return loop
+
+    async def connect(is_reconnect=False):
+        nonlocal inbox
+        inbox = asyncio.Queue()
+        await inbox.put(json.dumps({'t': None, 's': None, 'op': 10, 'd': {'heartbeat_interval': 50}}))
+        asyncio.ensure_future(stop_after_identify())
+        await real_connect(is_reconnect)
+
+    inbox = None
+    real_connect = x._connect
+    x._connect = connect
+
+    x.run(loop_factory=loop_factory)
+
+    if uvloop is not None:
+        assert isinstance(loops[0], uvloop.Loop)
+    else:
+        assert isinstance(loops[0], asyncio.BaseEventLoop)
+    assert loops[0].is_closed()
+    mock_httpx.assert_called()
+    assert mock_websocket.connect.call_args.args[0].startswith('wss://gateway.example')
+    assert [data['op'] for data in sent].count(2) == 1
+    assert [data['op'] for data in sent].count(1) >= 3
+
+
+def test_run_loop_arguments():
+
+    x = discord_client.DiscordClient('foo')
+
+    with pytest.raises(ValueError):
+        x.run(loop=asyncio.new_event_loop(), loop_factory=asyncio.new_event_loop)
+
+    with pytest.raises(ValueError):
+        x.run(loop_factory=asyncio.new_event_loop, use_uvloop=True)
+
+
 @pytest.mark.asyncio
 async def test_bad_event(caplog):
 
     caplog.set_level(logging.DEBUG)
 
     x = discord_client.DiscordClient('foo')
-    discord_client.DiscordClient.ready = True
+    x.ready = True
 
     await x._event_dispatcher({'d': None, 't': 'ILLEGAL TYPE'})
 
@@ -132,3 +269,70 @@ async def test_every_event():
     await client.on_voice_state_update(None, None)
     await client.on_webhooks_update(None, None)
     await client.on_interaction_create(None, None)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_fills_cache():
+    from src.dyscord.utilities import Cache
+    from ..objects.guild import samples as guild_samples
+    from ..objects.message import samples as message_samples
+    from ..objects.ready import samples as ready_samples
+
+    client = discord_client.DiscordClient('foo')
+    client.cache.clear()
+    guild_dict = guild_samples.my_test_server['d']
+    try:
+        await client._event_dispatcher({'t': 'READY', 'd': ready_samples.example_connect})
+        assert client.cache.get_user(ready_samples.example_connect['user']['id']) is client.me
+
+        await client._event_dispatcher({'t': 'GUILD_CREATE', 'd': guild_dict})
+        guild = client.cache.get_guild(guild_dict['id'])
+        assert guild.name == guild_dict['name']
+
+        await client._event_dispatcher({'t': 'GUILD_UPDATE', 'd': dict(guild_dict, name='Renamed', channels=[])})
+        assert client.cache.get_guild(guild_dict['id']) is guild
+        assert guild.name == 'Renamed'
+
+        await client._event_dispatcher({'t': 'MESSAGE_CREATE', 'd': message_samples.short_message})
+        message = client.cache.get_message(message_samples.short_message['id'])
+        assert message.channel is client.cache.get_channel(message_samples.short_message['channel_id'])
+        assert message.guild is guild
+
+        received = []
+        client._wrapper_registrations['MESSAGE_UPDATE'].append(lambda obj: received.append(obj))
+        client._wrapper_registrations['MESSAGE_DELETE'].append(lambda obj: received.append(obj))
+        client._wrapper_registrations['MESSAGE_DELETE_BULK'].append(lambda obj: received.append(obj))
+
+        update = dict(message_samples.short_message_update, id=message_samples.short_message['id'], content='edited')
+        await client._event_dispatcher({'t': 'MESSAGE_UPDATE', 'd': update})
+        assert message.flags == 32
+        assert received[-1].cached is message
+        assert received[-1].changes['content'] == (message_samples.short_message['content'], 'edited')
+
+        await client._event_dispatcher({'t': 'MESSAGE_DELETE', 'd': {'id': message_samples.short_message['id'], 'channel_id': message.channel_id}})
+        assert client.cache.get_message(message.id) is None
+        assert received[-1] is message
+
+        await client._event_dispatcher({'t': 'MESSAGE_CREATE', 'd': message_samples.short_message})
+        await client._event_dispatcher({'t': 'MESSAGE_DELETE_BULK', 'd': {'ids': [message_samples.short_message['id'], '1'], 'channel_id': str(message.channel_id)}})
+        assert received[-1].ids == [message.id, 1]
+        assert [deleted.id for deleted in received[-1].messages] == [message.id]
+
+        member = guild_dict['members'][0]
+        await client._event_dispatcher({'t': 'GUILD_MEMBER_REMOVE', 'd': {'guild_id': guild_dict['id'], 'user': member['user']}})
+        assert client.cache.get_member(guild_dict['id'], member['user']['id']) is None
+        await client._event_dispatcher({'t': 'GUILD_MEMBER_ADD', 'd': dict(member, guild_id=guild_dict['id'])})
+        assert client.cache.get_member(guild_dict['id'], member['user']['id']).username == member['user']['username']
+
+        await client._event_dispatcher({'t': 'GUILD_DELETE', 'd': {'id': guild_dict['id'], 'unavailable': True}})
+        assert client.cache.get_guild(guild_dict['id']) is guild
+        assert guild.unavailable is True
+        recovered = {key: value for key, value in guild_dict.items() if key != 'unavailable'}
+        await client._event_dispatcher({'t': 'GUILD_CREATE', 'd': recovered})
+        assert client.cache.get_guild(guild_dict['id']) is guild
+        assert guild.unavailable is False
+
+        await client._event_dispatcher({'t': 'GUILD_DELETE', 'd': {'id': guild_dict['id']}})
+        assert Cache().get_guild(guild_dict['id']) is None
+    finally:
+        client.cache.clear()
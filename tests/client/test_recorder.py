@@ -0,0 +1,126 @@
+import gzip
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.dyscord.client import discord_client
+from src.dyscord.client.recorder import GatewayRecorder, GatewayReplayer, read_recording
+
+
+def _frames(count):
+    frames = [{'t': None, 's': None, 'op': 10, 'd': {'heartbeat_interval': 41250}}]
+    for i in range(count):
+        frames.append({'t': 'TYPING_START', 's': i + 1, 'op': 0, 'd': {'channel_id': '1', 'user_id': '2', 'timestamp': 1}})
+    frames.append({'t': None, 's': None, 'op': 11, 'd': None})
+    return frames
+
+
+@pytest.mark.asyncio
+async def test_record_from_client(tmp_path):
+    path = tmp_path / 'gateway.jsonl.gz'
+    client = discord_client.DiscordClient('foo')
+
+    with GatewayRecorder(str(path)).attach(client) as recorder:
+        for frame in _frames(3):
+            for callback in client._raw_callbacks:
+                await callback(frame)
+
+    assert recorder.frames == 5
+    records = list(read_recording(str(path)))
+    assert [frame for _, frame in records] == _frames(3)
+    assert all(abs(ts - time.time()) < 60 for ts, _ in records)
+
+
+def test_append_across_sessions(tmp_path):
+    path = str(tmp_path / 'gateway.jsonl.gz')
+
+    with GatewayRecorder(path) as recorder:
+        recorder.write({'op': 11}, timestamp=1.0)
+    with GatewayRecorder(path) as recorder:
+        recorder.write({'op': 11}, timestamp=2.0)
+
+    assert [ts for ts, _ in read_recording(path)] == [1.0, 2.0]
+
+
+def test_truncated_recording(tmp_path):
+    path = str(tmp_path / 'gateway.jsonl.gz')
+    with GatewayRecorder(path) as recorder:
+        for frame in _frames(100):
+            recorder.write(frame)
+
+    with open(path, 'rb') as fp:
+        data = fp.read()
+    with open(path, 'wb') as fp:
+        fp.write(data[:len(data) // 2])
+
+    assert len(list(read_recording(path))) < 102
+
+
+@pytest.mark.asyncio
+async def test_replay_as_fast_as_possible(tmp_path):
+    path = str(tmp_path / 'gateway.jsonl.gz')
+    with GatewayRecorder(path) as recorder:
+        for i, frame in enumerate(_frames(10)):
+            recorder.write(frame, timestamp=1000.0 + i * 100)
+
+    client = discord_client.DiscordClient('foo')
+    client._event_dispatcher = AsyncMock()
+
+    stats = await GatewayReplayer(path, speed=None).replay(client, assume_ready=True)
+
+    assert stats['frames'] == 12
+    assert stats['events'] == 10
+    assert stats['elapsed'] < 5
+    assert client._event_dispatcher.await_count == 10
+    assert client._sequence_number == 10
+    assert client.ready
+
+
+@pytest.mark.asyncio
+async def test_replay_speed(tmp_path):
+    path = str(tmp_path / 'gateway.jsonl.gz')
+    with GatewayRecorder(path) as recorder:
+        for i, frame in enumerate(_frames(2)):
+            recorder.write(frame, timestamp=1000.0 + i)
+
+    client = discord_client.DiscordClient('foo')
+    client._event_dispatcher = AsyncMock()
+
+    stats = await GatewayReplayer(path, speed=20.0).replay(client)
+
+    # Three seconds of recording at twenty times speed.
+    assert 0.14 < stats['elapsed'] < 1.5
+
+
+@pytest.mark.asyncio
+async def test_replay_into_dispatcher(tmp_path):
+    path = str(tmp_path / 'gateway.jsonl.gz')
+    with GatewayRecorder(path) as recorder:
+        for frame in _frames(2):
+            recorder.write(frame)
+
+    client = discord_client.DiscordClient('foo')
+    seen = list()
+
+    @client.decorate_handler('TYPING_START')
+    async def on_typing(typing):
+        seen.append(typing)
+
+    await GatewayReplayer(path, speed=None).replay(client, assume_ready=True)
+
+    assert len(seen) == 2
+
+
+def test_bad_speed():
+    with pytest.raises(ValueError):
+        GatewayReplayer('foo', speed=0)
+
+
+def test_file_is_gzip(tmp_path):
+    path = str(tmp_path / 'gateway.jsonl.gz')
+    with GatewayRecorder(path) as recorder:
+        recorder.write({'op': 11})
+
+    with gzip.open(path, 'rb') as fp:
+        assert fp.read().endswith(b'\n')
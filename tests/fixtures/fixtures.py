@@ -26,41 +26,14 @@ def mock_api():
 
 @pytest.fixture
 def mock_httpx():
-    with patch('httpx.AsyncClient.__aenter__', spec=True) as mock:
-        mock.return_value.patch.return_value.raise_for_status = Mock()
-        mock.return_value.patch.return_value.headers = dict(
+    with patch('httpx.AsyncClient.request', new_callable=AsyncMock) as mock:
+        mock.return_value.status_code = 200
+        mock.return_value.raise_for_status = Mock()
+        mock.return_value.headers = dict(
             {
                 'x-ratelimit-reset': datetime.datetime.now().timestamp(),
                 'x-ratelimit-remaining': 1,
             }
         )
-        mock.return_value.patch.return_value.json = Mock(return_value=sentinel.JSON_RETURN)
-        mock.return_value.patch.return_value.raise_for_status = Mock()
-
-        mock.return_value.delete.return_value.raise_for_status = Mock()
-        mock.return_value.delete.return_value.headers = dict(
-            {
-                'x-ratelimit-reset': datetime.datetime.now().timestamp(),
-                'x-ratelimit-remaining': 1,
-            }
-        )
-        mock.return_value.delete.return_value.json = Mock(return_value=sentinel.JSON_RETURN)
-
-        mock.return_value.post.return_value.raise_for_status = Mock()
-        mock.return_value.post.return_value.headers = dict(
-            {
-                'x-ratelimit-reset': datetime.datetime.now().timestamp(),
-                'x-ratelimit-remaining': 1,
-            }
-        )
-        mock.return_value.post.return_value.json = Mock(return_value=sentinel.JSON_RETURN)
-
-        mock.return_value.get.return_value.raise_for_status = Mock()
-        mock.return_value.get.return_value.headers = dict(
-            {
-                'x-ratelimit-reset': datetime.datetime.now().timestamp(),
-                'x-ratelimit-remaining': 1,
-            }
-        )
-        mock.return_value.get.return_value.json = Mock(return_value=sentinel.JSON_RETURN)
+        mock.return_value.json = Mock(return_value=sentinel.JSON_RETURN)
         yield mock
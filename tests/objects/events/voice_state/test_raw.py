@@ -1,3 +1,4 @@
+from src.dyscord.objects import Member, User
 from src.dyscord.objects.events import VoiceState
 
 from . import samples
@@ -20,3 +21,15 @@ def test_raw_samples():
                 continue
             assert hasattr(obj, key)
             assert (getattr(obj, key) is not None) or data[key] is None
+
+
+def test_member_is_shared():
+    data = next(sample['d'] for sample in samples.raw_voice_state_update_samples if sample['d'].get('member'))
+    User.enable_identity_map()
+    try:
+        first = VoiceState(data)
+        assert isinstance(first.member, Member)
+        assert first.member is VoiceState(data).member
+        assert first.member is Member.canonical(data['member'], first.guild_id)
+    finally:
+        User.disable_identity_map()
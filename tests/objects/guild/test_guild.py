@@ -3,6 +3,8 @@ import random
 
 from src.dyscord.objects import Guild
 
+from . import samples
+
 
 def test_simple_guild():
 
@@ -55,3 +57,30 @@ def test_str():
 
     assert str(obj) == 'Guild()'
     assert obj.__str__() == obj.__repr__()
+
+
+def test_apply_update():
+    guild = Guild().from_dict(samples.my_test_server['d'])
+    channels = list(guild.channels)
+
+    changes = guild.apply_update({'id': samples.my_test_server['d']['id'], 'name': 'Renamed', 'icon': samples.my_test_server['d']['icon'], 'owner': True})
+
+    assert set(changes) == {'name', 'am_owner'}
+    assert changes['name'] == (samples.my_test_server['d']['name'], 'Renamed')
+    assert guild.name == 'Renamed'
+    assert guild.channels == channels
+
+
+def test_apply_update_merges_channels():
+    data = samples.my_test_server['d']
+    guild = Guild().from_dict(data)
+    general = next(channel for channel in guild.channels if channel.name == 'general')
+
+    renamed = [dict(channel, name='renamed') if channel['id'] == str(general.id) else channel for channel in data['channels']]
+    assert guild.apply_update({'channels': renamed}) == {}
+    assert general.name == 'renamed'
+    assert general in guild.channels
+
+    changes = guild.apply_update({'channels': renamed[1:]})
+    assert len(changes['channels'][0]) == len(renamed)
+    assert len(guild.channels) == len(renamed) - 1
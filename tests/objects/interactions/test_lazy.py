@@ -0,0 +1,55 @@
+import pytest
+
+from src.dyscord.objects import Member, Message, Snowflake
+from src.dyscord.objects.interactions import Interaction
+from src.dyscord.objects.interactions.interaction import InteractionData
+
+from . import samples
+
+
+@pytest.fixture
+def lazy(monkeypatch):
+    monkeypatch.setattr(Interaction, 'lazy_parsing', True)
+
+
+def test_response_fields_parsed_up_front(lazy):
+    data = samples.button_press_interaction
+    obj = Interaction().from_dict(data)
+
+    assert obj.id == Snowflake(data['id'])
+    assert obj.token == data['token']
+    assert 'data' not in vars(obj)
+    assert obj.can_respond
+
+
+def test_fields_parsed_once_on_access(lazy):
+    data = samples.button_press_interaction
+    obj = Interaction().from_dict(data)
+
+    assert isinstance(obj.data, InteractionData)
+    assert obj.data is obj.data
+    assert isinstance(obj.member, Member)
+    assert isinstance(obj.message, Message)
+    assert obj.guild_id == Snowflake(data['guild_id'])
+
+
+def test_missing_fields_raise(lazy):
+    data = dict(samples.button_press_interaction)
+    del data['message']
+    obj = Interaction().from_dict(data)
+
+    assert not hasattr(obj, 'message')
+    assert not hasattr(obj, 'user')
+
+
+def test_lazy_matches_eager(monkeypatch):
+    data = samples.trigger_chat
+    eager = Interaction().from_dict(data)
+    monkeypatch.setattr(Interaction, 'lazy_parsing', True)
+    lazy = Interaction().from_dict(data)
+
+    assert lazy.guild_id == eager.guild_id
+    assert lazy.channel_id == eager.channel_id
+    assert lazy.member.id == eager.member.id
+    assert lazy.data.name == eager.data.name
+    assert set(lazy.data.options) == set(eager.data.options)
@@ -1,8 +1,8 @@
 import pytest
-import nest_asyncio  # type: ignore
 from unittest.mock import AsyncMock, patch
 
-from src.dyscord.objects import Message
+from src.dyscord.objects import Message, Guild
+from src.dyscord.objects.channel import Channel
 
 from . import samples
 from ..guild import samples as guild_samples
@@ -14,11 +14,29 @@ from ..channel import samples as channel_samples
 async def test_text_interaction(api_mock):
     api_mock.get_guild = AsyncMock(return_value=guild_samples.discord_dev_example)
     api_mock.get_channel = AsyncMock(return_value=channel_samples.dev_guild_text)
-    nest_asyncio.apply()
 
     obj = Message().from_dict(samples.short_message)
-    obj.guild
-    obj.channel
+    assert obj.guild is None
+    assert obj.channel is None
+
+    guild = await obj.fetch_guild()
+    channel = await obj.fetch_channel()
 
     api_mock.get_guild.assert_called()
     api_mock.get_channel.assert_called()
+    assert isinstance(guild, Guild)
+    assert isinstance(channel, Channel)
+    assert obj.guild is guild
+    assert obj.channel is channel
+
+
+@pytest.mark.asyncio
+@patch('src.dyscord.client.api.API')
+async def test_fetch_is_memoized(api_mock):
+    api_mock.get_channel = AsyncMock(return_value=channel_samples.dev_guild_text)
+
+    obj = Message().from_dict(samples.short_message)
+    await obj.fetch_channel()
+    await obj.fetch_channel()
+
+    api_mock.get_channel.assert_called_once()
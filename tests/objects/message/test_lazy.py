@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+
+from src.dyscord.objects import Message, MessageUpdate, User
+from src.dyscord.objects.base_object import BaseDiscordObject
+
+from . import samples
+
+
+FIELDS = ['id', 'channel_id', 'guild_id', 'author', 'member', 'content', 'timestamp', 'edited_timestamp', 'tts', 'mention_everyone', 'mentions',
+          'attachments', 'embeds', 'nonce', 'pinned', 'webhook_id', 'type', 'message_reference', 'flags', 'referenced_message', 'components']
+
+
+def _summary(value):
+    if isinstance(value, list):
+        return [_summary(item) for item in value]
+    if isinstance(value, (Message, User)) or hasattr(value, 'message_id'):
+        return getattr(value, 'id', None) or getattr(value, 'message_id', None)
+    return value
+
+
+@pytest.fixture
+def lazy(monkeypatch):
+    monkeypatch.setattr(Message, 'lazy_parsing', True)
+
+
+@pytest.mark.parametrize('name', ['short_message', 'self_and_role_mention', 'direct_message', 'message_from_a_thread', 'message_reply'])
+def test_lazy_matches_eager(name, monkeypatch):
+    data = getattr(samples, name)
+    eager = Message().from_dict(data)
+    monkeypatch.setattr(Message, 'lazy_parsing', True)
+    lazy = Message().from_dict(data)
+
+    for field in FIELDS:
+        assert _summary(getattr(lazy, field)) == _summary(getattr(eager, field)), field
+
+
+def test_fields_parsed_once_on_access(lazy):
+    obj = Message().from_dict(samples.short_message)
+
+    # Only the mandatory fields are parsed up front.
+    assert obj._raw is samples.short_message
+    with pytest.raises(AttributeError):
+        object.__getattribute__(obj, 'author')
+
+    author = obj.author
+    assert isinstance(author, User)
+    assert obj.author is author
+    assert object.__getattribute__(obj, 'author') is author
+
+
+def test_member_reads_author(lazy):
+    obj = Message().from_dict(samples.self_and_role_mention)
+    assert obj.member.id == obj.author.id
+
+
+def test_missing_fields_read_default(lazy):
+    obj = MessageUpdate().from_dict({'id': '1', 'channel_id': '2', 'content': 'edited'})
+    assert obj.content == 'edited'
+    assert obj.author is None
+    assert obj.referenced_message is None
+    with pytest.raises(AttributeError):
+        obj.not_a_field
+
+
+def test_assignment_wins_over_payload(lazy):
+    obj = Message().from_dict(samples.short_message)
+    obj.content = 'replaced'
+    assert obj.content == 'replaced'
+
+
+def test_nested_reply_is_lazy(lazy):
+    obj = Message().from_dict(samples.message_reply)
+    assert obj.referenced_message._raw is samples.message_reply['referenced_message']
+
+
+def test_lazy_timestamps(monkeypatch):
+    eager = Message().from_dict(samples.message_reply)
+    monkeypatch.setattr(BaseDiscordObject, 'lazy_timestamps', True)
+    lazy = Message().from_dict(samples.message_reply)
+
+    assert Message.timestamp.slot.__get__(lazy) == samples.message_reply['timestamp']
+    assert lazy.timestamp == eager.timestamp
+    assert lazy.referenced_message.timestamp == eager.referenced_message.timestamp
+    assert lazy.edited_timestamp is None
+
+
+def test_lazy_timestamps_with_lazy_parsing(monkeypatch, lazy):
+    monkeypatch.setattr(BaseDiscordObject, 'lazy_timestamps', True)
+    obj = Message().from_dict(samples.short_message)
+    assert obj.timestamp == datetime.datetime.fromisoformat(samples.short_message['timestamp'])
@@ -0,0 +1,113 @@
+import copy
+import datetime
+
+from src.dyscord.objects import Message, User
+from src.dyscord.objects.base_object import BaseDiscordObject
+
+from . import samples
+
+
+def test_merge_reports_changed_fields():
+    message = Message().from_dict(samples.short_message)
+    author = message.author
+    update = {'id': samples.short_message['id'], 'channel_id': samples.short_message['channel_id'], 'content': 'edited',
+              'edited_timestamp': '2021-09-24T19:24:51.459402+00:00'}
+
+    changes = message.apply_update(update)
+
+    assert set(changes) == {'content', 'edited_timestamp'}
+    assert changes['content'] == (samples.short_message['content'], 'edited')
+    assert changes['edited_timestamp'] == (None, datetime.datetime(2021, 9, 24, 19, 24, 51, 459402, tzinfo=datetime.timezone.utc))
+    assert message.content == 'edited'
+    # Fields missing from the update are untouched.
+    assert message.author is author
+    assert message.timestamp is not None
+
+
+def test_merge_of_same_payload_changes_nothing():
+    message = Message().from_dict(samples.short_message)
+    data = {key: value for key, value in samples.short_message.items() if key not in ('author', 'member', 'mentions')}
+
+    assert message.apply_update(copy.deepcopy(data)) == {}
+
+
+def test_merge_partial_update():
+    message = Message().from_dict(samples.short_message)
+
+    changes = message.apply_update(samples.short_message_update)
+
+    assert changes['flags'] == (samples.short_message.get('flags'), 32)
+    assert message.content == samples.short_message['content']
+
+
+def test_merge_lazy_message(monkeypatch):
+    monkeypatch.setattr(Message, 'lazy_parsing', True)
+    message = Message().from_dict(samples.short_message)
+
+    changes = message.apply_update({'content': 'edited'})
+
+    assert changes == {'content': (samples.short_message['content'], 'edited')}
+    assert message.content == 'edited'
+    assert message.tts == samples.short_message['tts']
+
+
+def test_merge_lazy_timestamps(monkeypatch):
+    monkeypatch.setattr(BaseDiscordObject, 'lazy_timestamps', True)
+    message = Message().from_dict(samples.short_message)
+
+    assert message.apply_update({'timestamp': samples.short_message['timestamp']}) == {}
+    changes = message.apply_update({'edited_timestamp': '2021-09-24T19:24:51.459402+00:00'})
+
+    assert isinstance(changes['edited_timestamp'][1], datetime.datetime)
+
+
+def test_merge_shared_author_unchanged():
+    User.enable_identity_map()
+    try:
+        message = Message().from_dict(samples.short_message)
+        assert 'author' not in message.apply_update({'author': samples.short_message['author']})
+    finally:
+        User.disable_identity_map()
+
+
+def test_merge_keeps_payload_current(monkeypatch):
+    monkeypatch.setattr(Message, 'lazy_parsing', True)
+    data = dict(samples.short_message)
+    message = Message().from_dict(data)
+
+    message.apply_update({'content': 'edited'})
+
+    assert message._raw['content'] == 'edited'
+    assert data['content'] == samples.short_message['content']
+    assert Message().from_dict(message._raw).content == 'edited'
+
+
+def test_merge_nested_author():
+    message = Message().from_dict(samples.short_message)
+    old_author = message.author
+    author = dict(samples.short_message['author'], username='renamed')
+
+    changes = message.apply_update({'author': author})
+
+    assert changes['author'] == (old_author, message.author)
+    assert message.author.username == 'renamed'
+
+
+def test_full_edit_without_identity_map_reports_only_edited_fields():
+    message = Message().from_dict(samples.self_and_role_mention)
+    update = dict(samples.self_and_role_mention, content='edited', edited_timestamp='2021-09-24T19:24:51.459402+00:00')
+
+    changes = message.apply_update(update)
+
+    assert set(changes) == {'content', 'edited_timestamp'}
+
+
+def test_merge_author_into_message_without_one():
+    message = Message().from_dict({'id': '1', 'channel_id': '2', 'content': 'a'})
+
+    changes = message.apply_update({'author': samples.short_message['author'], 'member': samples.short_message['member']})
+
+    assert changes['author'][0] is None
+    assert isinstance(changes['author'][1], User)
+    assert changes['member'][0] is None
+    assert message.member is not None
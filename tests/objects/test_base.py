@@ -1,3 +1,5 @@
+import warnings
+
 import pytest
 
 from src.dyscord.objects.base_object import BaseDiscordObject
@@ -54,3 +56,90 @@ def test_simply_child3():
 
     with pytest.raises(TypeError):
         Child({'test': '1'})
+
+
+def test_generated_parser_matches_generic():
+    class Inner(BaseDiscordObject):
+        value: int = None  # type: ignore
+        _auto_map = {'value': int}
+
+    class Child(BaseDiscordObject):
+        name: str = None  # type: ignore
+        inner: Inner = None  # type: ignore
+        items: list = None  # type: ignore
+        _auto_map = {
+            'name': str,
+            'inner': Inner,
+            'items': [int],
+            'ignored': None,
+            'not-an-identifier': str,
+            'class': str,
+        }
+
+    data = {'name': 5, 'inner': {'value': '3'}, 'items': ['1', '2'], 'ignored': 'x', 'not-an-identifier': 7, 'class': 8}
+    generated = Child()._auto_dict(data)
+    generic = Child()._auto_dict_generic(data)
+
+    assert generated.name == generic.name == '5'
+    assert generated.inner.value == generic.inner.value == 3
+    assert generated.items == generic.items == [1, 2]
+    assert getattr(generated, 'not-an-identifier') == '7'
+    assert getattr(generated, 'class') == '8'
+    assert vars(generated).keys() == vars(generic).keys()
+
+    # None values leave the default in place.
+    assert Child({'name': None}).name is None
+
+
+def test_generated_parser_follows_reassigned_map():
+    class Child(BaseDiscordObject):
+        _auto_map = {'test': str}
+
+    assert Child({'test': 1}).test == '1'
+
+    Child._auto_map = {'test': int}
+    assert Child({'test': '1'}).test == 1
+
+
+def test_non_dict_map_uses_generic_path():
+    class Child(BaseDiscordObject):
+        @property
+        def _auto_map(self):
+            return {'test': int}
+
+    assert Child._auto_parser is None
+    assert Child({'test': '2'}).test == 2
+
+
+def test_unknown_fields_counted_and_warned_once():
+    class Child(BaseDiscordObject):
+        _auto_map = {'test': str}
+
+    BaseDiscordObject.reset_unknown_field_stats()
+    with pytest.warns(RuntimeWarning, match=r'unexpected attribute key \[extra\]'):
+        obj = Child({'test': 1, 'extra': 2})
+    assert obj.extra == 2
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        Child({'extra': 3})
+        Child()._auto_dict_generic({'extra': 4})
+
+    stats = BaseDiscordObject.unknown_field_stats()
+    assert stats[f'{Child.__module__}.{Child.__qualname__}'] == {'extra': 3}
+
+    BaseDiscordObject.reset_unknown_field_stats()
+    assert BaseDiscordObject.unknown_field_stats() == {}
+    with pytest.warns(RuntimeWarning):
+        Child({'extra': 5})
+
+
+def test_unknown_fields_not_captured():
+    class Child(BaseDiscordObject):
+        capture_unknown_fields = False
+        _auto_map = {'test': str}
+
+    with pytest.warns(RuntimeWarning):
+        obj = Child({'test': 1, 'extra': 2})
+    assert obj.test == '1'
+    assert not hasattr(obj, 'extra')
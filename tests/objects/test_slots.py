@@ -0,0 +1,63 @@
+import copy
+import pickle
+
+import pytest
+
+from src.dyscord.objects import Member, Message, MessageUpdate, Role, Snowflake, TextChannel, User
+from src.dyscord.objects.base_object import BaseDiscordObject
+from src.dyscord.objects.message import MessageReference
+
+
+@pytest.mark.parametrize('cls', [User, Member, Message, MessageUpdate, MessageReference, Role, TextChannel, Snowflake])
+def test_no_instance_dict(cls):
+    obj = cls(1) if cls is Snowflake else cls()
+    assert not hasattr(obj, '__dict__')
+
+
+def test_defaults_read_as_before():
+    message = Message()
+    assert message.content is None
+    assert message.guild_id is None
+    assert message.channel is None
+    assert message.embeds is None
+
+    member = Member()
+    assert member.nick is None
+    assert member.username is None
+
+    # Annotated without a default, still unset until parsed.
+    with pytest.raises(AttributeError):
+        message.flags
+
+
+def test_assignment():
+    message = Message('hello')
+    assert message.content == 'hello'
+    message.content = None
+    assert message.content is None
+
+    with pytest.raises(AttributeError):
+        message.not_a_field = 1
+
+
+def test_subclass_inherits_slots():
+    class Child(BaseDiscordObject, slots=True):
+        name: str = None  # type: ignore
+        size: int = 3
+
+    class GrandChild(Child):
+        colour: str = 'red'
+
+    obj = GrandChild()
+    assert (obj.name, obj.size, obj.colour) == (None, 3, 'red')
+    assert GrandChild.__slots__ == ('colour',)
+    assert not hasattr(obj, '__dict__')
+
+
+def test_copy_and_pickle():
+    user = User().from_dict({'id': '80351110224678912', 'username': 'Nelly', 'discriminator': '1337', 'avatar': None})
+
+    for clone in (copy.copy(user), copy.deepcopy(user), pickle.loads(pickle.dumps(user))):
+        assert clone.id == user.id
+        assert clone.username == 'Nelly'
+        assert clone.bot is None
@@ -1,5 +1,7 @@
 import datetime
 
+import pytest
+
 from src.dyscord.objects import Snowflake
 
 
@@ -39,3 +41,62 @@ def test_equality():
     assert obj == 888187109867921429
     assert obj == '888187109867921429'
     assert obj == obj
+    assert obj != '888187109867921430'
+    assert obj != 'not a snowflake'
+    assert not (obj != '888187109867921429')
+
+
+def test_behaves_as_int():
+    obj = Snowflake('888187109867921429')
+
+    assert isinstance(obj, int)
+    assert obj.identifier == 888187109867921429
+    assert type(obj.identifier) is int
+    assert hash(obj) == hash(888187109867921429)
+    assert {888187109867921429: 'value'}[obj] == 'value'
+    assert {obj: 'value'}[Snowflake(888187109867921429)] == 'value'
+    assert str(obj) == repr(obj) == f'{obj}' == '888187109867921429'
+    assert sorted([Snowflake(3), Snowflake(1), Snowflake(2)]) == [1, 2, 3]
+
+
+def test_fields():
+    # Example from the Discord API documentation.
+    obj = Snowflake(175928847299117063)
+
+    assert obj.timestamp == 1462015105.796
+    assert obj.worker_id == 1
+    assert obj.process_id == 0
+    assert obj.increment == 7
+
+
+def test_generate():
+    before = datetime.datetime.now().timestamp()
+    obj = Snowflake.generate()
+    assert type(obj) is Snowflake
+    assert abs(obj.timestamp - before) < 5
+
+
+def test_interning():
+    Snowflake.enable_interning(maxsize=2)
+    try:
+        first = Snowflake('888187109867921429')
+        assert Snowflake('888187109867921429') is first
+        assert Snowflake(888187109867921429) is first
+        assert Snowflake(first) is first
+
+        Snowflake('1')
+        Snowflake('2')
+        stats = Snowflake.interning_stats()
+        assert stats == {'enabled': True, 'size': 2, 'maxsize': 2, 'hits': 3, 'misses': 3, 'evictions': 1}
+        # The oldest entry was evicted, a new instance is shared from now on.
+        assert Snowflake('888187109867921429') is not first
+    finally:
+        Snowflake.disable_interning()
+
+    assert Snowflake.interning_stats()['enabled'] is False
+    assert Snowflake('1') is not Snowflake('1')
+
+
+def test_interning_maxsize():
+    with pytest.raises(ValueError):
+        Snowflake.enable_interning(maxsize=0)
@@ -1,3 +1,8 @@
+import datetime
+import gc
+
+import pytest
+
 from src.dyscord.objects import User, Snowflake
 
 
@@ -17,3 +22,89 @@ def test_user():
     assert x.username == 'TestUser'
 
     assert type(x.id) is Snowflake
+
+
+def test_member_lazy_timestamps(monkeypatch):
+    from src.dyscord.objects import Member
+    from src.dyscord.objects.base_object import BaseDiscordObject
+    data = {'joined_at': '2021-10-18T07:29:59.855000+00:00', 'premium_since': None, 'user': {'id': str(Snowflake())}}
+
+    eager = Member().from_dict(data)
+    assert eager.joined_at == datetime.datetime.fromisoformat(data['joined_at'])
+
+    monkeypatch.setattr(BaseDiscordObject, 'lazy_timestamps', True)
+    lazy = Member().from_dict(data)
+    assert Member.joined_at.slot.__get__(lazy) == data['joined_at']
+    assert lazy.joined_at == eager.joined_at
+    assert Member.joined_at.slot.__get__(lazy) is lazy.joined_at
+    assert lazy.premium_since is None
+
+
+@pytest.fixture
+def identity_map():
+    User.enable_identity_map()
+    yield
+    User.disable_identity_map()
+
+
+def test_canonical_without_identity_map():
+    data = {'id': '1', 'username': 'a'}
+    assert User.canonical(data) is not User.canonical(data)
+
+
+def test_identity_map_shares_users(identity_map):
+    from src.dyscord.objects import Member
+    first = User.canonical({'id': '1', 'username': 'before', 'avatar': 'x'})
+    second = User.canonical({'id': '1', 'username': 'after'})
+
+    assert first is second
+    assert first.username == 'after'
+    # Fields missing from a partial payload are kept.
+    assert first.avatar == 'x'
+    other = User.canonical({'id': '2'})
+    assert other is not first
+
+    member = Member.canonical({'user': {'id': '1'}, 'nick': 'one'}, guild_id=Snowflake(10))
+    assert Member.canonical({'nick': 'uno'}, guild_id=Snowflake(10), user_id=Snowflake(1)) is member
+    assert member.nick == 'uno'
+    elsewhere = Member.canonical({'user': {'id': '1'}}, guild_id=Snowflake(11))
+    assert elsewhere is not member
+    assert Member.canonical({'user': {'id': '1'}}) is not member
+
+    stats = User.identity_map_stats()
+    assert stats['enabled'] is True
+    assert stats['users'] == 2
+    assert stats['members'] == 2
+    assert stats['hits'] >= 3
+
+
+def test_identity_map_clears_nulled_member_fields(identity_map):
+    from src.dyscord.objects import Member
+    user = {'id': '1', 'username': 'one', 'banner': 'b'}
+    member = Member.canonical({'user': user, 'nick': 'uno', 'premium_since': '2021-01-28T16:48:04.105000+00:00'}, guild_id=Snowflake(10))
+    assert member.premium_since is not None
+    assert member.banner == 'b'
+
+    again = Member.canonical({'user': {'id': '1', 'banner': None}, 'nick': None, 'premium_since': None}, guild_id=Snowflake(10))
+    assert again is member
+    assert member.premium_since is None
+    assert member.nick is None
+    assert member.banner is None
+    # Fields missing from the payload are kept.
+    assert member.username == 'one'
+
+
+def test_identity_map_is_weak(identity_map):
+    User.canonical({'id': '3'})
+    gc.collect()
+    assert User.identity_map_stats()['users'] == 0
+
+
+def test_identity_map_in_messages(identity_map):
+    from src.dyscord.objects import Message
+    from .message import samples
+    first = Message().from_dict(samples.self_and_role_mention)
+    second = Message().from_dict(samples.self_and_role_mention)
+
+    assert first.author is second.author
+    assert first.member is second.member
@@ -0,0 +1,151 @@
+import asyncio
+import contextlib
+import copy
+
+import orjson as json
+import pytest
+import websockets
+from unittest.mock import AsyncMock
+
+from src.dyscord.client import discord_client
+from src.dyscord.testing import FakeGateway
+
+from ..objects.message import samples as message_samples
+
+
+def message_factory(index):
+    data = copy.deepcopy(message_samples.short_message)
+    data['id'] = str(891001575697432586 + index)
+    return 'MESSAGE_CREATE', data
+
+
+async def _wait_for(predicate, timeout=10):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@contextlib.asynccontextmanager
+async def connected():
+    gateway = await FakeGateway(heartbeat_interval=100).start()
+
+    client = discord_client.DiscordClient('foo')
+    client.set_all_intents()
+    client.api.get_gateway_bot = AsyncMock(return_value={'url': gateway.url})
+    received = list()
+
+    @client.decorate_handler('MESSAGE_CREATE')
+    async def on_message(message):
+        received.append(message)
+
+    task = asyncio.create_task(client.start())
+    await gateway.wait_for_ready(10)
+    await _wait_for(lambda: client.ready)
+
+    try:
+        yield gateway, client, received
+    finally:
+        await client.close()
+        await asyncio.wait_for(task, 5)
+        await gateway.stop()
+
+
+@pytest.mark.asyncio
+async def test_identify_and_dispatch():
+    async with connected() as (gateway, client, received):
+        assert gateway.stats['identifies'] == 1
+        assert client.session_id is not None
+        assert client.me.username == 'fake-bot'
+
+        emitted = await gateway.emit(message_factory, rate=500, count=50)
+        await _wait_for(lambda: len(received) == 50)
+
+        assert emitted == 50
+        assert gateway.stats['events_sent'] == 50
+        assert len({message.id for message in received}) == 50
+        assert client._sequence_number == 51
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_are_acked():
+    async with connected() as (gateway, client, received):
+        await _wait_for(lambda: gateway.stats['heartbeats'] >= 3)
+        assert client._last_heartbeat_ack is not None
+
+
+@pytest.mark.asyncio
+async def test_reconnect_and_resume():
+    async with connected() as (gateway, client, received):
+        session_id = client.session_id
+
+        await gateway.send_reconnect()
+        await _wait_for(lambda: gateway.stats['resumes'] == 1)
+        await _wait_for(lambda: client.ready and not client.resuming)
+
+        await gateway.emit(message_factory, count=5)
+        await _wait_for(lambda: len(received) == 5)
+
+        assert gateway.stats['connections'] == 2
+        assert gateway.stats['identifies'] == 1
+        assert client.session_id == session_id
+
+
+@pytest.mark.asyncio
+async def test_guild_create_storm():
+    async with connected() as (gateway, client, received):
+        seen = list()
+
+        @client.decorate_handler('GUILD_CREATE')
+        async def on_guild(guild):
+            seen.append(guild)
+
+        guilds = [{'id': str(804392362054910047 + i), 'name': f'guild {i}', 'icon': None} for i in range(20)]
+        assert await gateway.guild_create_storm(guilds) == 20
+        await _wait_for(lambda: len(seen) == 20)
+
+
+async def _identify(websocket):
+    assert json.loads(await websocket.recv())['op'] == 10
+    await websocket.send(json.dumps({'op': 2, 'd': {'token': 'foo', 'intents': 0, 'properties': {}}}))
+    assert json.loads(await websocket.recv())['t'] == 'READY'
+
+
+@pytest.mark.asyncio
+async def test_identify_storm_goes_to_the_identifying_session_only():
+    guilds = [{'id': str(804392362054910047 + i), 'name': f'guild {i}', 'icon': None} for i in range(3)]
+    async with FakeGateway(guilds=guilds) as gateway:
+        async with websockets.connect(gateway.url) as first, websockets.connect(gateway.url) as second:
+            await _identify(first)
+            assert [json.loads(await first.recv())['t'] for _ in guilds] == ['GUILD_CREATE'] * 3
+
+            await _identify(second)
+            assert [json.loads(await second.recv())['t'] for _ in guilds] == ['GUILD_CREATE'] * 3
+
+            await gateway.dispatch(*message_factory(0))
+            assert json.loads(await first.recv())['t'] == 'MESSAGE_CREATE'
+            assert json.loads(await second.recv())['t'] == 'MESSAGE_CREATE'
+
+
+@pytest.mark.asyncio
+async def test_emit_needs_a_limit():
+    with pytest.raises(ValueError):
+        await FakeGateway().emit(message_factory)
+
+
+@pytest.mark.asyncio
+async def test_drop_connections():
+    async with FakeGateway() as gateway:
+        async with websockets.connect(gateway.url) as websocket:
+            hello = json.loads(await websocket.recv())
+            assert hello['op'] == 10
+            await websocket.send(json.dumps({'op': 2, 'd': {'token': 'foo', 'intents': 0, 'properties': {}}}))
+            ready = json.loads(await websocket.recv())
+            assert ready['t'] == 'READY'
+
+            await gateway.drop_connections(4000)
+            with pytest.raises(websockets.ConnectionClosed):
+                await websocket.recv()
+            assert websocket.close_code == 4000
+
+        assert gateway.stats['disconnects'] == 1
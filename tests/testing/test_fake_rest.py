@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.dyscord.client.api import api_v9
+from src.dyscord.objects.channel import ChannelImporter
+from src.dyscord.testing import FakeRestServer
+
+
+@pytest.mark.asyncio
+async def test_endpoints_round_trip():
+    async with FakeRestServer() as server:
+        api = api_v9.API_V9('token', '1234', base_url=server.base_url)
+
+        gateway = await api.get_gateway_bot()
+        assert gateway['url'].startswith('wss://gateway.discord.gg')
+
+        channel = ChannelImporter.from_dict(await api.get_channel('41771983423143937'))
+        assert str(channel.id) == '41771983423143937'
+
+        message = await api.create_message('41771983423143937', {'content': 'hello'})
+        assert message['content'] == 'hello'
+        assert message['channel_id'] == '41771983423143937'
+
+        await api.create_interaction_response('1', 'interaction-token', {'type': 4, 'data': {'content': 'pong'}})
+        assert server.log[-1][-1] == 204
+        await api_v9.API_V9.close_pool()
+
+
+@pytest.mark.asyncio
+async def test_set_response():
+    async with FakeRestServer() as server:
+        server.set_response('GET', '/users/{user_id}', lambda parameters, body: {'id': parameters['user_id'], 'username': 'custom'})
+        api = api_v9.API_V9('token', '1234', base_url=server.base_url)
+
+        assert (await api.get_user('555'))['username'] == 'custom'
+
+        with pytest.raises(ValueError):
+            server.set_response('GET', '/not/a/route', {})
+        await api_v9.API_V9.close_pool()
+
+
+@pytest.mark.asyncio
+async def test_route_buckets():
+    async with FakeRestServer(bucket_limit=2, bucket_window=0.3) as server:
+        async with httpx.AsyncClient(base_url=server.base_url) as client:
+            headers = {'Authorization': 'Bot a'}
+            statuses = [(await client.post('/channels/1/messages', json={'content': 'x'}, headers=headers)).status_code for _ in range(3)]
+            assert statuses == [200, 200, 429]
+
+            # Another major parameter has its own bucket.
+            r = await client.post('/channels/2/messages', json={'content': 'x'}, headers=headers)
+            assert r.status_code == 200
+            assert r.headers['x-ratelimit-limit'] == '2'
+            assert r.headers['x-ratelimit-remaining'] == '1'
+            assert 'x-ratelimit-bucket' in r.headers
+
+            r = await client.post('/channels/1/messages', json={'content': 'x'}, headers=headers)
+            assert r.status_code == 429
+            assert r.headers['x-ratelimit-scope'] == 'user'
+            assert 'retry-after' in r.headers
+            assert 0 < r.json()['retry_after'] <= 0.3
+            assert r.json()['global'] is False
+
+    assert server.stats['rate_limited'] == 2
+
+
+@pytest.mark.asyncio
+async def test_global_limit():
+    async with FakeRestServer(global_limit=3) as server:
+        async with httpx.AsyncClient(base_url=server.base_url) as client:
+            responses = [await client.get(f'/channels/{i}', headers={'Authorization': 'Bot a'}) for i in range(4)]
+            assert [r.status_code for r in responses] == [200, 200, 200, 429]
+            assert responses[-1].json()['global'] is True
+            assert responses[-1].headers['x-ratelimit-global'] == 'true'
+
+            # Other tokens and unauthenticated requests are not affected.
+            assert (await client.get('/channels/9', headers={'Authorization': 'Bot b'})).status_code == 200
+            assert (await client.get('/gateway')).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_unknown_routes():
+    async with FakeRestServer() as server:
+        async with httpx.AsyncClient(base_url=server.base_url) as client:
+            assert (await client.get('/nothing/here')).status_code == 404
+            assert (await client.put('/channels/1')).status_code == 405
+
+
+@pytest.mark.asyncio
+async def test_latency_and_jitter():
+    async with FakeRestServer(latency=0.05, jitter=0.05, seed=1) as server:
+        async with httpx.AsyncClient(base_url=server.base_url) as client:
+            start = time.perf_counter()
+            await client.get('/gateway')
+            assert 0.05 <= time.perf_counter() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_client_respects_buckets_end_to_end():
+    async with FakeRestServer(bucket_limit=2, bucket_window=0.2) as server:
+        api = api_v9.API_V9('token', '1234', base_url=server.base_url)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[api.create_message('1', {'content': str(i)}) for i in range(6)])
+
+        assert sorted(result['content'] for result in results) == [str(i) for i in range(6)]
+        # Six requests through a 2 per 0.2s bucket need at least two full windows.
+        assert time.perf_counter() - start >= 0.35
+        await api_v9.API_V9.close_pool()
@@ -0,0 +1,66 @@
+import datetime
+import warnings
+
+from src.dyscord.objects import Guild, Message, Presence
+from src.dyscord.objects.channel import ChannelImporter
+from src.dyscord.objects.snowflake import Snowflake
+from src.dyscord.testing.generator import DataGenerator
+
+
+def test_same_seed_same_data():
+    assert DataGenerator(7).guild(members=50, threads=5, presences=10) == DataGenerator(7).guild(members=50, threads=5, presences=10)
+    assert list(DataGenerator(7).messages(50)) == list(DataGenerator(7).messages(50))
+    assert DataGenerator(7).guild(members=50) != DataGenerator(8).guild(members=50)
+
+
+def test_snowflakes_follow_clock():
+    generator = DataGenerator(1)
+    identifiers = [int(generator.snowflake()) for _ in range(5_000)]
+    assert identifiers == sorted(identifiers)
+    assert len(set(identifiers)) == len(identifiers)
+
+    messages = list(generator.messages(200))
+    for message in messages:
+        assert Snowflake(message['id']).timestamp == datetime.datetime.fromisoformat(message['timestamp']).timestamp()
+    assert [int(message['id']) for message in messages] == sorted(int(message['id']) for message in messages)
+
+
+def test_guild_counts_and_parse():
+    generator = DataGenerator(2)
+    data = generator.guild(members=200, roles=10, channels=20, threads=8, presences=30)
+    assert len(data['members']) == data['member_count'] == 200
+    assert len(data['roles']) == 10
+    assert len(data['channels']) == 20
+    assert len(data['threads']) == 8
+    assert len(data['presences']) == 30
+
+    text_channels = {channel['id'] for channel in data['channels'] if channel['type'] == 0}
+    assert all(thread['parent_id'] in text_channels for thread in data['threads'])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        guild = Guild().from_dict(data)
+        threads = [ChannelImporter.from_dict(thread) for thread in data['threads']]
+        presences = [Presence(presence) for presence in data['presences']]
+    assert len(guild.channels) == 20
+    assert all(thread.type in (11, 12) for thread in threads)
+    assert len(presences) == 30
+
+
+def test_message_stream_distribution():
+    generator = DataGenerator(3)
+    channels = [generator.snowflake() for _ in range(10)]
+    messages = list(generator.messages(2_000, channel_ids=channels))
+
+    per_channel = [sum(message['channel_id'] == channel for message in messages) for channel in channels]
+    assert per_channel[0] > per_channel[-1] * 3
+
+    replies = sum('referenced_message' in message for message in messages)
+    embeds = sum(bool(message['embeds']) for message in messages)
+    assert 0.04 < replies / len(messages) < 0.12
+    assert 0.02 < embeds / len(messages) < 0.08
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        for message in messages[:200]:
+            Message().from_dict(message)
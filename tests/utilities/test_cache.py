@@ -1,4 +1,32 @@
+import time
+
+import pytest
+
+from src.dyscord.helper import CommandHandler
+from src.dyscord.objects import Guild, Member, Message, Presence, User
 from src.dyscord.utilities import Cache
+from src.dyscord.utilities.cache import LRU, TTL, ActiveGuilds, PerChannel, Tiered, Unbounded
+
+from ..objects.channel import samples as channel_samples
+from ..objects.guild import samples as guild_samples
+from ..objects.message import samples as message_samples
+from ..objects.presence import samples as presence_samples
+
+
+@pytest.fixture
+def cache():
+    cache = Cache()
+    cache.clear()
+    yield cache
+    cache.configure(**Cache.DEFAULT_POLICIES)
+    cache.set_memory_budget(None)
+    cache.clear()
+
+
+def _messages(count, guild_id=None, channel_id=None, start=0):
+    data = message_samples.short_message
+    return [Message().from_dict(dict(data, id=str(index), guild_id=guild_id or data['guild_id'], channel_id=channel_id or data['channel_id']))
+            for index in range(start, start + count)]
 
 
 def test_simple_cache():
@@ -9,3 +37,331 @@ def test_simple_cache():
     assert id(x.guilds) == id(y.guilds)
     assert id(x.channels) == id(y.channels)
     assert id(x.users) == id(y.users)
+
+
+def test_add_and_get(cache):
+    guild = Guild().from_dict(guild_samples.discord_dev_example)
+    user = User().from_dict(message_samples.short_message['author'])
+    cache.add(guild)
+    cache.add(user)
+
+    assert cache.get(guild.id) is guild
+    assert cache.get(str(user.id)) is user
+    assert cache.get_guild(str(guild.id)) is guild
+    for channel in guild.channels:
+        assert cache.get_channel(channel.id) is channel
+    with pytest.raises(LookupError):
+        cache.get(1)
+    with pytest.raises(TypeError):
+        cache.add(object())
+
+
+def test_merge_guild(cache):
+    data = guild_samples.my_test_server['d']
+    guild = cache.merge_guild(data)
+
+    assert cache.get_guild(data['id']) is guild
+    member_dict = data['members'][0]
+    assert cache.get_member(data['id'], member_dict['user']['id']).username == member_dict['user']['username']
+
+    assert cache.merge_guild(dict(data, name='Renamed')) is guild
+    assert guild.name == 'Renamed'
+
+    cache.remove_guild(data['id'])
+    assert cache.get_guild(data['id']) is None
+    assert cache.get_member(data['id'], member_dict['user']['id']) is None
+    assert all(cache.get_channel(channel['id']) is None for channel in data['channels'])
+
+
+class _Client:
+    pass
+
+
+def test_remove_guild_held_by_another_client(cache):
+    data = guild_samples.my_test_server['d']
+    first, second = _Client(), _Client()
+    guild = cache.merge_guild(data, owner=first)
+    cache.merge_guild(data, owner=second)
+    user_id = data['members'][0]['user']['id']
+
+    assert cache.remove_guild(data['id'], owner=first) is guild
+    assert cache.get_guild(data['id']) is guild
+    assert cache.get_member(data['id'], user_id) is not None
+
+    assert cache.remove_guild(data['id'], owner=second) is guild
+    assert cache.get_guild(data['id']) is None
+    assert cache.get_member(data['id'], user_id) is None
+
+
+def test_remove_guild_keeps_other_guilds(cache):
+    cache.configure(members=LRU(10))
+    user = message_samples.short_message['author']
+    for index in range(1_100):
+        cache.add_member(index % 2 + 1, Member.canonical(dict(message_samples.short_message['member'], user=dict(user, id=str(index + 10))), index % 2 + 1))
+
+    # Keys of evicted members are forgotten once they could outnumber live ones.
+    assert cache._guild_key_count['members'] <= 2 * 10 + 1024
+    cache.remove_guild(1)
+    assert len(cache.members) == 5
+    assert all(guild_id == 2 for guild_id, _ in cache.members)
+
+
+def test_merge_channel(cache):
+    guild = cache.merge_guild(guild_samples.my_test_server['d'])
+    data = dict(channel_samples.dev_guild_text, guild_id=str(guild.id))
+
+    channel = cache.merge_channel(data)
+    assert channel in guild.channels
+    assert cache.merge_channel(dict(data, name='renamed')) is channel
+    assert channel.name == 'renamed'
+
+    cache.remove_channel(channel.id, guild.id)
+    assert cache.get_channel(channel.id) is None
+    assert channel not in guild.channels
+
+
+def test_messages(cache):
+    cache.configure(messages=LRU(2))
+    messages = _messages(3)
+    for message in messages:
+        cache.add_message(message)
+
+    assert cache.get_message(0) is None
+    assert cache.get_message('2') is messages[2]
+    assert cache.get_user(messages[2].author.id) is messages[2].author
+
+    assert cache.remove_message(2) is messages[2]
+    assert cache.get_message(2) is None
+    assert cache.remove_messages(['1', '2']) == [messages[1]]
+
+
+def test_presence(cache):
+    presence = Presence(data=presence_samples.simple_presence)
+    cache.add(presence)
+
+    assert cache.get_presence(presence.guild_id, presence.user.id) is presence
+    assert cache.get_user(presence.user.id) is presence.user
+
+
+def test_partial_presence_user_keeps_cached_user(cache):
+    user = User().from_dict(message_samples.short_message['author'])
+    cache.add_user(user)
+
+    presence = Presence(data=dict(presence_samples.simple_presence, user={'id': str(user.id)}))
+    cache.add_presence(presence)
+
+    assert cache.get_user(user.id) is user
+    assert user.username == message_samples.short_message['author']['username']
+    assert presence.user is user
+
+    renamed = dict(presence_samples.simple_presence, user={'id': str(user.id), 'username': 'renamed'})
+    cache.merge_guild(dict(guild_samples.discord_dev_example, presences=[renamed]))
+    assert cache.get_user(user.id) is user
+    assert user.username == 'renamed'
+    assert user.discriminator == message_samples.short_message['author']['discriminator']
+
+
+def test_lru_policy(cache):
+    cache.configure(messages=LRU(2))
+    first, second, third = _messages(3)
+    cache.add_message(first)
+    cache.add_message(second)
+    cache.get_message(first.id)
+    cache.add_message(third)
+
+    assert cache.get_message(first.id) is first
+    assert cache.get_message(second.id) is None
+    assert cache.stats()['messages']['evictions'] == 1
+
+
+def test_ttl_policy(cache):
+    cache.configure(messages=TTL(0.01))
+    message, = _messages(1)
+    cache.add_message(message)
+    assert cache.get_message(message.id) is message
+
+    time.sleep(0.02)
+    assert cache.get_message(message.id) is None
+    cache.add_message(_messages(2)[1])
+    assert cache.stats()['messages']['evictions'] == 1
+
+
+def test_configure_keeps_entries(cache):
+    messages = _messages(3)
+    for message in messages:
+        cache.add_message(message)
+
+    cache.configure(messages=LRU(2))
+
+    assert len(cache.messages) == 2
+    assert cache.get_message(messages[2].id) is messages[2]
+    assert repr(cache.policies['messages']) == 'LRU(maxsize=2)'
+    with pytest.raises(KeyError):
+        cache.configure(roles=Unbounded())
+
+
+def test_active_guilds_policy(cache, monkeypatch):
+    cache.configure(messages=ActiveGuilds([1]))
+    active, = _messages(1, guild_id='1')
+    inactive, = _messages(1, guild_id='2')
+    cache.add_message(active)
+    cache.add_message(inactive)
+
+    assert cache.get_message(active.id) is active
+    assert cache.stats()['messages']['rejected'] == 1
+
+    monkeypatch.setattr(CommandHandler, 'guild_lookup', {('ping', 2): None})
+    cache.configure(messages=ActiveGuilds())
+    cache.add_message(inactive)
+    assert cache.get_message(inactive.id) is inactive
+
+
+def test_active_guilds_follows_registrations(cache, monkeypatch):
+    from src.dyscord.helper.command_handler import _GuildLookup
+    lookup = _GuildLookup({('ping', '1'): None})
+    monkeypatch.setattr(CommandHandler, 'guild_lookup', lookup)
+    policy = ActiveGuilds()
+
+    assert policy.admits(1)
+    # Replacing a guild keeps the number of registrations.
+    del lookup[('ping', '1')]
+    lookup[('ping', '2')] = None
+    assert not policy.admits(1)
+    assert policy.admits(2)
+
+    monkeypatch.setattr(CommandHandler, 'guild_lookup', {('ping', '3'): None})
+    assert policy.admits(3)
+
+
+def test_memory_budget_evicts_cheapest_first(cache):
+    guild = Guild().from_dict(guild_samples.discord_dev_example)
+    cache.add_guild(guild)
+    for message in _messages(5):
+        cache.add_message(message)
+
+    cache.set_memory_budget(cache.estimated_bytes() - Cache.ENTRY_BYTES['messages'] * 2)
+
+    stats = cache.stats()
+    assert stats['messages']['size'] == 3
+    assert stats['budget_evictions'] == 2
+    assert cache.get_guild(guild.id) is guild
+    assert stats['estimated_bytes'] <= stats['memory_budget']
+
+
+@pytest.mark.asyncio
+async def test_refetch_stats(cache, monkeypatch):
+    from src.dyscord.client import api
+    from unittest.mock import AsyncMock
+
+    monkeypatch.setattr(api.API, 'get_channel', AsyncMock(return_value=dict(channel_samples.dev_guild_text, id=message_samples.short_message['channel_id'])))
+    message, = _messages(1)
+    await message.fetch_channel()
+    assert cache.stats()['channels']['refetches'] == 1
+
+    cache.add_channel(message.channel)
+    other, = _messages(1)
+    assert await other.fetch_channel() is message.channel
+    assert cache.stats()['channels']['refetches'] == 1
+
+
+def test_per_channel_policy(cache):
+    cache.configure(messages=PerChannel(capacity=2, maxsize=3))
+    first, second, third = _messages(3, channel_id='10')
+    other, = _messages(1, channel_id='11', start=3)
+    for message in (first, second, third):
+        cache.add_message(message)
+
+    assert cache.get_message(first.id) is None
+    assert cache.get_channel_messages(10) == [second, third]
+
+    cache.add_message(other)
+    cache.add_message(_messages(1, channel_id='11', start=4)[0])
+    assert cache.get_message(second.id) is None
+    assert cache.get_channel_messages('10') == [third]
+    assert len(cache.get_channel_messages(11)) == 2
+    assert cache.stats()['messages']['evictions'] == 2
+
+    assert cache.remove_message(third.id) is third
+    assert cache.get_channel_messages(10) == []
+    cache.add_message(first)
+    assert cache.get_channel_messages(10) == [first]
+
+
+def test_per_channel_delete_from_middle(cache):
+    cache.configure(messages=PerChannel(capacity=3, maxsize=10))
+    first, second, third, fourth, fifth = _messages(5, channel_id='10')
+    for message in (first, second, third):
+        cache.add_message(message)
+
+    assert cache.remove_message(second.id) is second
+    cache.add_message(fourth)
+    assert cache.get_channel_messages(10) == [first, third, fourth]
+    cache.add_message(fifth)
+    assert cache.get_channel_messages(10) == [third, fourth, fifth]
+    assert cache.stats()['messages']['evictions'] == 1
+
+
+def test_tiered_policy(cache):
+    cache.configure(messages=Tiered(capacity=4, hot=2, maxsize=10))
+    payloads = [dict(message_samples.short_message, id=str(index), channel_id='10') for index in range(4)]
+    messages = [Message().from_dict(data) for data in payloads]
+    for message, data in zip(messages, payloads):
+        cache.add_message(message, data)
+
+    stats = cache.stats()['messages']
+    assert (stats['size'], stats['hot'], stats['cold']) == (4, 2, 2)
+    assert 0 < stats['cold_bytes'] < 2 * Cache.ENTRY_BYTES['messages']
+    assert cache.estimated_bytes() < 4 * Cache.ENTRY_BYTES['messages']
+
+    # Reading a demoted message inflates it and makes it hot.
+    first = cache.get_message(0)
+    assert first is not messages[0]
+    assert first.content == messages[0].content
+    assert first.author.id == messages[0].author.id
+    first.apply_update({'content': 'edited'})
+    assert cache.get_message(0) is first
+    assert cache.get_message(3) is messages[3]
+
+    # The least recently used hot message is demoted in turn, keeping its update.
+    third = cache.get_message('2')
+    assert third is not messages[2]
+    assert cache.get_message(0) is not first
+    assert cache.get_message(0).content == 'edited'
+    assert [message.id for message in cache.get_channel_messages(10)] == [0, 1, 2, 3]
+    assert cache.stats()['messages']['hot'] == 2
+
+    removed = cache.remove_message(1)
+    assert removed.id == 1
+    assert removed.content == messages[1].content
+    for index in (4, 5):
+        extra = dict(message_samples.short_message, id=str(index), channel_id='10')
+        cache.add_message(Message().from_dict(extra), extra)
+    assert cache.get_message(0) is None
+    assert cache.stats()['messages']['evictions'] == 1
+    assert len(cache.remove_messages([2, 3, 4, 5])) == 4
+    assert cache.stats()['messages']['cold_bytes'] == 0
+    assert cache.stats()['messages']['hot'] == 0
+
+
+def test_tiered_policy_without_payload(cache):
+    cache.configure(messages=Tiered(capacity=4, hot=1))
+    first, second = _messages(2, channel_id='10')
+    cache.add_message(first)
+    cache.add_message(second)
+
+    # Nothing to compress, the demoted message is dropped.
+    assert cache.get_message(first.id) is None
+    assert cache.get_message(second.id) is second
+    assert cache.stats()['messages']['evictions'] == 1
+
+    with pytest.raises(ValueError):
+        Tiered(hot=0)
+
+
+def test_channel_messages_other_policy(cache):
+    cache.configure(messages=Unbounded())
+    messages = _messages(2, channel_id='10') + _messages(1, channel_id='11', start=2)
+    for message in messages:
+        cache.add_message(message)
+
+    assert cache.get_channel_messages(10) == messages[:2]
@@ -0,0 +1,22 @@
+import pytest
+
+import src.dyscord as dyscord
+from src.dyscord import objects
+
+
+def test_exports_resolve():
+    assert dyscord.objects is objects
+    assert objects.Message.__name__ == 'Message'
+    assert objects.interactions.Interaction.__name__ == 'Interaction'
+    # Resolved exports are cached in the package namespace.
+    assert 'Message' in vars(objects)
+
+
+def test_dir_lists_exports():
+    assert set(objects.__all__) <= set(dir(objects))
+    assert 'DiscordClient' in dir(dyscord)
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        objects.NotAThing
@@ -0,0 +1,37 @@
+import datetime
+
+import pytest
+
+from src.dyscord.utilities.timestamps import parse_timestamp, parse_timestamp_cached, _normalize
+
+
+@pytest.mark.parametrize('value', [
+    '2021-10-18T07:29:59.855000+00:00',
+    '2021-10-18T07:29:59+00:00',
+    '2021-10-18T07:29:59.855+00:00',
+])
+def test_matches_fromisoformat(value):
+    assert parse_timestamp(value) == datetime.datetime.fromisoformat(value)
+
+
+def test_normalize():
+    assert _normalize('2021-10-18T07:29:59.8553Z') == '2021-10-18T07:29:59.855300+00:00'
+    assert _normalize('2021-10-18T07:29:59.123456789+00:00') == '2021-10-18T07:29:59.123456+00:00'
+    assert _normalize('2021-10-18T07:29:59+00:00') == '2021-10-18T07:29:59+00:00'
+
+
+def test_z_suffix():
+    parsed = parse_timestamp('2021-10-18T07:29:59.855Z')
+    assert parsed == datetime.datetime(2021, 10, 18, 7, 29, 59, 855000, tzinfo=datetime.timezone.utc)
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        parse_timestamp('yesterday')
+
+
+def test_cached_shares_instances():
+    value = '2020-01-02T03:04:05.000000+00:00'
+    first = parse_timestamp_cached(value)
+    assert parse_timestamp_cached(value) is first
+    assert parse_timestamp_cached.cache_info().hits >= 1